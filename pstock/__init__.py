@@ -1,7 +1,7 @@
 from pstock.asset import Asset, Assets
 from pstock.bar import Bars, BarsMulti
 from pstock.earnings import Earnings
-from pstock.income_statement import IncomeStatements
-from pstock.news import News
+from pstock.income_statement import IncomeStatements, QuarterlyIncomeStatements
+from pstock.news import News, NewsMulti, NewsPoller
 from pstock.trend import Trends
 from pstock.utils.utils import rdm_user_agent_value
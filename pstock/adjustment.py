@@ -0,0 +1,88 @@
+"""Back-adjustment of raw bars for dividends and splits.
+
+Every event multiplies the prices of all the bars before its ex-date by a
+factor: `1 - amount / previous close` for a dividend, `denominator / numerator`
+for a split (volumes are divided by it). The factor of a bar is the product of
+the factors of all the events after it, one reversed cumulative product:
+
+```python
+factors = get_adjustment_factors(df.index, df["close"], dividends, splits)
+adjusted = adjust(df, factors)
+```
+
+Factors multiply, so new events (after the ones already applied) can be applied
+to an already adjusted frame: `adjust(adjusted, get_adjustment_factors(
+adjusted.index, adjusted["close"], new_dividends, new_splits))`.
+
+The closes of yahoo-finance are already split adjusted (but not dividend
+adjusted), splits are only applied with `splits=True`.
+"""
+import typing as tp
+
+import numpy as np
+import pandas as pd
+
+_PRICES = ["open", "high", "low", "close"]
+
+
+def _positions(dates: pd.DatetimeIndex, events: pd.DataFrame) -> np.ndarray:
+    """Index of the first bar on or after the ex-date of every event."""
+    event_dates = pd.DatetimeIndex(events.index)
+    if dates.tz is not None and event_dates.tz is not None:
+        event_dates = event_dates.tz_convert(dates.tz)
+    return dates.searchsorted(event_dates, side="left")
+
+
+def _suffix_product(factors: np.ndarray) -> np.ndarray:
+    # factors[i] applies to the bars before i, the factor of a bar is the
+    # product of factors[i + 1:]
+    return np.cumprod(factors[::-1])[::-1][1:]
+
+
+def get_adjustment_factors(
+    dates: pd.DatetimeIndex,
+    closes: tp.Union[np.ndarray, pd.Series],
+    dividends: tp.Optional[pd.DataFrame] = None,
+    splits: tp.Optional[pd.DataFrame] = None,
+    *,
+    adjust_splits: bool = False,
+) -> pd.DataFrame:
+    """Price and volume adjustment factors of (sorted) bars, indexed by date."""
+    closes = np.asarray(closes, dtype="float64")
+    prices = np.ones(len(dates) + 1)
+    volumes = np.ones(len(dates) + 1)
+
+    if dividends is not None and not dividends.empty:
+        positions = _positions(dates, dividends)
+        # a dividend before the first bar has no previous close, and no bars to
+        # adjust
+        mask = positions > 0
+        positions = positions[mask]
+        amounts = dividends["amount"].to_numpy(dtype="float64")[mask]
+        factors = 1 - amounts / closes[positions - 1]
+        factors[~np.isfinite(factors)] = 1
+        np.multiply.at(prices, positions, factors)
+
+    if adjust_splits and splits is not None and not splits.empty:
+        positions = _positions(dates, splits)
+        ratios = splits["denominator"].to_numpy(dtype="float64") / splits[
+            "numerator"
+        ].to_numpy(dtype="float64")
+        ratios[~np.isfinite(ratios) | (ratios <= 0)] = 1
+        np.multiply.at(prices, positions, ratios)
+        np.multiply.at(volumes, positions, 1 / ratios)
+
+    return pd.DataFrame(
+        {"price": _suffix_product(prices), "volume": _suffix_product(volumes)},
+        index=dates,
+    )
+
+
+def adjust(df: pd.DataFrame, factors: pd.DataFrame) -> pd.DataFrame:
+    """Copy of the bars `df` with adjusted open, high, low, close and volume."""
+    df = df.copy()
+    prices = [column for column in _PRICES if column in df]
+    df[prices] = df[prices].to_numpy() * factors["price"].to_numpy()[:, None]
+    if "volume" in df:
+        df["volume"] = df["volume"].to_numpy() * factors["volume"].to_numpy()
+    return df
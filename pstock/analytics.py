@@ -0,0 +1,284 @@
+"""Cross-sectional analytics over `BarsMulti`.
+
+The bars of all the symbols are aligned once into a 2-D `(time, symbol)` array
+(`Panel`), every metric is then a single NaN-aware array operation instead of a
+loop over the symbols. A symbol with missing bars (holidays, late listing, ...)
+has `NaN` values at those dates, which are ignored by the kernels.
+
+```python
+from pstock import analytics
+
+panel = analytics.get_panel(bars, column="adj_close")
+rets = analytics.returns(panel.values)
+vol = analytics.rolling_volatility(rets, window=21, periods_per_year=252)
+corr = analytics.correlation(rets)
+```
+
+For universes that don't fit in memory, `iter_panels` yields the panel by chunks
+of symbols and `summary`/`correlation_matrix` accept a `chunk_size`.
+"""
+from __future__ import annotations
+
+import typing as tp
+
+import numpy as np
+import pandas as pd
+
+from pstock.bar import BarsMulti
+
+
+class Panel(tp.NamedTuple):
+    index: pd.DatetimeIndex
+    symbols: tp.List[str]
+    values: np.ndarray
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.values, index=self.index, columns=self.symbols)
+
+
+def _union_index(bars: BarsMulti, symbols: tp.Sequence[str]) -> pd.DatetimeIndex:
+    indexes = [bars[symbol].df.index for symbol in symbols if not bars[symbol].df.empty]
+    if not indexes:
+        return pd.DatetimeIndex([], name="date")
+    # asi8 of tz-aware indexes are utc timestamps, comparable across timezones
+    index = pd.DatetimeIndex(
+        np.unique(np.concatenate([index.asi8 for index in indexes])), name="date"
+    )
+    timezones = {index.tz for index in indexes}
+    tz = timezones.pop() if len(timezones) == 1 else "UTC"
+    if tz is not None:
+        index = index.tz_localize("UTC").tz_convert(tz)
+    return index
+
+
+def _align(
+    bars: BarsMulti, symbols: tp.Sequence[str], column: str, index: pd.DatetimeIndex
+) -> np.ndarray:
+    values = np.full((len(index), len(symbols)), np.nan)
+    dates = index.asi8
+    for idx, symbol in enumerate(symbols):
+        df = bars[symbol].df
+        if df.empty:
+            continue
+        rows = np.searchsorted(dates, df.index.asi8)
+        values[rows, idx] = df[column].to_numpy(dtype="float64", na_value=np.nan)
+    return values
+
+
+def get_panel(
+    bars: BarsMulti,
+    column: str = "adj_close",
+    symbols: tp.Optional[tp.Sequence[str]] = None,
+) -> Panel:
+    """Align `column` of the bars of all the `symbols` on the union of their dates."""
+    symbols = list(bars if symbols is None else symbols)
+    index = _union_index(bars, symbols)
+    return Panel(index, symbols, _align(bars, symbols, column, index))
+
+
+def iter_panels(
+    bars: BarsMulti, column: str = "adj_close", *, chunk_size: int = 500
+) -> tp.Iterator[Panel]:
+    """Same as `get_panel`, by chunks of `chunk_size` symbols.
+
+    All the chunks share the same dates (the union of the dates of all symbols).
+    """
+    symbols = list(bars)
+    index = _union_index(bars, symbols)
+    for start in range(0, len(symbols), chunk_size):
+        chunk = symbols[start : start + chunk_size]
+        yield Panel(index, chunk, _align(bars, chunk, column, index))
+
+
+def returns(values: np.ndarray, *, log: bool = False) -> np.ndarray:
+    """Period returns of a `(time, symbol)` array of prices, the first row is NaN.
+
+    Returns following or preceding a missing price are NaN.
+    """
+    values = np.asarray(values, dtype="float64")
+    out = np.full(values.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if log:
+            out[1:] = np.log(values[1:] / values[:-1])
+        else:
+            out[1:] = values[1:] / values[:-1] - 1
+    return out
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    cumsum = np.cumsum(values, axis=0)
+    out = cumsum.copy()
+    out[window:] = cumsum[window:] - cumsum[:-window]
+    return out
+
+
+def rolling_volatility(
+    returns: np.ndarray,
+    window: int,
+    *,
+    min_periods: tp.Optional[int] = None,
+    periods_per_year: tp.Optional[float] = None,
+) -> np.ndarray:
+    """Rolling standard deviation (ddof=1) of `returns` over `window` rows.
+
+    NaN returns are skipped, a window with less than `min_periods` (defaults to
+    `window`) valid returns is NaN. Annualized when `periods_per_year` is set.
+    """
+    returns = np.asarray(returns, dtype="float64")
+    min_periods = max(window if min_periods is None else min_periods, 2)
+    valid = ~np.isnan(returns)
+    filled = np.where(valid, returns, 0.0)
+    count = _rolling_sum(valid.astype("float64"), window)
+    total = _rolling_sum(filled, window)
+    squares = _rolling_sum(filled**2, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = (squares - total**2 / count) / (count - 1)
+    # cumulative sums can leave tiny negative values instead of 0
+    volatility = np.sqrt(np.clip(variance, 0, None))
+    volatility[count < min_periods] = np.nan
+    if periods_per_year is not None:
+        volatility *= np.sqrt(periods_per_year)
+    return volatility
+
+
+def drawdowns(values: np.ndarray) -> np.ndarray:
+    """Relative distance of the prices to their running maximum (<= 0)."""
+    values = np.asarray(values, dtype="float64")
+    # fmax ignores NaN, the running maximum carries over missing prices
+    running_max = np.fmax.accumulate(values, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return values / running_max - 1
+
+
+def max_drawdowns(values: np.ndarray) -> np.ndarray:
+    """Maximum drawdown of each symbol (column), NaN without any price."""
+    dd = drawdowns(values)
+    out = np.full(dd.shape[1:], np.nan)
+    has_values = ~np.isnan(dd).all(axis=0)
+    out[has_values] = np.nanmin(dd[:, has_values], axis=0)
+    return out
+
+
+def _correlation_block(x: np.ndarray, y: np.ndarray, min_periods: int) -> np.ndarray:
+    # pairwise-complete correlation of the columns of x with the columns of y
+    x_valid = (~np.isnan(x)).astype("float64")
+    y_valid = (~np.isnan(y)).astype("float64")
+    x = np.nan_to_num(x)
+    y = np.nan_to_num(y)
+    count = x_valid.T @ y_valid
+    sum_x = x.T @ y_valid
+    sum_y = x_valid.T @ y
+    sum_xx = (x**2).T @ y_valid
+    sum_yy = x_valid.T @ (y**2)
+    sum_xy = x.T @ y
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = (count * sum_xy - sum_x * sum_y) / np.sqrt(
+            (count * sum_xx - sum_x**2) * (count * sum_yy - sum_y**2)
+        )
+    corr[count < min_periods] = np.nan
+    return np.clip(corr, -1, 1)
+
+
+def correlation(returns: np.ndarray, *, min_periods: int = 2) -> np.ndarray:
+    """Correlation matrix of the columns of `returns`, same as `DataFrame.corr`.
+
+    Each pair of symbols uses the rows where both have a value.
+    """
+    returns = np.asarray(returns, dtype="float64")
+    return _correlation_block(returns, returns, max(min_periods, 2))
+
+
+def correlation_matrix(
+    bars: BarsMulti,
+    column: str = "adj_close",
+    *,
+    min_periods: int = 2,
+    chunk_size: tp.Optional[int] = None,
+) -> pd.DataFrame:
+    """Correlation matrix of the returns of all the symbols of `bars`.
+
+    With a `chunk_size`, the returns are aligned by blocks of symbols and at most
+    two blocks are held in memory at the same time.
+    """
+    if chunk_size is None:
+        panel = get_panel(bars, column)
+        corr = correlation(returns(panel.values), min_periods=min_periods)
+        return pd.DataFrame(corr, index=panel.symbols, columns=panel.symbols)
+
+    symbols = list(bars)
+    index = _union_index(bars, symbols)
+    chunks = [
+        symbols[start : start + chunk_size]
+        for start in range(0, len(symbols), chunk_size)
+    ]
+    corr = np.full((len(symbols), len(symbols)), np.nan)
+    for idx, chunk in enumerate(chunks):
+        x = returns(_align(bars, chunk, column, index))
+        x_start = idx * chunk_size
+        for idy in range(idx, len(chunks)):
+            y = x if idy == idx else returns(_align(bars, chunks[idy], column, index))
+            y_start = idy * chunk_size
+            block = _correlation_block(x, y, max(min_periods, 2))
+            corr[x_start : x_start + len(chunk), y_start : y_start + y.shape[1]] = block
+            corr[
+                y_start : y_start + y.shape[1], x_start : x_start + len(chunk)
+            ] = block.T
+    return pd.DataFrame(corr, index=symbols, columns=symbols)
+
+
+def total_returns(values: np.ndarray) -> np.ndarray:
+    """Return between the first and the last price of each symbol (column)."""
+    values = np.asarray(values, dtype="float64")
+    out = np.full(values.shape[1:], np.nan)
+    valid = ~np.isnan(values)
+    has_values = valid.any(axis=0)
+    if has_values.any():
+        first = np.argmax(valid, axis=0)
+        last = len(values) - 1 - np.argmax(valid[::-1], axis=0)
+        columns = np.arange(values.shape[1])
+        out[has_values] = (values[last, columns] / values[first, columns] - 1)[
+            has_values
+        ]
+    return out
+
+
+def volatility(
+    returns: np.ndarray, *, periods_per_year: tp.Optional[float] = None
+) -> np.ndarray:
+    """Standard deviation (ddof=1) of the returns of each symbol, NaN-aware."""
+    returns = np.asarray(returns, dtype="float64")
+    out = np.full(returns.shape[1:], np.nan)
+    enough = (~np.isnan(returns)).sum(axis=0) >= 2
+    out[enough] = np.nanstd(returns[:, enough], axis=0, ddof=1)
+    if periods_per_year is not None:
+        out *= np.sqrt(periods_per_year)
+    return out
+
+
+def summary(
+    bars: BarsMulti,
+    column: str = "adj_close",
+    *,
+    periods_per_year: tp.Optional[float] = 252,
+    chunk_size: tp.Optional[int] = None,
+) -> pd.DataFrame:
+    """Total return, (annualized) volatility and maximum drawdown of every symbol."""
+    panels: tp.Iterable[Panel] = (
+        [get_panel(bars, column)]
+        if chunk_size is None
+        else iter_panels(bars, column, chunk_size=chunk_size)
+    )
+    frames = [
+        pd.DataFrame(
+            {
+                "total_return": total_returns(panel.values),
+                "volatility": volatility(
+                    returns(panel.values), periods_per_year=periods_per_year
+                ),
+                "max_drawdown": max_drawdowns(panel.values),
+            },
+            index=pd.Index(panel.symbols, name="symbol"),
+        )
+        for panel in panels
+    ]
+    return pd.concat(frames)
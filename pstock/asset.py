@@ -6,13 +6,21 @@ import asyncer
 import httpx
 import numpy as np
 import pandas as pd
-from pydantic import Field, validator
+from pydantic import Field, PrivateAttr, ValidationError, validator
 
-from pstock.base import BaseModelSequence
-from pstock.earnings import Earnings
-from pstock.income_statement import IncomeStatements
-from pstock.quote import QuoteSummary
-from pstock.trend import Trends
+from pstock import compact, serialization
+from pstock.base import BaseModel, BaseModelSequence
+from pstock.concurrency import AIMDController, use_controller
+from pstock.earnings import Earning, Earnings, set_statuses
+from pstock.income_statement import (
+    IncomeStatement,
+    IncomeStatements,
+    QuarterlyIncomeStatements,
+)
+from pstock.instrumentation import span
+from pstock.partial import SymbolError, check_params, gather
+from pstock.quote import QuoteMemo, QuoteSummary
+from pstock.trend import Trend, Trends, score_trends
 from pstock.utils.quote import get_asset_data_from_quote
 from pstock.utils.utils import httpx_client_manager
 
@@ -30,34 +38,207 @@ class Asset(QuoteSummary):
     earnings: Earnings = Field(repr=False)
     trends: Trends = Field(repr=False)
     income_statement: tp.Optional[IncomeStatements] = Field(repr=False)
+    quarterly_income_statement: tp.Optional[QuarterlyIncomeStatements] = Field(
+        repr=False
+    )
 
     @validator("symbol")
     def symbol_upper(cls, symbol: str) -> str:
         return symbol.upper()
 
     @classmethod
-    def process_quote(cls, quote: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Any]:
-        data = get_asset_data_from_quote(quote)
-        earnings = Earnings.process_quote(quote)
-        trends = Trends.process_quote(quote)
-        return {**data, "earnings": earnings, "trends": trends}
+    def trusted(cls, **values: tp.Any) -> Asset:
+        if values.get("symbol") is not None:
+            values["symbol"] = values["symbol"].upper()
+        return super().trusted(**values)
+
+    components: tp.ClassVar[tp.Dict[str, tp.Type[QuoteSummary]]] = {
+        "earnings": Earnings,
+        "trends": Trends,
+        "income_statement": IncomeStatements,
+        "quarterly_income_statement": QuarterlyIncomeStatements,
+    }
 
     @classmethod
-    def process_financials_quote(
-        cls, financials_quote: tp.Dict[str, tp.Any]
-    ) -> tp.Dict[str, tp.Any]:
-        income_statement = IncomeStatements.process_financials_quote(financials_quote)
-        return {"income_statement": income_statement}
+    def process_quote(cls, quote: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Any]:
+        return get_asset_data_from_quote(quote)
+
+
+def _copy_children(asset: tp.Dict[str, tp.Any], field: str) -> tp.List[tp.Any]:
+    # copies the raw `earnings`/`trends` items of an asset dict and returns them
+    value = asset.get(field)
+    if isinstance(value, dict) and isinstance(value.get("__root__"), list):
+        value = asset[field] = {**value, "__root__": list(value["__root__"])}
+        items = value["__root__"]
+    elif isinstance(value, list):
+        items = asset[field] = list(value)
+    else:
+        return []
+    for idx, item in enumerate(items):
+        if isinstance(item, dict):
+            items[idx] = dict(item)
+    return items
+
+
+def score_assets(assets: tp.List[tp.Any]) -> tp.List[tp.Any]:
+    """Score the trends (and earnings status) of all the raw asset dicts at once.
+
+    Returns a copy of `assets`, the input dicts are not modified.
+    """
+    assets = [dict(asset) if isinstance(asset, dict) else asset for asset in assets]
+    trends: tp.List[tp.Any] = []
+    earnings: tp.List[tp.Any] = []
+    for asset in assets:
+        if isinstance(asset, dict):
+            trends.extend(_copy_children(asset, "trends"))
+            earnings.extend(_copy_children(asset, "earnings"))
+    # the children are already copies, they are scored in place
+    score_trends(trends, copy=False)
+    set_statuses(earnings, copy=False)
+    return assets
+
+
+# child table name -> (field of `Asset`, item model, key of the items)
+_CHILD_TABLES: tp.Dict[str, tp.Tuple[str, tp.Type[BaseModel], str]] = {
+    "earnings": ("earnings", Earning, "quarter"),
+    "trends": ("trends", Trend, "date"),
+    "income_statements": ("income_statement", IncomeStatement, "date"),
+    "quarterly_income_statements": (
+        "quarterly_income_statement",
+        IncomeStatement,
+        "date",
+    ),
+}
+_ASSET_COLUMNS = [
+    name
+    for name in Asset.__fields__
+    if name not in {field for field, _, _ in _CHILD_TABLES.values()}
+]
+
+
+def _child_records(value: tp.Any) -> tp.List[tp.Dict[str, tp.Any]]:
+    if value is None:
+        return []
+    if isinstance(value, BaseModelSequence):
+        value = value.__root__
+    elif isinstance(value, dict):
+        value = value.get("__root__") or []
+    return [item if isinstance(item, dict) else item.__dict__ for item in value]
+
+
+def build_tables(
+    assets: tp.Iterable[tp.Union[Asset, tp.Dict[str, tp.Any]]]
+) -> tp.Dict[str, pd.DataFrame]:
+    """Build the tables of `assets` in a single pass over them.
+
+    `assets` can be `Asset` models or the dicts extracted from the quote pages
+    (`Asset.extract`). Returns a flat `assets` frame (one row per symbol) and the
+    long `earnings`, `trends`, `income_statements` and
+    `quarterly_income_statements` frames, indexed by
+    `(symbol, quarter)` or `(symbol, date)`.
+    """
+    assets = list(assets)
+    if any(isinstance(asset, dict) for asset in assets):
+        assets = score_assets(assets)
+
+    rows: tp.List[tp.Dict[str, tp.Any]] = []
+    children: tp.Dict[str, tp.List[tp.Dict[str, tp.Any]]] = {
+        name: [] for name in _CHILD_TABLES
+    }
+    for asset in assets:
+        values = asset if isinstance(asset, dict) else asset.__dict__
+        symbol = values["symbol"].upper()
+        rows.append({**values, "symbol": symbol})
+        for name, (field, _, _) in _CHILD_TABLES.items():
+            children[name].extend(
+                {**record, "symbol": symbol}
+                for record in _child_records(values.get(field))
+            )
+
+    tables = {
+        "assets": pd.DataFrame(rows, columns=_ASSET_COLUMNS)
+        .set_index("symbol")
+        .sort_index()
+    }
+    for name, (_, model, key) in _CHILD_TABLES.items():
+        df = pd.DataFrame(children[name], columns=["symbol", *model.__fields__])
+        # quarters ("2Q2021") don't sort as strings
+        order = pd.to_datetime(df[key]) if key == "quarter" else df[key]
+        df = df.iloc[np.lexsort((order.to_numpy(), df["symbol"].to_numpy()))].set_index(
+            ["symbol", key]
+        )
+        tables[name] = df
+    return tables
 
 
 class Assets(BaseModelSequence[Asset]):
     __root__: tp.List[Asset]
 
+    _tables: tp.Optional[tp.Dict[str, pd.DataFrame]] = PrivateAttr(default=None)
+    _errors: tp.Dict[str, SymbolError] = PrivateAttr(default_factory=dict)
+
+    @validator("__root__", pre=True)
+    def set_scores(cls, value: tp.Any) -> tp.Any:
+        if not isinstance(value, list):
+            return value
+        return score_assets(value)
+
+    @classmethod
+    def trusted(cls, **values: tp.Any) -> Assets:
+        if isinstance(values.get("__root__"), list):
+            values["__root__"] = score_assets(values["__root__"])
+        return super().trusted(**values)
+
+    @property
+    def tables(self) -> tp.Dict[str, pd.DataFrame]:
+        """`assets`, `earnings`, `trends` and `income_statements` frames, see
+        `build_tables`."""
+        if self._tables is None:
+            with span("gen_df", model=type(self).__name__) as tags:
+                tables = build_tables(self.__root__)
+                if compact.enabled():
+                    tables = {
+                        name: compact.compact(table) for name, table in tables.items()
+                    }
+                self._tables = tables
+                tags["rows"] = len(self._tables["assets"])
+        return self._tables
+
+    @property
+    def errors(self) -> tp.Dict[str, SymbolError]:
+        """Symbols that failed in a `partial` `get`."""
+        return self._errors
+
+    @property
+    def earnings_df(self) -> pd.DataFrame:
+        return self.tables["earnings"]
+
+    @property
+    def trends_df(self) -> pd.DataFrame:
+        return self.tables["trends"]
+
+    @property
+    def income_statements_df(self) -> pd.DataFrame:
+        return self.tables["income_statements"]
+
+    @property
+    def quarterly_income_statements_df(self) -> pd.DataFrame:
+        return self.tables["quarterly_income_statements"]
+
     def gen_df(self) -> pd.DataFrame:
-        df = super().gen_df()
-        df["earnings"] = df["earnings"].apply(lambda v: None if len(v) == 0 else v)
-        df["trends"] = df["trends"].apply(lambda v: None if len(v) == 0 else v)
-        return df.set_index("symbol").sort_index().dropna(axis=1, how="all")
+        return self.tables["assets"].dropna(axis=1, how="all")
+
+    def to_bytes(self) -> bytes:
+        """Serialize to pstock's binary format, see `pstock.serialization`."""
+        return serialization.dumps("Assets", {"assets": serialization.to_data(self)})
+
+    @classmethod
+    def from_bytes(cls, data: serialization.Buffer) -> Assets:
+        """Load (trusted) `Assets` from the output of `to_bytes`."""
+        meta, _ = serialization.loads(data, "Assets")
+        return cls.trusted(
+            __root__=[serialization.restore(Asset, values) for values in meta["assets"]]
+        )
 
     @classmethod
     async def get(
@@ -65,10 +246,106 @@ class Assets(BaseModelSequence[Asset]):
         symbols: tp.List[str],
         *,
         client: tp.Optional[httpx.AsyncClient] = None,
+        validate: bool = True,
+        concurrency: tp.Optional[AIMDController] = None,
+        memo: tp.Optional[QuoteMemo] = None,
+        partial: bool = False,
+        timeout: tp.Optional[float] = None,
+        deadline: tp.Optional[float] = None,
     ):
-        async with httpx_client_manager(client=client) as _client:
-            async with asyncer.create_task_group() as tg:
-                soon_values = [
-                    tg.soonify(Asset.get)(symbol, client=_client) for symbol in symbols
+        """
+        With `partial=True`, the failed symbols (or the ones that took more than
+        `timeout` seconds, or still running after `deadline` seconds) are
+        reported in `.errors` instead of failing the call, see `pstock.partial`.
+        """
+        check_params(partial, timeout, deadline)
+
+        async def _extract(
+            symbol: str, client: httpx.AsyncClient
+        ) -> tp.Dict[str, tp.Any]:
+            with span("quote_summary.get", symbol=symbol.upper()):
+                response, financials_response = await Asset.get_responses(
+                    symbol, client=client
+                )
+                return Asset.extract(
+                    response=response,
+                    financials_response=financials_response,
+                    memo=memo,
+                    validate=validate,
+                )
+
+        if partial:
+            return await cls._get_partial(
+                symbols,
+                _extract,
+                client=client,
+                validate=validate,
+                concurrency=concurrency,
+                timeout=timeout,
+                deadline=deadline,
+            )
+
+        with use_controller(concurrency):
+            async with httpx_client_manager(client=client) as _client:
+                async with asyncer.create_task_group() as tg:
+                    soon_values = [
+                        tg.soonify(_extract)(symbol, _client) for symbol in symbols
+                    ]
+        # assets are built all at once, their trends are scored in a single pass
+        assets = [soon.value for soon in soon_values]
+        with span("validate", model=cls.__name__, validate=validate):
+            if not validate:
+                return cls.trusted(__root__=assets)
+            return cls.parse_obj(assets)
+
+    @classmethod
+    async def _get_partial(
+        cls,
+        symbols: tp.List[str],
+        extract: tp.Callable[
+            [str, httpx.AsyncClient], tp.Awaitable[tp.Dict[str, tp.Any]]
+        ],
+        *,
+        client: tp.Optional[httpx.AsyncClient],
+        validate: bool,
+        concurrency: tp.Optional[AIMDController],
+        timeout: tp.Optional[float],
+        deadline: tp.Optional[float],
+    ) -> Assets:
+        with use_controller(concurrency):
+            async with httpx_client_manager(client=client) as _client:
+                results, errors = await gather(
+                    lambda symbol: extract(symbol, _client),
+                    symbols,
+                    timeout=timeout,
+                    deadline=deadline,
+                )
+
+        fetched = [symbol for symbol in symbols if symbol in results]
+        extracted = [results[symbol] for symbol in fetched]
+        with span("validate", model=cls.__name__, validate=validate):
+            if not validate:
+                # pages without the asset data (unknown symbols) aren't trusted
+                required = [
+                    name for name, field in Asset.__fields__.items() if field.required
                 ]
-        return cls.parse_obj([soon.value for soon in soon_values])
+                complete = []
+                for symbol, asset in zip(fetched, extracted):
+                    missing = [name for name in required if name not in asset]
+                    if missing:
+                        error = ValueError(f"Missing asset fields {missing}")
+                        errors[symbol] = SymbolError(symbol, "error", error, 0.0)
+                    else:
+                        complete.append(asset)
+                assets = cls.trusted(__root__=complete)
+            else:
+                # validated one by one: an invalid asset only fails its own symbol
+                validated = []
+                for symbol, asset in zip(fetched, score_assets(extracted)):
+                    try:
+                        validated.append(Asset.parse_obj(asset))
+                    except ValidationError as error:
+                        errors[symbol] = SymbolError(symbol, "error", error, 0.0)
+                assets = cls.trusted(__root__=validated)
+        assets._errors = errors
+        return assets
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import json
 import typing as tp
 from datetime import datetime, timedelta
@@ -7,14 +8,33 @@ from urllib.parse import urlencode
 
 import asyncer
 import httpx
+import numpy as np
 import pandas as pd
 import pendulum
-from pydantic import validate_arguments
+from pydantic import PrivateAttr, validate_arguments
 
+from pstock import compact, serialization
+from pstock.adjustment import adjust, get_adjustment_factors
 from pstock.base import BaseModel, BaseModelMapping, BaseModelSequence
+from pstock.cache import BarsCache
+from pstock.concurrency import AIMDController, use_controller
+from pstock.instrumentation import span
+from pstock.market import TradingSession
+from pstock.partial import SymbolError, check_params, gather
 from pstock.types import ReadableResponse, Timestamp
-from pstock.utils.chart import get_ohlc_from_chart
-from pstock.utils.utils import httpx_client_manager, parse_datetime, parse_duration
+from pstock.utils.chart import (
+    get_charts_from_spark,
+    get_closes_from_chart,
+    get_events_from_chart,
+    get_ohlc_df_from_chart,
+    get_trading_session_from_chart,
+)
+from pstock.utils.utils import (
+    fetch,
+    httpx_client_manager,
+    parse_datetime,
+    parse_duration,
+)
 
 IntervalParam = tp.Literal[
     "1m", "2m", "5m", "15m", "30m", "1h", "1d", "5d", "1mo", "3mo"
@@ -23,6 +43,12 @@ PeriodParam = tp.Literal[
     "1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "ytd", "max"
 ]
 EventParam = tp.Literal["div", "split", "div,splits"]
+TimezoneParam = tp.Literal["utc", "exchange"]
+
+_PRICE_COLUMNS = ("open", "high", "low", "close", "adj_close", "volume")
+_EVENT_COLUMNS = {"dividends": ("amount",), "splits": ("numerator", "denominator")}
+# largest number of symbols yahoo-finance accepts in one spark request
+SPARK_BATCH_SIZE = 20
 
 
 def _get_lowest_valid_interval(
@@ -77,13 +103,48 @@ class Bar(BaseModel):
     interval: timedelta
 
 
+@validate_arguments
+def _resolve_params(
+    interval: tp.Optional[IntervalParam] = None,
+    period: tp.Optional[PeriodParam] = None,
+    start: tp.Optional[Timestamp] = None,
+    end: tp.Optional[Timestamp] = None,
+    events: EventParam = "div,splits",
+    include_prepost: bool = False,
+) -> tp.Dict[str, tp.Any]:
+    if period is None and start is None:
+        period = _get_largest_valid_period(interval=interval)
+
+    if end is None and start is not None:
+        end = pendulum.now().int_timestamp
+
+    if interval is None:
+        interval = _get_lowest_valid_interval(period=period, start=start)
+
+    _params: tp.Dict[str, tp.Any] = {
+        "interval": interval,
+        "events": events,
+        "includePrePost": include_prepost,
+    }
+    if period is not None:
+        _params["range"] = period
+    if start is not None:
+        _params["period1"] = start
+    if end is not None:
+        _params["period2"] = end
+
+    return _params
+
+
+_resolve_params_cached = functools.lru_cache(maxsize=512)(_resolve_params)
+
+
 class _BarMixin:
     @staticmethod
     def base_uri(symbol: str) -> str:
         return f"https://query2.finance.yahoo.com/v8/finance/chart/{symbol.upper()}"
 
     @staticmethod
-    @validate_arguments
     def params(
         interval: tp.Optional[IntervalParam] = None,
         period: tp.Optional[PeriodParam] = None,
@@ -92,28 +153,16 @@ class _BarMixin:
         events: EventParam = "div,splits",
         include_prepost: bool = False,
     ) -> tp.Dict[str, tp.Any]:
-        if period is None and start is None:
-            period = _get_largest_valid_period(interval=interval)
-
-        if end is None and start is not None:
-            end = pendulum.now().int_timestamp
-
-        if interval is None:
-            interval = _get_lowest_valid_interval(period=period, start=start)
-
-        _params: tp.Dict[str, tp.Any] = {
-            "interval": interval,
-            "events": events,
-            "includePrePost": include_prepost,
-        }
-        if period is not None:
-            _params["range"] = period
-        if start is not None:
-            _params["period1"] = start
-        if end is not None:
-            _params["period2"] = end
-
-        return _params
+        args = (interval, period, start, end, events, include_prepost)
+        # A missing `end` (or `interval` when `start` is set) is resolved relative
+        # to the current time, so only the time-independent combinations are cached
+        if start is not None and (end is None or interval is None):
+            return _resolve_params(*args)
+        try:
+            return dict(_resolve_params_cached(*args))
+        except TypeError:
+            # unhashable arguments, validation will decide if they are usable
+            return _resolve_params(*args)
 
     @classmethod
     def uri(
@@ -138,35 +187,267 @@ class _BarMixin:
         return f"{cls.base_uri(symbol)}?{urlencode(params)}"
 
 
+def _events_to_columns(events: pd.DataFrame) -> tp.Dict[str, np.ndarray]:
+    return {
+        "date": events.index.asi8,
+        **{column: events[column].to_numpy(dtype="float64") for column in events},
+    }
+
+
+def _events_from_columns(
+    kind: str, columns: tp.Optional[tp.Mapping[str, tp.Any]], tz: tp.Optional[str]
+) -> pd.DataFrame:
+    columns = columns or {}
+    dates = pd.DatetimeIndex(
+        np.asarray(columns.get("date", []), dtype="int64"), name="date"
+    ).tz_localize("UTC")
+    if tz is not None:
+        dates = dates.tz_convert(tz)
+    return pd.DataFrame(
+        {
+            column: np.asarray(columns.get(column, []), dtype="float64")
+            for column in _EVENT_COLUMNS[kind]
+        },
+        index=dates,
+    )
+
+
+def _dump_columns(
+    kind: str, columns: tp.List[tp.Dict[str, tp.Any]], meta: tp.Dict[str, tp.Any]
+) -> bytes:
+    # the columns of all the bars are concatenated in a single buffer per column
+    arrays = {
+        name: np.concatenate(
+            [_columns.get(name, np.empty(0, dtype=dtype)) for _columns in columns]
+        ).astype(dtype, copy=False)
+        for name, dtype in [("date", "int64")]
+        + [(column, "float64") for column in _PRICE_COLUMNS]
+    }
+    meta = {
+        **meta,
+        "lengths": [len(_columns["date"]) for _columns in columns],
+        "tz": [_columns["tz"] for _columns in columns],
+        "interval": [_columns["interval"] for _columns in columns],
+        "events": [
+            {
+                event: {
+                    name: array.tolist()
+                    for name, array in _columns.get(event, {}).items()
+                }
+                for event in _EVENT_COLUMNS
+            }
+            for _columns in columns
+        ],
+    }
+    return serialization.dumps(kind, meta, arrays)
+
+
+def _load_columns(
+    data: serialization.Buffer, kind: str
+) -> tp.Tuple[tp.Dict[str, tp.Any], tp.List[tp.Dict[str, tp.Any]]]:
+    meta, arrays = serialization.loads(data, kind)
+    columns = []
+    start = 0
+    events = meta.get("events") or [{}] * len(meta["lengths"])
+    for length, tz, interval, _events in zip(
+        meta["lengths"], meta["tz"], meta["interval"], events
+    ):
+        columns.append(
+            {
+                "tz": tz,
+                "interval": interval,
+                **_events,
+                **{
+                    name: array[start : start + length]
+                    for name, array in arrays.items()
+                },
+            }
+        )
+        start += length
+    return meta, columns
+
+
 class Bars(BaseModelSequence[Bar], _BarMixin):
     __root__: tp.List[Bar]
 
-    def gen_df(self) -> pd.DataFrame:
-        df = super().gen_df()
+    _session: tp.Optional[TradingSession] = PrivateAttr(default=None)
+    _dividends: tp.Optional[pd.DataFrame] = PrivateAttr(default=None)
+    _splits: tp.Optional[pd.DataFrame] = PrivateAttr(default=None)
+
+    @property
+    def session(self) -> tp.Optional[TradingSession]:
+        """Trading session of the exchange reported with the bars, if known."""
+        return self._session
+
+    @property
+    def dividends(self) -> pd.DataFrame:
+        """Dividends (`amount`) reported with the bars, indexed by ex-date."""
+        if self._dividends is None:
+            return _events_from_columns("dividends", None, None)
+        return self._dividends
+
+    @property
+    def splits(self) -> pd.DataFrame:
+        """Splits (`numerator`, `denominator`) reported with the bars, indexed by
+        date."""
+        if self._splits is None:
+            return _events_from_columns("splits", None, None)
+        return self._splits
+
+    def adjusted(self, *, splits: bool = False) -> pd.DataFrame:
+        """`.df` back-adjusted for the dividends (and splits, yahoo-finance's
+        prices already are), see `pstock.adjustment`."""
+        df = self.df
+        if df.empty:
+            return df
+        factors = get_adjustment_factors(
+            df.index,
+            df["close"],
+            self.dividends,
+            self.splits,
+            adjust_splits=splits,
+        )
+        return adjust(df, factors)
+
+    def _records_df(self) -> pd.DataFrame:
+        # all the bars, `.df` drops the ones missing all their prices
+        df = pd.DataFrame.from_records(
+            [bar.__dict__ for bar in self.__root__], columns=list(Bar.__fields__)
+        )
         if not df.empty:
-            df = df.dropna(
-                how="all",
-                subset=["open", "high", "low", "close", "adj_close", "volume"],
-            )
-            if df["interval"][0] >= timedelta(days=1):
-                df["date"] = pd.to_datetime(pd.to_datetime(df["date"]).dt.date)
+            if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+                df["date"] = pd.to_datetime(df["date"], utc=True)
             df = df.set_index("date").sort_index()
         return df
 
+    def gen_df(self) -> pd.DataFrame:
+        df = self._records_df()
+        if not df.empty:
+            df = df.dropna(how="all", subset=list(_PRICE_COLUMNS))
+        return df
+
+    def to_columns(self) -> tp.Dict[str, tp.Any]:
+        """All the bars as flat numpy arrays, cheap to pickle or serialize."""
+        df = self.df
+        if len(df) != len(self.__root__):
+            df = self._records_df()
+        events = {
+            "dividends": _events_to_columns(self.dividends),
+            "splits": _events_to_columns(self.splits),
+        }
+        if df.empty:
+            return {
+                "date": np.array([], dtype="int64"),
+                "tz": None,
+                "interval": None,
+                **events,
+            }
+        return {
+            "date": df.index.asi8,
+            "tz": str(df.index.tz) if df.index.tz is not None else None,
+            "interval": (
+                df["interval"].iloc[0] if "interval" in df else df.attrs["interval"]
+            ).total_seconds(),
+            **events,
+            **{
+                column: df[column].to_numpy(dtype="float64", na_value=np.nan)
+                for column in _PRICE_COLUMNS
+            },
+        }
+
+    @classmethod
+    def from_columns(cls, columns: tp.Mapping[str, tp.Any]) -> Bars:
+        """Build (trusted) `Bars` from the output of `to_columns`.
+
+        The dataframe is built directly from the arrays, without going through
+        the bars.
+        """
+        if len(columns["date"]) == 0:
+            bars = cls.trusted(__root__=[])
+        else:
+            dates = pd.DatetimeIndex(columns["date"], name="date")
+            if columns["tz"] is not None:
+                dates = dates.tz_localize("UTC").tz_convert(columns["tz"])
+            df = pd.DataFrame(
+                {column: columns[column] for column in _PRICE_COLUMNS}, index=dates
+            )
+            df["interval"] = pd.Timedelta(seconds=columns["interval"])
+            bars = cls._from_df(df)
+        bars._dividends = _events_from_columns(
+            "dividends", columns.get("dividends"), columns["tz"]
+        )
+        bars._splits = _events_from_columns(
+            "splits", columns.get("splits"), columns["tz"]
+        )
+        return bars
+
+    @classmethod
+    def _from_df(cls, df: pd.DataFrame, validate: bool = False) -> Bars:
+        """`Bars` of a frame indexed by date with an `interval` column, the missing
+        price columns are NaN. Trusted (and the frame kept as `.df`, without the
+        bars missing all their prices) unless `validate`."""
+        if df.empty:
+            return cls.parse_obj([]) if validate else cls.trusted(__root__=[])
+        df = df.reindex(columns=[*_PRICE_COLUMNS, "interval"])
+        interval = df["interval"].iloc[0].to_pytimedelta()
+        columns = [
+            df[column].to_numpy(dtype="float64").tolist() for column in _PRICE_COLUMNS
+        ]
+        bars_data = [
+            {"date": date, **dict(zip(_PRICE_COLUMNS, prices)), "interval": interval}
+            for date, *prices in zip(df.index, *columns)
+        ]
+        if validate:
+            return cls.parse_obj(bars_data)
+        bars = cls.trusted(__root__=bars_data)
+        df = df.dropna(how="all", subset=list(_PRICE_COLUMNS))
+        bars._df = compact.compact(df) if compact.enabled() else df
+        return bars
+
+    def to_bytes(self) -> bytes:
+        """Serialize to pstock's binary format, see `pstock.serialization`."""
+        return _dump_columns("Bars", [self.to_columns()], {})
+
+    @classmethod
+    def from_bytes(cls, data: serialization.Buffer) -> Bars:
+        """Load (trusted) `Bars` from the output of `to_bytes`."""
+        _, (columns,) = _load_columns(data, "Bars")
+        return cls.from_columns(columns)
+
     @classmethod
     def load(
         cls,
         *,
         response: tp.Union[ReadableResponse, str, bytes, dict],
+        tz: TimezoneParam = "utc",
+        validate: bool = True,
     ) -> Bars:
-        if isinstance(response, dict):
-            data = response
-        elif isinstance(response, (str, bytes)):
-            data = json.loads(response)
-        else:
-            data = json.loads(response.read())
+        with span("bars.load"):
+            if isinstance(response, dict):
+                data = response
+            else:
+                content = (
+                    response if isinstance(response, (str, bytes)) else response.read()
+                )
+                with span("json.loads", bytes=len(content)):
+                    data = json.loads(content)
+
+            with span("process", extractor="get_ohlc_df_from_chart") as tags:
+                df = get_ohlc_df_from_chart(data, tz=tz)
+                tags["rows"] = len(df)
+
+            with span("process", extractor="get_events_from_chart"):
+                events = get_events_from_chart(data, tz=tz)
+
+            with span("validate", model=cls.__name__, validate=validate):
+                _bars = cls._from_df(df, validate=validate)
 
-        return cls.parse_obj(get_ohlc_from_chart(data))
+            _bars._dividends = events["dividends"]
+            _bars._splits = events["splits"]
+            session = get_trading_session_from_chart(data)
+            if session is not None:
+                _bars._session = TradingSession.trusted(**session)
+            return _bars
 
     @classmethod
     async def get(
@@ -179,8 +460,27 @@ class Bars(BaseModelSequence[Bar], _BarMixin):
         end: tp.Optional[Timestamp] = None,
         events: EventParam = "div,splits",
         include_prepost: bool = False,
+        tz: TimezoneParam = "utc",
         client: tp.Optional[httpx.AsyncClient] = None,
+        validate: bool = True,
+        cache: tp.Optional[BarsCache] = None,
     ):
+        key = None
+        if cache is not None:
+            key = cache.key(
+                symbol,
+                interval=interval,
+                period=period,
+                start=start,
+                end=end,
+                events=events,
+                include_prepost=include_prepost,
+                tz=tz,
+            )
+            cached = cache.get(key, include_prepost=include_prepost)
+            if cached is not None:
+                return cached
+
         url = cls.base_uri(symbol)
         params = cls.params(
             interval=interval,
@@ -190,19 +490,210 @@ class Bars(BaseModelSequence[Bar], _BarMixin):
             events=events,
             include_prepost=include_prepost,
         )
-        async with httpx_client_manager(client=client) as _client:
-            response = await _client.get(url, params=params)
+        with span("bars.get", symbol=symbol.upper()):
+            async with httpx_client_manager(client=client) as _client:
+                response = await fetch(_client, url, params=params)
 
-        return cls.load(response=response)
+            bars = cls.load(response=response, tz=tz, validate=validate)
+        if cache is not None and key is not None:
+            cache.put(key, bars)
+        return bars
 
 
 class BarsMulti(BaseModelMapping[Bars], _BarMixin):
     __root__: tp.Dict[str, Bars]
 
+    _errors: tp.Dict[str, SymbolError] = PrivateAttr(default_factory=dict)
+
+    @property
+    def errors(self) -> tp.Dict[str, SymbolError]:
+        """Symbols that failed in a `partial` `get`."""
+        return self._errors
+
     def gen_df(self) -> pd.DataFrame:
         df = super().gen_df()
         return df.sort_index()
 
+    def adjusted(self, *, splits: bool = False) -> pd.DataFrame:
+        """`.df` back-adjusted for the dividends (and splits) of every symbol."""
+        keys, dfs = zip(
+            *[
+                (symbol, bars.adjusted(splits=splits))
+                for symbol, bars in self.__root__.items()
+            ]
+        )
+        return pd.concat(dfs, axis=1, keys=keys).sort_index()
+
+    def to_bytes(self) -> bytes:
+        """Serialize to pstock's binary format, see `pstock.serialization`."""
+        return _dump_columns(
+            "BarsMulti",
+            [bars.to_columns() for bars in self.__root__.values()],
+            {"symbols": list(self.__root__)},
+        )
+
+    @classmethod
+    def from_bytes(cls, data: serialization.Buffer) -> BarsMulti:
+        """Load (trusted) `BarsMulti` from the output of `to_bytes`."""
+        meta, columns = _load_columns(data, "BarsMulti")
+        return cls.trusted(
+            __root__={
+                symbol: Bars.from_columns(_columns)
+                for symbol, _columns in zip(meta["symbols"], columns)
+            }
+        )
+
+    @staticmethod
+    def spark_uri() -> str:
+        return "https://query1.finance.yahoo.com/v7/finance/spark"
+
+    @classmethod
+    def load_spark(
+        cls,
+        *,
+        response: tp.Union[ReadableResponse, str, bytes, dict],
+        tz: TimezoneParam = "utc",
+        validate: bool = True,
+    ) -> BarsMulti:
+        """Load the (close only) bars of every symbol of a spark response, the
+        `open`, `high`, `low`, `adj_close` and `volume` columns are NaN."""
+        with span("bars.load_spark"):
+            if isinstance(response, dict):
+                data = response
+            else:
+                content = (
+                    response if isinstance(response, (str, bytes)) else response.read()
+                )
+                with span("json.loads", bytes=len(content)):
+                    data = json.loads(content)
+
+            with span("process", extractor="get_closes_from_chart") as tags:
+                closes = {
+                    symbol: (get_closes_from_chart(chart, tz=tz), chart)
+                    for symbol, chart in get_charts_from_spark(data).items()
+                }
+                tags["rows"] = sum(len(df) for df, _ in closes.values())
+
+            multi = {}
+            with span("validate", model=cls.__name__, validate=validate):
+                for symbol, (df, chart) in closes.items():
+                    bars = Bars._from_df(df, validate=validate)
+                    session = get_trading_session_from_chart(chart)
+                    if session is not None:
+                        bars._session = TradingSession.trusted(**session)
+                    multi[symbol] = bars
+            return cls.trusted(__root__=multi)
+
+    @classmethod
+    async def _get_spark(
+        cls,
+        symbols: tp.List[str],
+        *,
+        params: tp.Dict[str, tp.Any],
+        tz: TimezoneParam,
+        client: httpx.AsyncClient,
+        validate: bool = True,
+    ) -> tp.Dict[str, Bars]:
+        with span("bars.get_spark", symbols=len(symbols)):
+            response = await fetch(
+                client,
+                cls.spark_uri(),
+                params={
+                    **params,
+                    "symbols": ",".join(symbol.upper() for symbol in symbols),
+                },
+            )
+            return cls.load_spark(response=response, tz=tz, validate=validate).__root__
+
+    @classmethod
+    async def _get_batched(
+        cls,
+        symbols: tp.List[str],
+        *,
+        params: tp.Dict[str, tp.Any],
+        tz: TimezoneParam,
+        client: tp.Optional[httpx.AsyncClient],
+        cache: tp.Optional[BarsCache],
+        validate: bool = True,
+        partial: bool = False,
+        timeout: tp.Optional[float] = None,
+        deadline: tp.Optional[float] = None,
+    ) -> tp.Tuple[tp.Dict[str, Bars], tp.Dict[str, SymbolError]]:
+        include_prepost = params["includePrePost"]
+        data: tp.Dict[str, Bars] = {}
+        keys = {}
+        if cache is not None:
+            for symbol in symbols:
+                keys[symbol] = cache.key(symbol, spark=True, tz=tz, **params)
+                cached = cache.get(keys[symbol], include_prepost=include_prepost)
+                if cached is not None:
+                    data[symbol] = cached
+
+        missing = list(
+            dict.fromkeys(symbol.upper() for symbol in symbols if symbol not in data)
+        )
+        batches = [
+            missing[idx : idx + SPARK_BATCH_SIZE]
+            for idx in range(0, len(missing), SPARK_BATCH_SIZE)
+        ]
+        fetched: tp.Dict[str, Bars] = {}
+        # errors of the failed batches, per symbol
+        batch_errors: tp.Dict[str, SymbolError] = {}
+        async with httpx_client_manager(client=client) as _client:
+            if partial:
+                results, errors = await gather(
+                    lambda batch: cls._get_spark(
+                        list(batch),
+                        params=params,
+                        tz=tz,
+                        client=_client,
+                        validate=validate,
+                    ),
+                    [tuple(batch) for batch in batches],
+                    timeout=timeout,
+                    deadline=deadline,
+                )
+                for result in results.values():
+                    fetched.update(result)
+                for batch, error in errors.items():
+                    for symbol in batch:
+                        batch_errors[symbol] = error._replace(symbol=symbol)
+            else:
+                async with asyncer.create_task_group() as tg:
+                    soon_values = [
+                        tg.soonify(cls._get_spark)(
+                            batch,
+                            params=params,
+                            tz=tz,
+                            client=_client,
+                            validate=validate,
+                        )
+                        for batch in batches
+                    ]
+                for soon_value in soon_values:
+                    fetched.update(soon_value.value)
+
+        symbol_errors: tp.Dict[str, SymbolError] = {}
+        for symbol in symbols:
+            if symbol in data:
+                continue
+            if symbol.upper() in batch_errors:
+                error = batch_errors[symbol.upper()]
+                symbol_errors[symbol] = error._replace(symbol=symbol)
+            elif symbol.upper() not in fetched:
+                missing_error = ValueError(
+                    f"Yahoo-finance spark response is missing symbol '{symbol}'"
+                )
+                if not partial:
+                    raise missing_error
+                symbol_errors[symbol] = SymbolError(symbol, "error", missing_error, 0.0)
+            else:
+                data[symbol] = fetched[symbol.upper()]
+                if cache is not None:
+                    cache.put(keys[symbol], data[symbol])
+        data = {symbol: data[symbol] for symbol in symbols if symbol in data}
+        return data, symbol_errors
+
     @classmethod
     async def get(
         cls,
@@ -214,24 +705,84 @@ class BarsMulti(BaseModelMapping[Bars], _BarMixin):
         end: tp.Optional[Timestamp] = None,
         events: EventParam = "div,splits",
         include_prepost: bool = False,
+        tz: TimezoneParam = "utc",
         client: tp.Optional[httpx.AsyncClient] = None,
+        validate: bool = True,
+        concurrency: tp.Optional[AIMDController] = None,
+        cache: tp.Optional[BarsCache] = None,
+        spark: bool = False,
+        partial: bool = False,
+        timeout: tp.Optional[float] = None,
+        deadline: tp.Optional[float] = None,
     ):
-        async with httpx_client_manager(client=client) as _client:
-            async with asyncer.create_task_group() as tg:
-                soon_values = [
-                    tg.soonify(Bars.get)(
-                        symbol,
-                        interval=interval,
-                        period=period,
-                        start=start,
-                        end=end,
-                        include_prepost=include_prepost,
-                        events=events,
-                        client=_client,
-                    )
-                    for symbol in symbols
-                ]
-        data = {
-            symbol: soon_value.value for symbol, soon_value in zip(symbols, soon_values)
-        }
-        return cls.parse_obj(data)
+        """
+        With `spark=True`, the close prices of up to `SPARK_BATCH_SIZE` symbols
+        are fetched per request from the spark endpoint (no `open`, `high`, `low`,
+        `adj_close`, `volume` nor dividends and splits): much fewer requests for
+        close snapshots of large universes. The bars are validated like the
+        chart ones unless `validate=False`.
+
+        With `partial=True`, the failed symbols (or the ones that took more than
+        `timeout` seconds, or still running after `deadline` seconds) are
+        reported in `.errors` instead of failing the call, see `pstock.partial`.
+        """
+        check_params(partial, timeout, deadline)
+        errors: tp.Dict[str, SymbolError] = {}
+        if spark:
+            params = cls.params(
+                interval=interval,
+                period=period,
+                start=start,
+                end=end,
+                events=events,
+                include_prepost=include_prepost,
+            )
+            del params["events"]
+            with use_controller(concurrency):
+                data, errors = await cls._get_batched(
+                    symbols,
+                    params=params,
+                    tz=tz,
+                    client=client,
+                    cache=cache,
+                    validate=validate,
+                    partial=partial,
+                    timeout=timeout,
+                    deadline=deadline,
+                )
+        else:
+            kwargs: tp.Dict[str, tp.Any] = dict(
+                interval=interval,
+                period=period,
+                start=start,
+                end=end,
+                include_prepost=include_prepost,
+                events=events,
+                tz=tz,
+                validate=validate,
+                cache=cache,
+            )
+            with use_controller(concurrency):
+                async with httpx_client_manager(client=client) as _client:
+                    if partial:
+                        results, errors = await gather(
+                            lambda symbol: Bars.get(symbol, client=_client, **kwargs),
+                            symbols,
+                            timeout=timeout,
+                            deadline=deadline,
+                        )
+                    else:
+                        async with asyncer.create_task_group() as tg:
+                            soon_values = [
+                                tg.soonify(Bars.get)(symbol, client=_client, **kwargs)
+                                for symbol in symbols
+                            ]
+                        results = {
+                            symbol: soon_value.value
+                            for symbol, soon_value in zip(symbols, soon_values)
+                        }
+            data = {symbol: results[symbol] for symbol in symbols if symbol in results}
+
+        multi = cls.trusted(__root__=data) if not validate else cls.parse_obj(data)
+        multi._errors = errors
+        return multi
@@ -8,6 +8,12 @@ import pandas as pd
 import pendulum
 from pydantic import BaseModel as _BaseModel
 from pydantic import PrivateAttr
+from pydantic.fields import SHAPE_DICT, SHAPE_LIST, SHAPE_MAPPING, ModelField
+
+from pstock import compact
+from pstock.instrumentation import span
+
+M = tp.TypeVar("M", bound="BaseModel")
 
 
 class BaseModel(_BaseModel):
@@ -17,6 +23,43 @@ class BaseModel(_BaseModel):
     def created_at(self) -> datetime:
         return self._created_at
 
+    @classmethod
+    def trusted(cls: tp.Type[M], **values: tp.Any) -> M:
+        """Build the model from pre-coerced values, skipping pydantic validation.
+
+        Only meant for data produced by pstock's own extractors, user-supplied
+        input should keep going through the regular (validated) constructors.
+        Nested pstock models are built the same way, subclasses can override this
+        to fill the fields that are otherwise computed by their validators.
+        """
+        for name, field in cls.__fields__.items():
+            if name in values:
+                values[name] = _trusted_value(field, values[name])
+        return cls.construct(**values)
+
+    @classmethod
+    def _trusted_from(cls: tp.Type[M], value: tp.Any) -> M:
+        if isinstance(value, cls):
+            return value
+        if "__root__" in cls.__fields__ and not (
+            isinstance(value, dict) and "__root__" in value
+        ):
+            return cls.trusted(__root__=value)
+        return cls.trusted(**value)
+
+
+def _trusted_value(field: ModelField, value: tp.Any) -> tp.Any:
+    if value is None or not (
+        isinstance(field.type_, type) and issubclass(field.type_, BaseModel)
+    ):
+        return value
+    model = field.type_
+    if field.shape == SHAPE_LIST:
+        return [model._trusted_from(item) for item in value]
+    if field.shape in (SHAPE_DICT, SHAPE_MAPPING):
+        return {key: model._trusted_from(item) for key, item in value.items()}
+    return model._trusted_from(value)
+
 
 class BaseModelDf(BaseModel, ABC):
 
@@ -29,7 +72,12 @@ class BaseModelDf(BaseModel, ABC):
     @property
     def df(self) -> pd.DataFrame:
         if self._df is None:
-            self._df = self.gen_df()
+            with span("gen_df", model=type(self).__name__) as tags:
+                df = self.gen_df()
+                if compact.enabled():
+                    df = compact.compact(df)
+                self._df = df
+                tags["rows"] = len(df)
         return self._df
 
 
@@ -79,4 +127,6 @@ class BaseModelMapping(tp.Generic[U], BaseModelDf):
 
     def gen_df(self) -> pd.DataFrame:
         keys, dfs = zip(*[(key, value.df) for key, value in self.__root__.items()])
-        return pd.concat(dfs, axis=1, keys=keys)
+        df = pd.concat(dfs, axis=1, keys=keys)
+        df.attrs = compact.merge_attrs(keys, dfs)
+        return df
@@ -0,0 +1,101 @@
+"""In-memory cache of `Bars`, aware of the trading sessions of the exchanges.
+
+Bars can't change while their market is closed: a series fetched after the
+close (or before the open) stays fresh until the next session starts, so calls
+outside trading hours, on weekends or holidays don't reach the network. While
+the market is open, cached bars are fresh for `max_age` seconds.
+
+```python
+cache = BarsCache()
+bars = await Bars.get("TSLA", period="1mo", interval="1d", cache=cache)
+bars = await BarsMulti.get(symbols, period="1y", cache=cache)
+```
+
+The most recent session seen for an exchange (from any symbol) is used for all
+the symbols of that exchange.
+"""
+import typing as tp
+from collections import OrderedDict
+from datetime import datetime
+
+import pendulum
+
+from pstock import metrics
+from pstock.market import TradingSession
+
+if tp.TYPE_CHECKING:  # pragma: no cover
+    from pstock.bar import Bars
+
+Key = tp.Tuple[str, tp.Tuple[tp.Tuple[str, tp.Any], ...]]
+
+
+class BarsCache:
+    def __init__(self, *, max_age: float = 60.0, maxsize: int = 4096) -> None:
+        """
+        Args:
+            max_age: Seconds bars fetched while the market is open stay fresh.
+            maxsize: Maximum number of cached series, least recently used ones
+                are evicted first.
+        """
+        self.max_age = max_age
+        self.maxsize = maxsize
+        self._entries: tp.OrderedDict[Key, "Bars"] = OrderedDict()
+        self._sessions: tp.Dict[str, TradingSession] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(symbol: str, **params: tp.Any) -> Key:
+        return symbol.upper(), tuple(sorted(params.items()))
+
+    def session(self, bars: "Bars") -> tp.Optional[TradingSession]:
+        """Latest known trading session of the exchange of `bars`."""
+        session = bars.session
+        if session is None or session.exchange is None:
+            return session
+        latest = self._sessions.get(session.exchange)
+        if latest is not None and latest.regular_start > session.regular_start:
+            return latest
+        return session
+
+    def get(
+        self,
+        key: Key,
+        *,
+        include_prepost: bool = False,
+        now: tp.Optional[datetime] = None,
+    ) -> tp.Optional["Bars"]:
+        """Cached bars of `key` if they are still fresh."""
+        bars = self._entries.get(key)
+        session = None if bars is None else self.session(bars)
+        if (
+            bars is None
+            or session is None
+            or not session.is_fresh(
+                bars.created_at,
+                now or pendulum.now(),
+                include_prepost=include_prepost,
+                max_age=self.max_age,
+            )
+        ):
+            metrics.increment("cache_misses_total", cache="bars")
+            return None
+        self._entries.move_to_end(key)
+        metrics.increment("cache_hits_total", cache="bars")
+        return bars
+
+    def put(self, key: Key, bars: "Bars") -> None:
+        session = bars.session
+        if session is not None and session.exchange is not None:
+            latest = self._sessions.get(session.exchange)
+            if latest is None or session.regular_start >= latest.regular_start:
+                self._sessions[session.exchange] = session
+        self._entries[key] = bars
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._sessions.clear()
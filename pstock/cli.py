@@ -0,0 +1,261 @@
+"""`pstock` command line interface.
+
+```console
+$ pstock fetch bars --symbols symbols.txt --output data/ --period 1y --interval 1d
+```
+
+Results are written per symbol (`<output>/<kind>/symbol=<SYMBOL>/<table>.<format>`)
+and every finished symbol is appended to `<output>/<kind>/manifest.jsonl`, so
+an interrupted run only fetches the symbols that are not done yet when started
+again with the same arguments.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import typing as tp
+from pathlib import Path
+
+import anyio
+import httpx
+import pandas as pd
+
+from pstock.asset import Asset, build_tables
+from pstock.bar import Bars
+from pstock.concurrency import AIMDController, use_controller
+from pstock.news import News
+
+Kind = tp.Literal["bars", "assets", "news"]
+Tables = tp.Dict[str, pd.DataFrame]
+
+
+def read_symbols(path: str) -> tp.List[str]:
+    lines = sys.stdin if path == "-" else Path(path).read_text().splitlines()
+    symbols = (line.split("#", 1)[0].strip().upper() for line in lines)
+    return list(dict.fromkeys(symbol for symbol in symbols if symbol))
+
+
+class Manifest:
+    """Append-only record of the symbols of a run that are done (or failed)."""
+
+    def __init__(self, directory: Path, params: tp.Dict[str, tp.Any]) -> None:
+        self.path = directory / "manifest.jsonl"
+        self.params = params
+        self.done: tp.Set[str] = set()
+        self.failed: tp.Dict[str, str] = {}
+        if self.path.exists():
+            self._read()
+        else:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._append({"params": params})
+
+    def _read(self) -> None:
+        with self.path.open() as f:
+            lines = f.read().splitlines()
+        for idx, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # a crash can leave the last line truncated
+                continue
+            if idx == 0:
+                if record.get("params") != self.params:
+                    raise ValueError(
+                        f"{self.path} was created with different params "
+                        f"{record.get('params')}, use another output directory or "
+                        "--restart to start over."
+                    )
+            elif record["status"] == "done":
+                self.done.add(record["symbol"])
+                self.failed.pop(record["symbol"], None)
+            else:
+                self.failed[record["symbol"]] = record.get("error", "")
+
+    def _append(self, record: tp.Dict[str, tp.Any]) -> None:
+        with self.path.open("a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def mark_done(self, symbol: str) -> None:
+        self.done.add(symbol)
+        self.failed.pop(symbol, None)
+        self._append({"symbol": symbol, "status": "done"})
+
+    def mark_failed(self, symbol: str, error: BaseException) -> None:
+        self.failed[symbol] = repr(error)
+        self._append({"symbol": symbol, "status": "failed", "error": repr(error)})
+
+
+def write_table(df: pd.DataFrame, path: Path, file_format: str) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    if file_format == "parquet":
+        df.to_parquet(tmp_path)
+    else:
+        df.to_csv(tmp_path)
+    os.replace(tmp_path, path)
+
+
+async def fetch_tables(
+    kind: Kind,
+    symbol: str,
+    params: tp.Dict[str, tp.Any],
+    client: httpx.AsyncClient,
+) -> Tables:
+    if kind == "bars":
+        bars = await Bars.get(symbol, client=client, validate=False, **params)
+        return {"bars": bars.df}
+    if kind == "news":
+        news = await News.get(symbol, client=client, validate=False)
+        return {"news": news.df}
+
+    asset = await Asset.get(symbol, client=client, validate=False)
+    tables = build_tables([asset])
+    result = {
+        "asset": tables["assets"],
+        "earnings": tables["earnings"],
+        "trends": tables["trends"],
+    }
+    if asset.income_statement is not None:
+        result["income_statement"] = tables["income_statements"]
+    if asset.quarterly_income_statement is not None:
+        result["quarterly_income_statement"] = tables["quarterly_income_statements"]
+    return result
+
+
+async def run_fetch(
+    kind: Kind,
+    symbols: tp.List[str],
+    output: Path,
+    *,
+    params: tp.Dict[str, tp.Any],
+    file_format: str = "parquet",
+    concurrency: int = 16,
+    restart: bool = False,
+) -> Manifest:
+    directory = output / kind
+    if restart and (directory / "manifest.jsonl").exists():
+        (directory / "manifest.jsonl").unlink()
+    manifest = Manifest(directory, {"kind": kind, "format": file_format, **params})
+    todo = [symbol for symbol in symbols if symbol not in manifest.done]
+
+    limiter = anyio.CapacityLimiter(concurrency)
+    controller = AIMDController(
+        initial=min(8, concurrency), max_limit=max(concurrency, 1)
+    )
+
+    async def _fetch_symbol(symbol: str, client: httpx.AsyncClient) -> None:
+        async with limiter:
+            try:
+                tables = await fetch_tables(kind, symbol, params, client)
+            except Exception as error:
+                manifest.mark_failed(symbol, error)
+                return
+        symbol_dir = directory / f"symbol={symbol}"
+        symbol_dir.mkdir(parents=True, exist_ok=True)
+        for name, df in tables.items():
+            await anyio.to_thread.run_sync(
+                write_table, df, symbol_dir / f"{name}.{file_format}", file_format
+            )
+        manifest.mark_done(symbol)
+
+    with use_controller(controller):
+        async with httpx.AsyncClient() as client:
+            async with anyio.create_task_group() as tg:
+                for symbol in todo:
+                    tg.start_soon(_fetch_symbol, symbol, client)
+    return manifest
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pstock", description="Async yahoo-finance python api."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch_parser = commands.add_parser(
+        "fetch", help="Fetch data for a list of symbols, resumable."
+    )
+    fetch_parser.add_argument("kind", choices=["bars", "assets", "news"])
+    fetch_parser.add_argument(
+        "--symbols",
+        required=True,
+        help="File with one symbol per line ('-' for stdin).",
+    )
+    fetch_parser.add_argument("--output", required=True, type=Path)
+    fetch_parser.add_argument(
+        "--format", dest="file_format", choices=["parquet", "csv"], default="parquet"
+    )
+    fetch_parser.add_argument("--concurrency", type=_positive_int, default=16)
+    fetch_parser.add_argument(
+        "--restart", action="store_true", help="Ignore the progress of previous runs."
+    )
+    bars_group = fetch_parser.add_argument_group("bars")
+    bars_group.add_argument("--interval")
+    bars_group.add_argument("--period")
+    bars_group.add_argument("--start")
+    bars_group.add_argument("--end")
+    bars_group.add_argument("--tz", choices=["utc", "exchange"], default="utc")
+    bars_group.add_argument("--include-prepost", action="store_true")
+    return parser
+
+
+def main(argv: tp.Optional[tp.List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+
+    if args.file_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print(
+                "Writing parquet files requires pyarrow, install it with "
+                "`pip install pstock-python[parquet]` or use `--format csv`.",
+                file=sys.stderr,
+            )
+            return 2
+
+    params: tp.Dict[str, tp.Any] = {}
+    if args.kind == "bars":
+        params = {
+            key: value
+            for key, value in {
+                "interval": args.interval,
+                "period": args.period,
+                "start": args.start,
+                "end": args.end,
+                "tz": args.tz,
+                "include_prepost": args.include_prepost,
+            }.items()
+            if value is not None
+        }
+
+    symbols = read_symbols(args.symbols)
+    manifest = anyio.run(
+        lambda: run_fetch(
+            args.kind,
+            symbols,
+            args.output,
+            params=params,
+            file_format=args.file_format,
+            concurrency=args.concurrency,
+            restart=args.restart,
+        )
+    )
+    done = sum(symbol in manifest.done for symbol in symbols)
+    print(f"{done}/{len(symbols)} symbols done, output in '{args.output}'.")
+    for symbol, error in manifest.failed.items():
+        print(f"  {symbol} failed: {error}", file=sys.stderr)
+    return 0 if done == len(symbols) else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Memory-compact dtypes of the generated dataframes (opt-in).
+
+In compact mode the `.df` of every model is generated with:
+
+- float32 floats (prices, revenues, scores, ...),
+- the smallest integer dtype that fits for volumes and counts (nullable if
+  some are missing),
+- categorical dtypes for repeated strings (sector, industry, currency, ...),
+- the bars `interval` in `df.attrs["interval"]` instead of a column (a
+  `{symbol: interval}` dict if the symbols of a `BarsMulti` differ).
+
+```python
+from pstock import compact
+
+compact.enable()
+bars = await BarsMulti.get(symbols, period="max", interval="1d")
+bars.df  # about half the memory
+```
+
+`enable` / `disable` set the default of the process, `compact_mode` overrides
+it in a block only (for the current task and the ones it starts).
+
+float32 keeps about 7 significant digits. Frames already generated (`.df` is
+cached) are not converted, see `compact.compact` for those.
+"""
+import contextlib
+import typing as tp
+from contextvars import ContextVar
+
+import numpy as np
+import pandas as pd
+
+INTEGER_COLUMNS = frozenset(
+    ["volume", "strong_buy", "buy", "hold", "sell", "strong_sell"]
+)
+CATEGORICAL_COLUMNS = frozenset(
+    [
+        "asset_type",
+        "currency",
+        "exchange",
+        "industry",
+        "recomendation",
+        "sector",
+        "status",
+        "symbol",
+    ]
+)
+
+_enabled = False
+# set by `compact_mode`, `None` outside of it
+_mode: ContextVar[tp.Optional[bool]] = ContextVar("pstock_compact", default=None)
+
+
+def enabled() -> bool:
+    mode = _mode.get()
+    return _enabled if mode is None else mode
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+@contextlib.contextmanager
+def compact_mode(enable: bool = True) -> tp.Iterator[None]:
+    """Enable (or disable) compact mode inside the block only."""
+    token = _mode.set(enable)
+    try:
+        yield
+    finally:
+        _mode.reset(token)
+
+
+def _integer_dtype(series: pd.Series) -> tp.Any:
+    values = series.to_numpy(dtype="float64", na_value=np.nan)
+    missing = np.isnan(values)
+    values = values[~missing]
+    if values.size and not np.array_equal(values, np.floor(values)):
+        return None
+    if values.size:
+        dtype = np.result_type(
+            np.min_scalar_type(int(values.min())),
+            np.min_scalar_type(int(values.max())),
+        )
+    else:
+        dtype = np.dtype("uint8")
+    if missing.any():
+        # pandas' nullable integers: UInt32, Int64, ...
+        return dtype.name.replace("uint", "UInt").replace("int", "Int")
+    return dtype
+
+
+def _compact_dtype(name: tp.Any, series: pd.Series) -> tp.Any:
+    dtype = series.dtype
+    if name in CATEGORICAL_COLUMNS and (
+        dtype == object or isinstance(dtype, pd.CategoricalDtype)
+    ):
+        return "category"
+    if name in INTEGER_COLUMNS or pd.api.types.is_integer_dtype(dtype):
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(
+            dtype
+        ):
+            integer = _integer_dtype(series)
+            if integer is not None:
+                return integer
+    if pd.api.types.is_float_dtype(dtype):
+        return "float32"
+    return None
+
+
+def _label(column: tp.Any) -> tp.Any:
+    return column[-1] if isinstance(column, tuple) else column
+
+
+def _key(column: tp.Any) -> tp.Any:
+    # `interval` -> None, `(symbol, interval)` -> symbol
+    if not isinstance(column, tuple):
+        return None
+    return column[0] if len(column) == 2 else column[:-1]
+
+
+def compact(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of `df` with compact dtypes, see the module's docstring."""
+    attrs = dict(df.attrs)
+    intervals = [column for column in df.columns if _label(column) == "interval"]
+    if intervals:
+        # the intervals of the frames that were already compact
+        known = attrs.get("interval")
+        values = dict(known) if isinstance(known, dict) else {}
+        for column in intervals:
+            series = df[column].dropna()
+            values[_key(column)] = series.iloc[0] if not series.empty else None
+        first = next(iter(values.values()))
+        if all(value == first for value in values.values()):
+            attrs["interval"] = first
+        else:
+            attrs["interval"] = values
+        df = df.drop(columns=intervals)
+
+    dtypes = {}
+    for column in df.columns:
+        dtype = _compact_dtype(_label(column), df[column])
+        if dtype is not None and dtype != df[column].dtype:
+            dtypes[column] = dtype
+    if dtypes:
+        df = df.astype(dtypes)
+    elif not intervals:
+        df = df.copy()
+    df.attrs = attrs
+    return df
+
+
+def merge_attrs(keys: tp.Sequence[tp.Any], dfs: tp.Sequence[pd.DataFrame]) -> tp.Dict:
+    """`attrs` of frames concatenated under `keys`: an attribute is kept as is
+    if it's the same for all the frames, as a `{key: value}` dict otherwise."""
+    attrs: tp.Dict[str, tp.Any] = {}
+    for name in {name for df in dfs for name in df.attrs}:
+        values = {key: df.attrs.get(name) for key, df in zip(keys, dfs)}
+        first = next(iter(values.values()))
+        attrs[name] = (
+            first if all(value == first for value in values.values()) else values
+        )
+    return attrs
@@ -0,0 +1,163 @@
+"""Adaptive (AIMD) concurrency control of the requests sent by fan-out calls
+(`BarsMulti.get`, `Assets.get`, `NewsMulti.get`, ...).
+
+Each host gets its own limit of in-flight requests. While responses are healthy
+the limit grows additively (about `+increase` per `limit` responses), a `429`,
+`503` or a latency spike cuts it multiplicatively, at most once per round-trip.
+
+```python
+controller = AIMDController(initial=8, max_limit=64)
+bars = await BarsMulti.get(symbols, period="1y", concurrency=controller)
+```
+
+The same controller can be reused across calls to keep what it learned.
+"""
+from __future__ import annotations
+
+import time
+import typing as tp
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+import anyio
+
+THROTTLING_STATUS_CODES = (429, 503)
+
+
+class _HostState:
+    def __init__(self, limit: float) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self.waiters: tp.List[anyio.Event] = []
+        self.latency: tp.Optional[float] = None
+        self.last_decrease = 0.0
+
+
+class Slot:
+    def __init__(self, controller: AIMDController, host: str) -> None:
+        self.controller = controller
+        self.host = host
+        self.started_at = time.monotonic()
+
+    def report(self, status_code: tp.Optional[int]) -> None:
+        self.controller.report(
+            self.host,
+            status_code=status_code,
+            latency=time.monotonic() - self.started_at,
+            started_at=self.started_at,
+        )
+
+
+class AIMDController:
+    def __init__(
+        self,
+        *,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_factor: float = 2.0,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+    ) -> None:
+        if not 0 < decrease < 1:
+            raise ValueError(f"decrease should be between 0 and 1, got {decrease}")
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError(
+                "Expected 1 <= min_limit <= initial <= max_limit, got "
+                f"{min_limit}, {initial}, {max_limit}"
+            )
+        self.initial = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._hosts: tp.Dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        if host not in self._hosts:
+            self._hosts[host] = _HostState(float(self.initial))
+        return self._hosts[host]
+
+    def limit(self, host: str) -> int:
+        return int(self._state(host).limit)
+
+    def in_flight(self, host: str) -> int:
+        return self._state(host).in_flight
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> tp.AsyncIterator[Slot]:
+        state = self._state(host)
+        while state.in_flight >= int(state.limit):
+            event = anyio.Event()
+            state.waiters.append(event)
+            await event.wait()
+        state.in_flight += 1
+        try:
+            yield Slot(self, host)
+        finally:
+            state.in_flight -= 1
+            self._wake_up(state)
+
+    def _wake_up(self, state: _HostState) -> None:
+        # every waiter re-checks the limit, cancelled waiters are simply dropped
+        waiters, state.waiters = state.waiters, []
+        for event in waiters:
+            event.set()
+
+    def report(
+        self,
+        host: str,
+        *,
+        status_code: tp.Optional[int],
+        latency: float,
+        started_at: tp.Optional[float] = None,
+    ) -> None:
+        state = self._state(host)
+        throttled = status_code is None or status_code in THROTTLING_STATUS_CODES
+        slow = (
+            state.latency is not None and latency > self.latency_factor * state.latency
+        )
+        if not throttled:
+            # slowly follow the latency, so that a lasting change becomes the norm
+            if state.latency is None:
+                state.latency = latency
+            else:
+                state.latency += 0.1 * (latency - state.latency)
+        if throttled or slow:
+            # requests started before the last decrease saw the same congestion
+            if started_at is None or started_at >= state.last_decrease:
+                state.limit = max(self.min_limit, state.limit * self.decrease)
+                state.last_decrease = time.monotonic()
+            return
+
+        state.limit = min(self.max_limit, state.limit + self.increase / state.limit)
+        self._wake_up(state)
+
+
+_controller: ContextVar[tp.Optional[AIMDController]] = ContextVar(
+    "pstock_concurrency", default=None
+)
+
+
+def current_controller() -> tp.Optional[AIMDController]:
+    return _controller.get()
+
+
+@contextmanager
+def use_controller(
+    controller: tp.Optional[AIMDController],
+) -> tp.Iterator[tp.Optional[AIMDController]]:
+    """Route the requests made in this context through `controller`."""
+    if controller is None:
+        yield current_controller()
+        return
+    token = _controller.set(controller)
+    try:
+        yield controller
+    finally:
+        _controller.reset(token)
@@ -9,6 +9,61 @@ from pstock.quote import QuoteSummary
 from pstock.utils.quote import get_earnings_data_from_quote
 
 
+def _get_status(
+    estimate: tp.Optional[float], actual: tp.Optional[float]
+) -> tp.Literal[None, "Beat", "Missed"]:
+    if actual is None or np.isnan(actual) or estimate is None or np.isnan(estimate):
+        return None
+    return "Beat" if actual >= estimate else "Missed"
+
+
+def get_statuses(estimates: np.ndarray, actuals: np.ndarray) -> np.ndarray:
+    """Vectorized `_get_status`."""
+    estimates = np.asarray(estimates, dtype="float64")
+    actuals = np.asarray(actuals, dtype="float64")
+    statuses = np.where(actuals >= estimates, "Beat", "Missed").astype(object)
+    statuses[np.isnan(estimates) | np.isnan(actuals)] = None
+    return statuses
+
+
+def set_statuses(earnings: tp.List[tp.Any], *, copy: bool = True) -> tp.List[tp.Any]:
+    """Fill the missing `status` of raw earning dicts in one pass.
+
+    Returns a copy of `earnings`, the input dicts are not modified (unless
+    `copy=False`, for dicts the caller already owns).
+    """
+    if copy:
+        earnings = [
+            dict(earning) if isinstance(earning, dict) else earning
+            for earning in earnings
+        ]
+    missing = [
+        earning
+        for earning in earnings
+        if isinstance(earning, dict) and earning.get("status") is None
+    ]
+    if not missing:
+        return earnings
+    values = np.array(
+        [
+            [
+                np.nan if earning.get(field) is None else earning[field]
+                for field in ("estimate", "actual")
+            ]
+            for earning in missing
+        ],
+        dtype="float64",
+    )
+    for earning, status in zip(missing, get_statuses(values[:, 0], values[:, 1])):
+        earning["status"] = status
+    return earnings
+
+
+def _quarter_order(quarters: tp.Sequence[str]) -> np.ndarray:
+    # quarters ("2Q2021") are parsed once, in a single call
+    return np.argsort(pd.to_datetime(pd.Index(quarters)).asi8, kind="stable")
+
+
 class Earning(BaseModel):
     quarter: str
     estimate: float
@@ -23,27 +78,46 @@ class Earning(BaseModel):
     ) -> tp.Literal[None, "Beat", "Missed"]:
         if value is not None:
             return value
-        estimate = values.get("estimate")
-        actual = values.get("actual")
-        if actual is None or np.isnan(actual) or estimate is None or np.isnan(estimate):
-            return None
-        return "Beat" if actual >= estimate else "Missed"
+        return _get_status(values.get("estimate"), values.get("actual"))
+
+    @classmethod
+    def trusted(cls, **values: tp.Any) -> "Earning":
+        if values.get("status") is None:
+            values["status"] = _get_status(values.get("estimate"), values.get("actual"))
+        return super().trusted(**values)
 
 
 class Earnings(BaseModelSequence[Earning], QuoteSummary):
     __root__: tp.List[Earning]
 
+    modules: tp.ClassVar[tp.Tuple[str, ...]] = ("earnings",)
+
     def gen_df(self) -> pd.DataFrame:
         df = super().gen_df()
         if not df.empty:
             df = df.set_index("quarter").sort_index(key=pd.to_datetime)
         return df
 
+    @validator("__root__", pre=True)
+    def set_statuses(cls, value: tp.Any) -> tp.Any:
+        if not isinstance(value, list):
+            return value
+        return set_statuses(value)
+
     @validator("__root__")
     def sort_earnings(cls, value: tp.List[Earning]) -> tp.List[Earning]:
         if not value:
             return value
-        return sorted(value, key=lambda earning: pd.to_datetime(earning.quarter))
+        order = _quarter_order([earning.quarter for earning in value])
+        return [value[idx] for idx in order]
+
+    @classmethod
+    def trusted(cls, **values: tp.Any) -> "Earnings":
+        if isinstance(values.get("__root__"), list):
+            values["__root__"] = set_statuses(values["__root__"])
+        earnings = super().trusted(**values)
+        earnings.__root__ = cls.sort_earnings(earnings.__root__)
+        return earnings
 
     @classmethod
     def process_quote(cls, quote: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Any]:
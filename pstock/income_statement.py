@@ -1,6 +1,7 @@
 import typing as tp
 from datetime import date
 
+import numpy as np
 import pandas as pd
 
 from pstock.base import BaseModel, BaseModelSequence
@@ -28,6 +29,8 @@ class BaseIncomeStatements(BaseModelSequence[IncomeStatement], QuoteSummary):
 
 
 class IncomeStatements(BaseIncomeStatements):
+    financials_modules: tp.ClassVar[tp.Tuple[str, ...]] = ("incomeStatementHistory",)
+
     @classmethod
     def process_financials_quote(
         cls, financials_quote: tp.Dict[str, tp.Any]
@@ -45,15 +48,24 @@ class IncomeStatements(BaseIncomeStatements):
         https://www.investopedia.com/terms/c/cagr.asp
 
         Returns:
-            float: Revenue CAGR based
+            float: Revenue CAGR based on the earliest and latest (by date) annual
+                revenues, `nan` with less than two income statements.
         """
-        latest_revenue = self.df.max()["total_revenue"]
-        earliest_revenue = self.df.min()["total_revenue"]
-        num_years = len(self.df) - 1
+        df = self.df
+        if len(df) < 2:
+            return np.nan
+        # df is sorted by date
+        latest_revenue = df["total_revenue"].iloc[-1]
+        earliest_revenue = df["total_revenue"].iloc[0]
+        num_years = len(df) - 1
         return (latest_revenue / earliest_revenue) ** (1 / num_years) - 1
 
 
 class QuarterlyIncomeStatements(BaseIncomeStatements):
+    financials_modules: tp.ClassVar[tp.Tuple[str, ...]] = (
+        "incomeStatementHistoryQuarterly",
+    )
+
     @classmethod
     def process_financials_quote(
         cls, financials_quote: tp.Dict[str, tp.Any]
@@ -0,0 +1,98 @@
+"""Hooks to time pstock's hot paths (network, html/json parsing, pydantic
+validation, dataframe generation) without patching the library.
+
+Spans are no-ops until a hook or a tracer is registered:
+
+```python
+import pstock.instrumentation as instrumentation
+
+def print_span(event: instrumentation.SpanEvent) -> None:
+    print(f"{event.name} {event.duration * 1000:.1f}ms {event.tags}")
+
+instrumentation.add_hook(print_span)
+```
+
+Any OpenTelemetry compatible tracer (exposing `start_as_current_span`) can also
+be set with `set_tracer(trace.get_tracer("pstock"))`.
+"""
+import time
+import typing as tp
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class SpanEvent(tp.NamedTuple):
+    name: str
+    duration: float
+    tags: tp.Dict[str, tp.Any]
+    error: tp.Optional[BaseException] = None
+
+
+Hook = tp.Callable[[SpanEvent], None]
+
+_hooks: tp.List[Hook] = []
+_tracer: tp.Optional[tp.Any] = None
+_symbol: ContextVar[tp.Optional[str]] = ContextVar("pstock_symbol", default=None)
+
+
+def add_hook(hook: Hook) -> None:
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def set_tracer(tracer: tp.Optional[tp.Any]) -> None:
+    global _tracer
+    _tracer = tracer
+
+
+def enabled() -> bool:
+    return bool(_hooks) or _tracer is not None
+
+
+def _attributes(tags: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Any]:
+    return {
+        f"pstock.{key}": value
+        for key, value in tags.items()
+        if isinstance(value, (str, bool, int, float))
+    }
+
+
+@contextmanager
+def span(name: str, **tags: tp.Any) -> tp.Iterator[tp.Dict[str, tp.Any]]:
+    """Time the wrapped block and report it to the registered hooks/tracer.
+
+    The yielded `tags` dict can be updated inside the block (for example with a
+    byte count once known). A `symbol` tag is inherited by all nested spans.
+    """
+    if not _hooks and _tracer is None:
+        yield tags
+        return
+
+    if tags.get("symbol") is None:
+        tags["symbol"] = _symbol.get()
+    token = _symbol.set(tags["symbol"])
+    error: tp.Optional[BaseException] = None
+    start = time.perf_counter()
+    try:
+        if _tracer is None:
+            yield tags
+        else:
+            with _tracer.start_as_current_span(name) as otel_span:
+                try:
+                    yield tags
+                finally:
+                    otel_span.set_attributes(_attributes(tags))
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _symbol.reset(token)
+        event = SpanEvent(name=name, duration=duration, tags=tags, error=error)
+        for hook in list(_hooks):
+            hook(event)
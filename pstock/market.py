@@ -0,0 +1,78 @@
+"""Trading sessions of the exchanges, from the `meta` of the chart responses.
+
+Used to know when bars can't change (the market is closed) and a cached
+series is still fresh, see `pstock.cache.BarsCache`.
+"""
+from __future__ import annotations
+
+import typing as tp
+from datetime import datetime, timedelta
+
+import pendulum
+
+from pstock.base import BaseModel
+
+# a session this long is a market that never closes (crypto currencies, ...)
+_ALWAYS_OPEN = timedelta(hours=23)
+
+
+class TradingSession(BaseModel):
+    exchange: tp.Optional[str] = None
+    timezone: str = "UTC"
+    pre_start: datetime
+    regular_start: datetime
+    regular_end: datetime
+    post_end: datetime
+
+    def bounds(self, include_prepost: bool = False) -> tp.Tuple[datetime, datetime]:
+        if include_prepost:
+            return self.pre_start, self.post_end
+        return self.regular_start, self.regular_end
+
+    @property
+    def always_open(self) -> bool:
+        return self.post_end - self.pre_start >= _ALWAYS_OPEN
+
+    def is_open(
+        self, now: tp.Optional[datetime] = None, *, include_prepost: bool = False
+    ) -> bool:
+        now = now or pendulum.now()
+        start, end = self.bounds(include_prepost)
+        return self.always_open or start <= now < end
+
+    def next_open(self, *, include_prepost: bool = False) -> datetime:
+        """Estimated start of the session following this one.
+
+        The next week day at the same local time, holidays are unknown: the
+        session reported by the next chart response tells if it really opened.
+        """
+        start, _ = self.bounds(include_prepost)
+        next_start = pendulum.instance(start).in_timezone(self.timezone).add(days=1)
+        while next_start.day_of_week in (pendulum.SATURDAY, pendulum.SUNDAY):
+            next_start = next_start.add(days=1)
+        return next_start
+
+    def is_fresh(
+        self,
+        fetched_at: datetime,
+        now: tp.Optional[datetime] = None,
+        *,
+        include_prepost: bool = False,
+        max_age: float = 60.0,
+    ) -> bool:
+        """If bars fetched at `fetched_at` can't have changed since.
+
+        Bars fetched while the market is closed are fresh until it opens again,
+        bars fetched while it is open are fresh for `max_age` seconds (and not
+        after the close, to get the final bar).
+        """
+        now = now or pendulum.now()
+        start, end = self.bounds(include_prepost)
+        age = (now - fetched_at).total_seconds()
+        if self.always_open:
+            return age < max_age
+        if start <= fetched_at < end:
+            return now < end and age < max_age
+        if fetched_at < start:
+            return now < start
+        return now < self.next_open(include_prepost=include_prepost)
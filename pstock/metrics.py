@@ -0,0 +1,197 @@
+"""Aggregated runtime metrics of pstock's fetch paths.
+
+The registry is off by default (nothing is recorded, no overhead). Once enabled
+it listens to the `pstock.instrumentation` spans and keeps:
+
+- `requests_total{host,status_code}`: http requests per host and status code
+- `throttled_total{host}`: `429` responses
+- `server_errors_total{host}`: `5xx` responses
+- `retries_total{host}`: retried requests
+- `bytes_downloaded_total{host}`: size of the downloaded bodies
+- `fetches_total{kind}` / `fetch_errors_total{kind}`: `Bars.get`, `Asset.get`, ...
+- `cache_hits_total{cache}` / `cache_misses_total{cache}`
+- `request_duration_seconds{host}`: summary of the http requests latency
+- `parse_duration_seconds{stage}`: summary of parsing, validation, `gen_df`, ...
+
+```python
+from pstock import metrics
+
+metrics.enable()
+...
+print(metrics.snapshot())
+print(metrics.to_prometheus())
+```
+"""
+import threading
+import typing as tp
+from collections import deque
+
+from pstock import instrumentation
+
+Labels = tp.Tuple[tp.Tuple[str, str], ...]
+
+_PARSE_STAGES = {"quote.parse", "json.loads", "process", "validate", "gen_df"}
+_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class _Summary:
+    def __init__(self, max_samples: int) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.samples: tp.Deque[float] = deque(maxlen=max_samples)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.samples.append(value)
+
+    def quantiles(self) -> tp.Dict[float, float]:
+        samples = sorted(self.samples)
+        if not samples:
+            return {quantile: float("nan") for quantile in _QUANTILES}
+        return {
+            quantile: samples[min(int(quantile * len(samples)), len(samples) - 1)]
+            for quantile in _QUANTILES
+        }
+
+
+class MetricsRegistry:
+    def __init__(self, max_samples: int = 1024) -> None:
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._counters: tp.Dict[str, tp.Dict[Labels, float]] = {}
+        self._summaries: tp.Dict[str, tp.Dict[Labels, _Summary]] = {}
+        self._enabled = False
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def enable(self) -> None:
+        self._enabled = True
+        instrumentation.add_hook(self._record_span)
+
+    def disable(self) -> None:
+        self._enabled = False
+        instrumentation.remove_hook(self._record_span)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+    def increment(self, name: str, value: float = 1, **labels: tp.Any) -> None:
+        if not self._enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            counter = self._counters.setdefault(name, {})
+            counter[key] = counter.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: tp.Any) -> None:
+        if not self._enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            summaries = self._summaries.setdefault(name, {})
+            if key not in summaries:
+                summaries[key] = _Summary(self.max_samples)
+            summaries[key].observe(value)
+
+    def _record_span(self, event: instrumentation.SpanEvent) -> None:
+        tags = event.tags
+        if event.name == "http.get":
+            host = tags.get("host")
+            status_code = tags.get("status_code")
+            self.increment("requests_total", host=host, status_code=status_code)
+            self.increment("bytes_downloaded_total", tags.get("bytes") or 0, host=host)
+            self.observe("request_duration_seconds", event.duration, host=host)
+            if status_code == 429:
+                self.increment("throttled_total", host=host)
+            elif status_code is not None and status_code >= 500:
+                self.increment("server_errors_total", host=host)
+        elif event.name.endswith(".get"):
+            kind = event.name[: -len(".get")]
+            self.increment("fetches_total", kind=kind)
+            if event.error is not None:
+                self.increment("fetch_errors_total", kind=kind)
+        elif event.name in _PARSE_STAGES:
+            self.observe("parse_duration_seconds", event.duration, stage=event.name)
+
+    def snapshot(self) -> tp.Dict[str, tp.List[tp.Dict[str, tp.Any]]]:
+        """Copy of all the metrics, as `{name: [{"labels": {...}, ...}, ...]}`.
+
+        Counters have a `value`, summaries a `count`, `sum` and the `quantiles`.
+        """
+        with self._lock:
+            data: tp.Dict[str, tp.List[tp.Dict[str, tp.Any]]] = {
+                name: [
+                    {"labels": dict(labels), "value": value}
+                    for labels, value in counter.items()
+                ]
+                for name, counter in self._counters.items()
+            }
+            for name, summaries in self._summaries.items():
+                data[name] = [
+                    {
+                        "labels": dict(labels),
+                        "count": summary.count,
+                        "sum": summary.sum,
+                        "quantiles": summary.quantiles(),
+                    }
+                    for labels, summary in summaries.items()
+                ]
+        return data
+
+    def to_prometheus(self, prefix: str = "pstock_") -> str:
+        """Render the metrics in the prometheus text exposition format."""
+        lines: tp.List[str] = []
+        with self._lock:
+            for name, counter in sorted(self._counters.items()):
+                lines.append(f"# TYPE {prefix}{name} counter")
+                for labels, value in counter.items():
+                    lines.append(f"{prefix}{name}{_format_labels(labels)} {value}")
+            for name, summaries in sorted(self._summaries.items()):
+                lines.append(f"# TYPE {prefix}{name} summary")
+                for labels, summary in summaries.items():
+                    for quantile, value in summary.quantiles().items():
+                        _labels_ = labels + (("quantile", str(quantile)),)
+                        lines.append(
+                            f"{prefix}{name}{_format_labels(_labels_)} {value}"
+                        )
+                    _labels_str = _format_labels(labels)
+                    lines.append(f"{prefix}{name}_sum{_labels_str} {summary.sum}")
+                    lines.append(f"{prefix}{name}_count{_labels_str} {summary.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: tp.Dict[str, tp.Any]) -> Labels:
+    return tuple((key, str(value)) for key, value in sorted(labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    values = ",".join(
+        '{}="{}"'.format(
+            key,
+            value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in labels
+    )
+    return f"{{{values}}}"
+
+
+registry = MetricsRegistry()
+
+enable = registry.enable
+disable = registry.disable
+reset = registry.reset
+increment = registry.increment
+observe = registry.observe
+snapshot = registry.snapshot
+to_prometheus = registry.to_prometheus
+
+
+def enabled() -> bool:
+    return registry.enabled
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
 import datetime
-import time
 import typing as tp
+from collections import OrderedDict
 from urllib.parse import urlencode
 
+import asyncer
 import feedparser
 import httpx
 import pandas as pd
 
 from pstock.base import BaseModel, BaseModelSequence
+from pstock.concurrency import AIMDController, current_controller, use_controller
+from pstock.instrumentation import span
+from pstock.scheduler import scheduled
 from pstock.types import ReadableResponse
-from pstock.utils.utils import httpx_client_manager
+from pstock.utils.news import (
+    RssStreamParser,
+    get_publications_from_feed,
+    get_publications_from_rss,
+    merge_publications,
+)
+from pstock.utils.utils import fetch, httpx_client_manager
 
 
 class Publication(BaseModel):
@@ -19,17 +29,33 @@ class Publication(BaseModel):
     title: str
     url: str
     summary: tp.Optional[str]
+    guid: tp.Optional[str] = None
 
 
-class News(BaseModelSequence):
-    __root__: tp.List[Publication]
+class SymbolsPublication(Publication):
+    symbols: tp.List[str]
+
+
+ParserParam = tp.Literal["feedparser", "stream"]
+
+
+def _parse_feed(
+    response: tp.Union[str, bytes, ReadableResponse],
+    parser: ParserParam = "feedparser",
+) -> tp.List[tp.Dict[str, tp.Any]]:
+    with span("process", extractor=f"{parser}.parse") as tags:
+        if parser == "stream":
+            content = (
+                response if isinstance(response, (str, bytes)) else response.read()
+            )
+            publications = get_publications_from_rss(content)
+        else:
+            publications = get_publications_from_feed(feedparser.parse(response))
+        tags["rows"] = len(publications)
+    return publications
 
-    def gen_df(self) -> pd.DataFrame:
-        df = super().gen_df()
-        if not df.empty:
-            df = df.set_index("date").sort_index()
-        return df
 
+class _NewsMixin:
     @staticmethod
     def base_uri() -> str:
         return "https://feeds.finance.yahoo.com/rss/2.0/headline"
@@ -42,43 +68,280 @@ class News(BaseModelSequence):
     def uri(cls, symbol: str) -> str:
         return f"{cls.base_uri()}?{urlencode(cls.params(symbol))}"
 
+
+class News(BaseModelSequence[Publication], _NewsMixin):
+    __root__: tp.List[Publication]
+
+    def gen_df(self) -> pd.DataFrame:
+        df = super().gen_df()
+        if not df.empty:
+            df = df.set_index("date").sort_index()
+        return df
+
     @classmethod
     def load(
         cls,
         *,
         symbol: tp.Optional[str] = None,
         response: tp.Union[None, str, bytes, ReadableResponse] = None,
+        parser: ParserParam = "feedparser",
+        validate: bool = True,
     ) -> News:
         if symbol is not None and response is None:
+            if parser == "stream":
+                raise ValueError("The stream parser needs a response to parse.")
             # feedparser can take a uri as input, and get data over http
             response = cls.uri(symbol)
-            print(response)
 
         if response is None:
             raise ValueError(
                 "Please provide either a symbol or or a readeable response."
             )
 
-        feed = feedparser.parse(response)
-        return cls.parse_obj(
-            [
-                {
-                    **entry,
-                    "date": time.mktime(entry["published_parsed"]),
-                    "url": entry["link"],
-                }
-                for entry in feed.entries
-            ]
-        )
+        publications = _parse_feed(response, parser=parser)
+        with span("validate", model=cls.__name__, validate=validate):
+            if not validate:
+                return cls.trusted(__root__=publications)
+            return cls.parse_obj(publications)
 
     @classmethod
     async def get(
         cls,
         symbol: str,
         *,
+        parser: ParserParam = "feedparser",
         client: tp.Optional[httpx.AsyncClient] = None,
+        validate: bool = True,
+    ) -> News:
+        with span("news.get", symbol=symbol.upper()):
+            async with httpx_client_manager(client=client) as _client:
+                response = await fetch(
+                    _client, cls.base_uri(), params=cls.params(symbol)
+                )
+
+            return await asyncer.asyncify(cls.load)(
+                response=response.content, parser=parser, validate=validate
+            )
+
+
+class NewsMulti(BaseModelSequence[SymbolsPublication], _NewsMixin):
+    __root__: tp.List[SymbolsPublication]
+
+    def gen_df(self) -> pd.DataFrame:
+        df = super().gen_df()
+        if not df.empty:
+            df = df.set_index("date").sort_index()
+        return df
+
+    @classmethod
+    def _from_publications(
+        cls,
+        publications: tp.Mapping[str, tp.List[tp.Dict[str, tp.Any]]],
+        validate: bool = True,
+    ) -> NewsMulti:
+        merged = merge_publications(publications)
+        with span("validate", model=cls.__name__, validate=validate):
+            if not validate:
+                return cls.trusted(__root__=merged)
+            return cls.parse_obj(merged)
+
+    @classmethod
+    def load(
+        cls,
+        *,
+        responses: tp.Mapping[str, tp.Union[str, bytes, ReadableResponse]],
+        parser: ParserParam = "feedparser",
+        validate: bool = True,
+    ) -> NewsMulti:
+        return cls._from_publications(
+            {
+                symbol: _parse_feed(response, parser=parser)
+                for symbol, response in responses.items()
+            },
+            validate=validate,
+        )
+
+    @classmethod
+    async def get(
+        cls,
+        symbols: tp.List[str],
+        *,
+        parser: ParserParam = "feedparser",
+        client: tp.Optional[httpx.AsyncClient] = None,
+        validate: bool = True,
+        concurrency: tp.Optional[AIMDController] = None,
+    ) -> NewsMulti:
+        async def _get_publications(
+            symbol: str, client: httpx.AsyncClient
+        ) -> tp.List[tp.Dict[str, tp.Any]]:
+            with span("news.get", symbol=symbol.upper()):
+                response = await fetch(
+                    client, cls.base_uri(), params=cls.params(symbol)
+                )
+                return await asyncer.asyncify(_parse_feed)(response.content, parser)
+
+        with use_controller(concurrency):
+            async with httpx_client_manager(client=client) as _client:
+                async with asyncer.create_task_group() as tg:
+                    soon_values = [
+                        tg.soonify(_get_publications)(symbol, _client)
+                        for symbol in symbols
+                    ]
+
+        return cls._from_publications(
+            {symbol.upper(): soon.value for symbol, soon in zip(symbols, soon_values)},
+            validate=validate,
+        )
+
+
+class _FeedState:
+    def __init__(self) -> None:
+        self.etag: tp.Optional[str] = None
+        self.last_modified: tp.Optional[str] = None
+        self.seen: tp.OrderedDict[str, None] = OrderedDict()
+
+
+class NewsPoller(_NewsMixin):
+    """Poll the news feed of symbols and only return publications not seen yet.
+
+    Requests are conditional (`If-None-Match`/`If-Modified-Since`), so an
+    unchanged feed costs a `304` response with no body. The seen publications
+    (by guid or url) are tracked per symbol, keeping at most `max_seen` of the
+    most recent ones.
+
+    Example:
+        ```python
+        poller = NewsPoller()
+        async with httpx.AsyncClient() as client:
+            while True:
+                news = await poller.poll_many(["TSLA", "AAPL"], client=client)
+                print(news.df)
+                await asyncio.sleep(60)
+        ```
+    """
+
+    def __init__(
+        self,
+        *,
+        max_seen: int = 1000,
+        parser: ParserParam = "stream",
+        validate: bool = True,
+    ) -> None:
+        self.max_seen = max_seen
+        self.parser = parser
+        self.validate = validate
+        self._states: tp.Dict[str, _FeedState] = {}
+
+    def reset(self, symbol: tp.Optional[str] = None) -> None:
+        if symbol is None:
+            self._states.clear()
+        else:
+            self._states.pop(symbol.upper(), None)
+
+    def _state(self, symbol: str) -> _FeedState:
+        if symbol not in self._states:
+            self._states[symbol] = _FeedState()
+        return self._states[symbol]
+
+    def _conditional_headers(self, state: _FeedState) -> tp.Dict[str, str]:
+        headers = {}
+        if state.etag is not None:
+            headers["if-none-match"] = state.etag
+        if state.last_modified is not None:
+            headers["if-modified-since"] = state.last_modified
+        return headers
+
+    def _unseen(
+        self, state: _FeedState, publications: tp.List[tp.Dict[str, tp.Any]]
+    ) -> tp.List[tp.Dict[str, tp.Any]]:
+        new = []
+        for publication in publications:
+            key = publication.get("guid") or publication["url"]
+            if key in state.seen:
+                state.seen.move_to_end(key)
+                continue
+            state.seen[key] = None
+            new.append(publication)
+        while len(state.seen) > self.max_seen:
+            state.seen.popitem(last=False)
+        return new
+
+    async def _poll(
+        self, symbol: str, client: httpx.AsyncClient
+    ) -> tp.List[tp.Dict[str, tp.Any]]:
+        controller = current_controller()
+        if controller is None:
+            return await self._poll_feed(symbol, client)
+        async with controller.slot(httpx.URL(self.base_uri()).host) as slot:
+            try:
+                publications = await self._poll_feed(symbol, client)
+            except httpx.HTTPStatusError as error:
+                slot.report(error.response.status_code)
+                raise
+            except httpx.TransportError:
+                slot.report(None)
+                raise
+            slot.report(200)
+        return publications
+
+    async def _poll_feed(
+        self, symbol: str, client: httpx.AsyncClient
+    ) -> tp.List[tp.Dict[str, tp.Any]]:
+        state = self._state(symbol)
+        async with scheduled():
+            with span(
+                "http.get", host=httpx.URL(self.base_uri()).host, symbol=symbol
+            ) as tags:
+                async with client.stream(
+                    "GET",
+                    self.base_uri(),
+                    params=self.params(symbol),
+                    headers=self._conditional_headers(state),
+                ) as response:
+                    tags["status_code"] = response.status_code
+                    if response.status_code == httpx.codes.NOT_MODIFIED:
+                        tags["bytes"] = 0
+                        return []
+                    response.raise_for_status()
+                    if self.parser == "stream":
+                        stream_parser = RssStreamParser()
+                        publications = []
+                        async for chunk in response.aiter_bytes():
+                            publications.extend(stream_parser.feed(chunk))
+                        publications.extend(stream_parser.close())
+                    else:
+                        content = await response.aread()
+                        publications = await asyncer.asyncify(_parse_feed)(content)
+                    tags["bytes"] = response.num_bytes_downloaded
+
+        state.etag = response.headers.get("etag", state.etag)
+        state.last_modified = response.headers.get("last-modified", state.last_modified)
+        return self._unseen(state, publications)
+
+    async def poll(
+        self, symbol: str, *, client: tp.Optional[httpx.AsyncClient] = None
     ) -> News:
         async with httpx_client_manager(client=client) as _client:
-            response = await _client.get(cls.base_uri(), params=cls.params(symbol))
+            publications = await self._poll(symbol.upper(), _client)
+        if not self.validate:
+            return News.trusted(__root__=publications)
+        return News.parse_obj(publications)
 
-        return cls.load(response=response)
+    async def poll_many(
+        self,
+        symbols: tp.List[str],
+        *,
+        client: tp.Optional[httpx.AsyncClient] = None,
+        concurrency: tp.Optional[AIMDController] = None,
+    ) -> NewsMulti:
+        symbols = [symbol.upper() for symbol in symbols]
+        with use_controller(concurrency):
+            async with httpx_client_manager(client=client) as _client:
+                async with asyncer.create_task_group() as tg:
+                    soon_values = [
+                        tg.soonify(self._poll)(symbol, _client) for symbol in symbols
+                    ]
+        return NewsMulti._from_publications(
+            {symbol: soon.value for symbol, soon in zip(symbols, soon_values)},
+            validate=self.validate,
+        )
@@ -0,0 +1,107 @@
+"""Partial results of multi-symbol fetches.
+
+By default one failing symbol (a delisted ticker, a quote page without price)
+fails a whole `BarsMulti.get` / `Assets.get` call. With `partial=True` the
+successful symbols are returned, and the failed ones are reported in `.errors`
+(a `SymbolError` per symbol). `timeout` bounds every symbol, `deadline` the
+whole call: the symbols still running when it expires are cancelled and
+reported as such.
+
+```python
+bars = await BarsMulti.get(symbols, period="1y", partial=True, timeout=10, deadline=60)
+print(bars.df)
+print(errors_df(bars.errors))
+```
+"""
+import typing as tp
+
+import anyio
+import pandas as pd
+
+ReasonParam = tp.Literal["error", "timeout", "deadline"]
+
+K = tp.TypeVar("K", bound=tp.Hashable)
+V = tp.TypeVar("V")
+
+
+class SymbolError(tp.NamedTuple):
+    symbol: str
+    # "error" (raised), "timeout" (per symbol) or "deadline" (of the whole call)
+    reason: ReasonParam
+    error: tp.Optional[BaseException]
+    # seconds spent on the symbol
+    elapsed: float
+
+
+def check_params(
+    partial: bool, timeout: tp.Optional[float], deadline: tp.Optional[float]
+) -> None:
+    if not partial and (timeout is not None or deadline is not None):
+        raise ValueError("timeout and deadline are only supported with partial=True")
+
+
+async def gather(
+    get: tp.Callable[[K], tp.Awaitable[V]],
+    keys: tp.Iterable[K],
+    *,
+    timeout: tp.Optional[float] = None,
+    deadline: tp.Optional[float] = None,
+) -> tp.Tuple[tp.Dict[K, V], tp.Dict[K, SymbolError]]:
+    """Run `get` concurrently for all the `keys`, returns the results and the
+    errors of each key (never raises for a single key)."""
+    keys = list(dict.fromkeys(keys))
+    results: tp.Dict[K, V] = {}
+    errors: tp.Dict[K, SymbolError] = {}
+    started_at = anyio.current_time()
+
+    async def _get(key: K) -> None:
+        key_started_at = anyio.current_time()
+        try:
+            with anyio.fail_after(timeout):
+                results[key] = await get(key)
+        except TimeoutError as error:
+            elapsed = anyio.current_time() - key_started_at
+            errors[key] = SymbolError(str(key), "timeout", error, elapsed)
+        except Exception as error:
+            elapsed = anyio.current_time() - key_started_at
+            errors[key] = SymbolError(str(key), "error", error, elapsed)
+        except anyio.ExceptionGroup as group:
+            # several requests of the key failed (quote and financials pages)
+            failures = [
+                error for error in group.exceptions if isinstance(error, Exception)
+            ]
+            if not failures:
+                raise
+            elapsed = anyio.current_time() - key_started_at
+            errors[key] = SymbolError(str(key), "error", failures[0], elapsed)
+
+    with anyio.move_on_after(deadline):
+        async with anyio.create_task_group() as tg:
+            for key in keys:
+                tg.start_soon(_get, key)
+
+    elapsed = anyio.current_time() - started_at
+    for key in keys:
+        if key not in results and key not in errors:
+            errors[key] = SymbolError(str(key), "deadline", None, elapsed)
+    return results, errors
+
+
+def errors_df(errors: tp.Mapping[str, SymbolError]) -> pd.DataFrame:
+    """Per-symbol report of `errors`: reason, type and message of the error and
+    elapsed seconds."""
+    return pd.DataFrame(
+        {
+            "reason": [error.reason for error in errors.values()],
+            "error_type": [
+                type(error.error).__name__ if error.error is not None else None
+                for error in errors.values()
+            ],
+            "message": [
+                str(error.error) if error.error is not None else None
+                for error in errors.values()
+            ],
+            "elapsed": [error.elapsed for error in errors.values()],
+        },
+        index=pd.Index(list(errors), name="symbol", dtype=object),
+    )
@@ -1,19 +1,119 @@
+import hashlib
 import json
 import re
 import typing as tp
+from collections import OrderedDict
 
 import asyncer
 import httpx
 from bs4 import BeautifulSoup
 
+from pstock import metrics
 from pstock.base import BaseModel
+from pstock.instrumentation import span
 from pstock.types import ReadableResponse
-from pstock.utils.utils import httpx_client_manager, rdm_user_agent_value
+from pstock.utils.utils import fetch, httpx_client_manager, rdm_user_agent_value
 
 T = tp.TypeVar("T", bound="QuoteSummary")
 
 
+def fingerprint(content: tp.Union[str, bytes]) -> bytes:
+    if isinstance(content, str):
+        content = content.encode()
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+class QuoteMemo:
+    """Bounded (LRU) memo of the parsed quote pages and of the models built from
+    them, keyed by the fingerprint of their content.
+
+    Pages that didn't change since the last call aren't parsed again, and the
+    models (`Earnings`, `Trends`, ...) of the parts of the pages that didn't
+    change aren't extracted and validated again (outside market hours, or for
+    the fundamentals that change once a quarter).
+
+    Memoization is opt-in (`memo=` of `.load`, `.get` and `Assets.get`): the
+    calls sharing a memo get the same model instances, which shouldn't be
+    modified.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._entries: tp.OrderedDict[tp.Hashable, tp.Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tp.Hashable, *, kind: str) -> tp.Any:
+        value = self._entries.get(key)
+        if value is None:
+            metrics.increment("cache_misses_total", cache=kind)
+            return None
+        self._entries.move_to_end(key)
+        metrics.increment("cache_hits_total", cache=kind)
+        return value
+
+    def put(self, key: tp.Hashable, value: tp.Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _parse_page(
+    response: tp.Union[ReadableResponse, str, bytes], memo: tp.Optional[QuoteMemo]
+) -> tp.Dict[str, tp.Any]:
+    if memo is None:
+        return QuoteSummary.parse_quote(response)
+    content = response if isinstance(response, (str, bytes)) else response.read()
+    key = ("page", fingerprint(content))
+    quote = memo.get(key, kind="quote_pages")
+    if quote is None:
+        quote = QuoteSummary.parse_quote(content)
+        memo.put(key, quote)
+    return quote
+
+
+class QuoteStore(tp.NamedTuple):
+    """Decoded `QuoteSummaryStore` of the quote and financials pages of a symbol.
+
+    Each page is parsed once, all the models (and their components) are then
+    extracted from the same store.
+    """
+
+    quote: tp.Dict[str, tp.Any]
+    financials_quote: tp.Dict[str, tp.Any]
+
+    @classmethod
+    def parse(
+        cls,
+        *,
+        response: tp.Union[ReadableResponse, str, bytes, None] = None,
+        financials_response: tp.Union[ReadableResponse, str, bytes, None] = None,
+        memo: tp.Optional[QuoteMemo] = None,
+    ) -> "QuoteStore":
+        """Parse the pages, or reuse the stores of identical pages in `memo`."""
+        return cls(
+            quote={} if response is None else _parse_page(response, memo),
+            financials_quote=(
+                {}
+                if financials_response is None
+                else _parse_page(financials_response, memo)
+            ),
+        )
+
+
 class QuoteSummary(BaseModel):
+    # nested models extracted from the same store as their parent: field -> model
+    components: tp.ClassVar[tp.Dict[str, tp.Type["QuoteSummary"]]] = {}
+    # modules of the stores read by `process_quote`/`process_financials_quote`,
+    # the models of the components are memoized on their content
+    modules: tp.ClassVar[tp.Tuple[str, ...]] = ()
+    financials_modules: tp.ClassVar[tp.Tuple[str, ...]] = ()
+
     @staticmethod
     def uri(symbol: str) -> str:
         return f"https://finance.yahoo.com/quote/{symbol.upper()}"
@@ -32,17 +132,19 @@ class QuoteSummary(BaseModel):
 
         content = response if isinstance(response, (str, bytes)) else response.read()
 
-        soup = BeautifulSoup(content, "html.parser")
+        with span("quote.parse", bytes=len(content)):
+            soup = BeautifulSoup(content, "html.parser")
 
-        script = soup.find("script", text=re.compile(r"root.App.main"))
-        if script is None:
-            return {}
-        match = re.search(r"root.App.main\s+=\s+(\{.*\})", script.text)
+            script = soup.find("script", text=re.compile(r"root.App.main"))
+            if script is None:
+                return {}
+            match = re.search(r"root.App.main\s+=\s+(\{.*\})", script.text)
 
-        if match is None:
-            return {}
+            if match is None:
+                return {}
 
-        data: tp.Dict[str, tp.Any] = json.loads(match.group(1))
+            with span("json.loads", bytes=len(match.group(1))):
+                data: tp.Dict[str, tp.Any] = json.loads(match.group(1))
         return (
             data.get("context", {})
             .get("dispatcher", {})
@@ -63,46 +165,154 @@ class QuoteSummary(BaseModel):
         return {}
 
     @classmethod
-    def load(
+    def fingerprint(cls, store: QuoteStore) -> tp.Optional[bytes]:
+        """Fingerprint of the parts of `store` the model is extracted from, None
+        if it's not known (the model isn't memoized)."""
+        if not cls.modules and not cls.financials_modules:
+            return None
+        content = json.dumps(
+            [
+                [store.quote.get(module) for module in cls.modules],
+                [
+                    store.financials_quote.get(module)
+                    for module in cls.financials_modules
+                ],
+            ],
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return fingerprint(content)
+
+    @classmethod
+    def _build(
+        cls: tp.Type[T],
+        store: QuoteStore,
+        memo: tp.Optional[QuoteMemo],
+        validate: bool,
+        required: bool = True,
+    ) -> tp.Optional[T]:
+        # the model of `store`, from the memo if its part of the store is known
+        digest = None if memo is None else cls.fingerprint(store)
+        # trusted models are never returned to callers asking for validation
+        key = (cls.__qualname__, validate, digest)
+        if memo is not None and digest is not None:
+            model = memo.get(key, kind="quote_models")
+            if model is not None:
+                return model
+        data = cls.extract(store=store, memo=memo, validate=validate)
+        if not data and not required:
+            return None
+        with span("validate", model=cls.__name__, validate=validate):
+            model = cls.trusted(**data) if not validate else cls(**data)
+        if memo is not None and digest is not None:
+            memo.put(key, model)
+        return model
+
+    @classmethod
+    def extract(
         cls: tp.Type[T],
         *,
         response: tp.Union[ReadableResponse, str, bytes, None] = None,
         financials_response: tp.Union[ReadableResponse, str, bytes, None] = None,
-    ) -> T:
+        store: tp.Optional[QuoteStore] = None,
+        memo: tp.Optional[QuoteMemo] = None,
+        validate: bool = True,
+    ) -> tp.Dict[str, tp.Any]:
+        """Extract the (not yet validated) model data from the pages `store`.
 
-        data = {}
-        _quote = None
-        _financials_quote = None
+        The store is parsed from the responses if not given. With a `memo`, the
+        components are (validated or trusted) models, reused from the memo if
+        their part of the pages didn't change.
+        """
+        if store is None:
+            store = QuoteStore.parse(
+                response=response, financials_response=financials_response, memo=memo
+            )
+        data: tp.Dict[str, tp.Any] = {}
 
-        if response is not None:
-            _quote = cls.parse_quote(response)
-            if _quote:
-                data.update(cls.process_quote(_quote))
+        if store.quote:
+            with span("process", extractor=f"{cls.__name__}.process_quote"):
+                data.update(cls.process_quote(store.quote))
 
-        if financials_response is not None:
-            _financials_quote = cls.parse_quote(financials_response)
-            if _financials_quote:
-                data.update(cls.process_financials_quote(_financials_quote))
+        if store.financials_quote:
+            with span(
+                "process",
+                extractor=f"{cls.__name__}.process_financials_quote",
+            ):
+                data.update(cls.process_financials_quote(store.financials_quote))
 
-        return cls(**data)
+        for name, component in cls.components.items():
+            if memo is not None:
+                model = component._build(store, memo, validate, required=False)
+                if model is not None:
+                    data[name] = model
+                continue
+            component_data = component.extract(store=store)
+            if component_data:
+                data[name] = component_data
+        return data
 
     @classmethod
-    async def get(
+    def load(
+        cls: tp.Type[T],
+        *,
+        response: tp.Union[ReadableResponse, str, bytes, None] = None,
+        financials_response: tp.Union[ReadableResponse, str, bytes, None] = None,
+        store: tp.Optional[QuoteStore] = None,
+        validate: bool = True,
+        memo: tp.Optional[QuoteMemo] = None,
+    ) -> T:
+
+        with span("quote_summary.load", model=cls.__name__):
+            if store is None:
+                store = QuoteStore.parse(
+                    response=response,
+                    financials_response=financials_response,
+                    memo=memo,
+                )
+            model = cls._build(store, memo, validate)
+            assert model is not None
+            return model
+
+    @classmethod
+    async def get_responses(
         cls: tp.Type[T],
         symbol: str,
         *,
         client: tp.Optional[httpx.AsyncClient] = None,
-    ) -> T:
+    ) -> tp.Tuple[httpx.Response, httpx.Response]:
+        """Fetch the quote and financials pages of `symbol`."""
         async with httpx_client_manager(client=client) as _client:
             async with asyncer.create_task_group() as tg:
-                soon_quote = tg.soonify(_client.get)(
-                    cls.uri(symbol), headers={"user-agent": rdm_user_agent_value()}
+                soon_quote = tg.soonify(fetch)(
+                    _client,
+                    cls.uri(symbol),
+                    headers={"user-agent": rdm_user_agent_value()},
                 )
-                soon_financials = tg.soonify(_client.get)(
+                soon_financials = tg.soonify(fetch)(
+                    _client,
                     cls.financials_uri(symbol),
                     headers={"user-agent": rdm_user_agent_value()},
                 )
+        return soon_quote.value, soon_financials.value
 
-        return cls.load(
-            response=soon_quote.value, financials_response=soon_financials.value
-        )
+    @classmethod
+    async def get(
+        cls: tp.Type[T],
+        symbol: str,
+        *,
+        client: tp.Optional[httpx.AsyncClient] = None,
+        validate: bool = True,
+        memo: tp.Optional[QuoteMemo] = None,
+    ) -> T:
+        with span("quote_summary.get", symbol=symbol.upper()):
+            response, financials_response = await cls.get_responses(
+                symbol, client=client
+            )
+            return cls.load(
+                response=response,
+                financials_response=financials_response,
+                validate=validate,
+                memo=memo,
+            )
@@ -0,0 +1,225 @@
+"""Priority-aware scheduling of the requests sharing one connection pool.
+
+Interactive calls (a single `Asset.get` for a screen) and background work
+(`BarsMulti.get` over thousands of symbols) can share the same client: under a
+`RequestScheduler`, every request waits for one of `max_in_flight` slots, and
+freed slots go to the highest priority waiting first. Inside a priority, the
+slots are shared round-robin between the flows (every `priority` block is its
+own flow), so that one bulk job can't starve another one.
+
+```python
+scheduler = RequestScheduler(max_in_flight=10, reserved=2)
+
+with use_scheduler(scheduler):
+    async with anyio.create_task_group() as tg:
+        with priority("low"):
+            tg.start_soon(backfill)
+    with priority("high"):
+        asset = await Asset.get("TSLA", client=client)
+```
+
+`reserved` slots are only used by high priority requests: interactive calls
+never wait for a full pool of bulk requests to finish.
+"""
+from __future__ import annotations
+
+import time
+import typing as tp
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+import anyio
+
+from pstock import metrics
+
+PriorityParam = tp.Literal["high", "normal", "low"]
+PRIORITIES: tp.Tuple[PriorityParam, ...] = ("high", "normal", "low")
+
+
+class _Waiter:
+    def __init__(self) -> None:
+        self.event = anyio.Event()
+        self.granted = False
+
+
+class RequestScheduler:
+    def __init__(self, *, max_in_flight: int = 10, reserved: int = 1) -> None:
+        """
+        Args:
+            max_in_flight: Maximum number of requests sent at the same time, the
+                size of the connection pool of the client.
+            reserved: Slots that only high priority requests can use.
+        """
+        if not 0 <= reserved < max_in_flight:
+            raise ValueError(
+                "Expected 0 <= reserved < max_in_flight, got "
+                f"{reserved}, {max_in_flight}"
+            )
+        self.max_in_flight = max_in_flight
+        self.reserved = reserved
+        self.in_flight = 0
+        # one queue of waiters per flow, per priority
+        self._queues: tp.List[tp.OrderedDict[tp.Hashable, tp.Deque[_Waiter]]] = [
+            OrderedDict() for _ in PRIORITIES
+        ]
+
+    def waiting(self, priority: tp.Optional[PriorityParam] = None) -> int:
+        levels = range(len(PRIORITIES)) if priority is None else [_level(priority)]
+        return sum(
+            len(waiters) for level in levels for waiters in self._queues[level].values()
+        )
+
+    def _capacity(self, level: int) -> int:
+        return self.max_in_flight if level == 0 else self.max_in_flight - self.reserved
+
+    def _next(self, level: int) -> _Waiter:
+        queues = self._queues[level]
+        flow, waiters = next(iter(queues.items()))
+        waiter = waiters.popleft()
+        # the flow goes back at the end of the round
+        del queues[flow]
+        if waiters:
+            queues[flow] = waiters
+        return waiter
+
+    def _dispatch(self) -> None:
+        for level, queues in enumerate(self._queues):
+            while queues and self.in_flight < self._capacity(level):
+                waiter = self._next(level)
+                waiter.granted = True
+                self.in_flight += 1
+                waiter.event.set()
+            if queues:
+                # lower priorities wait for these ones
+                return
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _remove(self, level: int, flow: tp.Hashable, waiter: _Waiter) -> None:
+        waiters = self._queues[level].get(flow)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self._queues[level][flow]
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: tp.Optional[PriorityParam] = None,
+        flow: tp.Optional[tp.Hashable] = None,
+    ) -> tp.AsyncIterator[None]:
+        """Wait for a free slot, by default with the priority and flow of the
+        current context."""
+        priority = priority or current_priority()
+        flow = flow if flow is not None else _flow.get()
+        level = _level(priority)
+        started_at = time.monotonic()
+
+        if self.in_flight < self._capacity(level) and not any(
+            self._queues[: level + 1]
+        ):
+            self.in_flight += 1
+        else:
+            waiter = _Waiter()
+            self._queues[level].setdefault(flow, deque()).append(waiter)
+            try:
+                await waiter.event.wait()
+            except BaseException:
+                if waiter.granted:
+                    self._release()
+                else:
+                    self._remove(level, flow, waiter)
+                raise
+        metrics.observe(
+            "scheduler_wait_seconds", time.monotonic() - started_at, priority=priority
+        )
+
+        try:
+            yield
+        finally:
+            self._release()
+
+
+def _level(priority: PriorityParam) -> int:
+    try:
+        return PRIORITIES.index(priority)
+    except ValueError:
+        raise ValueError(
+            f"Unknown priority {priority!r}, expected one of {PRIORITIES}"
+        ) from None
+
+
+_scheduler: ContextVar[tp.Optional[RequestScheduler]] = ContextVar(
+    "pstock_scheduler", default=None
+)
+_priority: ContextVar[PriorityParam] = ContextVar("pstock_priority", default="normal")
+_flow: ContextVar[tp.Hashable] = ContextVar("pstock_flow", default=None)
+_default_scheduler: tp.Optional[RequestScheduler] = None
+
+
+def current_scheduler() -> tp.Optional[RequestScheduler]:
+    scheduler = _scheduler.get()
+    return scheduler if scheduler is not None else _default_scheduler
+
+
+def current_priority() -> PriorityParam:
+    return _priority.get()
+
+
+def set_default_scheduler(scheduler: tp.Optional[RequestScheduler]) -> None:
+    """Schedule all the requests of the process with `scheduler`, unless a
+    context uses another one.
+
+    A `RequestScheduler` belongs to a single event loop (its waiters are events
+    of that loop, without locks): the default one must only be used by one loop,
+    for example the background loop of `pstock.sync`. Programs running several
+    loops (in several threads) should give each one its own scheduler with
+    `use_scheduler`.
+    """
+    global _default_scheduler
+    _default_scheduler = scheduler
+
+
+@contextmanager
+def use_scheduler(
+    scheduler: tp.Optional[RequestScheduler],
+) -> tp.Iterator[tp.Optional[RequestScheduler]]:
+    """Schedule the requests made in this context with `scheduler`."""
+    if scheduler is None:
+        yield current_scheduler()
+        return
+    token = _scheduler.set(scheduler)
+    try:
+        yield scheduler
+    finally:
+        _scheduler.reset(token)
+
+
+@contextmanager
+def priority(
+    level: PriorityParam, *, flow: tp.Optional[tp.Hashable] = None
+) -> tp.Iterator[None]:
+    """Run the requests made in this context with the `level` priority, as one
+    flow (a new one unless `flow` is given)."""
+    _level(level)
+    priority_token = _priority.set(level)
+    flow_token = _flow.set(flow if flow is not None else object())
+    try:
+        yield
+    finally:
+        _flow.reset(flow_token)
+        _priority.reset(priority_token)
+
+
+@asynccontextmanager
+async def scheduled() -> tp.AsyncIterator[None]:
+    """Slot of the current scheduler, if any."""
+    scheduler = current_scheduler()
+    if scheduler is None:
+        yield
+        return
+    async with scheduler.slot():
+        yield
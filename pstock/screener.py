@@ -0,0 +1,117 @@
+"""Fundamentals screener over a whole `Assets` collection.
+
+The metrics of all the assets are computed at once from the stacked (long)
+income statement tables of `Assets`, screening is then a vectorized filter on
+a single dataframe:
+
+```python
+from pstock.screener import Screener
+
+screener = Screener(assets)
+screener.metrics  # one row per symbol
+screener.filter(revenue_cagr=(0.1, None), gross_margin=(0.3, None))
+screener.filter("ebit_margin > 0 and sector == 'Technology'")
+```
+"""
+from __future__ import annotations
+
+import typing as tp
+
+import numpy as np
+import pandas as pd
+
+from pstock.asset import Assets
+
+Bounds = tp.Tuple[tp.Optional[float], tp.Optional[float]]
+
+
+def _statements_metrics(df: pd.DataFrame, prefix: str = "") -> pd.DataFrame:
+    # `df` is sorted by (symbol, date), see `pstock.asset.build_tables`, the
+    # columns of an empty table are `object`
+    df = df.astype("float64")
+    groups = df.groupby(level="symbol", sort=False)
+    position = groups.cumcount().to_numpy()
+    from_end = groups.cumcount(ascending=False).to_numpy()
+    first = df[position == 0].droplevel("date")
+    latest = df[from_end == 0].droplevel("date")
+    previous = df[from_end == 1].droplevel("date")
+    count = groups.size()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        metrics = pd.DataFrame(
+            {
+                "revenue_growth": latest["total_revenue"] / previous["total_revenue"]
+                - 1,
+                "gross_margin": latest["gross_profit"] / latest["total_revenue"],
+                "ebit_margin": latest["ebit"] / latest["total_revenue"],
+            }
+        )
+        if not prefix:
+            num_years = (count - 1).where(count > 1)
+            metrics["revenue_cagr"] = (
+                latest["total_revenue"] / first["total_revenue"]
+            ) ** (1 / num_years) - 1
+        else:
+            # trailing twelve months of the last four quarters
+            ttm = (
+                df[from_end < 4]
+                .groupby(level="symbol", sort=False)
+                .sum(min_count=4, numeric_only=True)
+            )
+            metrics["ttm_revenue"] = ttm["total_revenue"]
+            metrics["ttm_ebit_margin"] = ttm["ebit"] / ttm["total_revenue"]
+    return metrics.add_prefix(prefix)
+
+
+def compute_metrics(assets: Assets) -> pd.DataFrame:
+    """Growth and margin metrics of every asset, indexed by symbol.
+
+    From the annual income statements: `revenue_growth` (latest year over
+    previous one), `gross_margin`, `ebit_margin` (latest year) and
+    `revenue_cagr` (earliest to latest year). The same metrics prefixed by
+    `quarterly_` from the quarterly income statements (latest quarter over the
+    previous one), with `quarterly_ttm_revenue` and `quarterly_ttm_ebit_margin`.
+
+    All the columns of the assets table are kept, even when missing for every
+    asset (unlike `Assets.df`), so that filters on them don't depend on the
+    universe.
+    """
+    frame = assets.tables["assets"]
+    metrics = [
+        _statements_metrics(assets.income_statements_df),
+        _statements_metrics(assets.quarterly_income_statements_df, "quarterly_"),
+    ]
+    return frame.join(metrics, how="left")
+
+
+class Screener:
+    def __init__(self, assets: Assets) -> None:
+        self.assets = assets
+        self._metrics: tp.Optional[pd.DataFrame] = None
+
+    @property
+    def metrics(self) -> pd.DataFrame:
+        if self._metrics is None:
+            self._metrics = compute_metrics(self.assets)
+        return self._metrics
+
+    def filter(self, expr: tp.Optional[str] = None, **bounds: Bounds) -> pd.DataFrame:
+        """Rows of `metrics` matching `expr` (see `DataFrame.query`) and `bounds`.
+
+        `bounds` are inclusive `(min, max)` per column, `None` for no bound. Rows
+        with a missing (NaN) bounded metric are dropped.
+        """
+        df = self.metrics
+        mask = np.ones(len(df), dtype=bool)
+        for column, (low, high) in bounds.items():
+            values = df[column].to_numpy(dtype="float64")
+            with np.errstate(invalid="ignore"):
+                mask &= ~np.isnan(values)
+                if low is not None:
+                    mask &= values >= low
+                if high is not None:
+                    mask &= values <= high
+        df = df[mask]
+        if expr is not None:
+            df = df.query(expr)
+        return df
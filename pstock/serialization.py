@@ -0,0 +1,147 @@
+"""Compact, versioned binary format of pstock's models (`to_bytes`/`from_bytes`).
+
+```
+b"PSTK" | version (uint16) | header length (uint32) | header (json) | buffers
+```
+
+The json header holds the kind of model, its metadata and the `(name, dtype,
+offset, count)` of every buffer. Buffers are raw little-endian numpy arrays
+aligned on 8 bytes, read with `numpy.frombuffer`: they are not copied and can
+come from a memory-mapped file (`mmap.mmap`).
+"""
+import json
+import mmap
+import struct
+import typing as tp
+from datetime import date, datetime
+
+import numpy as np
+from pydantic.fields import SHAPE_LIST, ModelField
+
+from pstock.base import BaseModel, BaseModelSequence
+
+MAGIC = b"PSTK"
+VERSION = 1
+
+_PREFIX = struct.Struct("<4sHI")
+_ALIGNMENT = 8
+
+Buffer = tp.Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+def _padding(size: int) -> int:
+    return -size % _ALIGNMENT
+
+
+def _json_default(value: tp.Any) -> tp.Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_data(value: tp.Any) -> tp.Any:
+    """Plain (json serializable with dates) data of a model, without validation
+    or copies of the nested models like `.dict()`."""
+    if isinstance(value, BaseModelSequence):
+        return [to_data(item) for item in value.__root__]
+    if isinstance(value, BaseModel):
+        return {key: to_data(item) for key, item in value.__dict__.items()}
+    return value
+
+
+def _restore_value(field: ModelField, value: tp.Any) -> tp.Any:
+    if value is None:
+        return value
+    if field.shape == SHAPE_LIST and isinstance(value, list):
+        return [_restore_item(field.type_, item) for item in value]
+    return _restore_item(field.type_, value)
+
+
+def _restore_item(type_: tp.Any, value: tp.Any) -> tp.Any:
+    if isinstance(value, str) and type_ is datetime:
+        return datetime.fromisoformat(value)
+    if isinstance(value, str) and type_ is date:
+        return date.fromisoformat(value)
+    if isinstance(type_, type) and issubclass(type_, BaseModel):
+        if "__root__" in type_.__fields__:
+            return _restore_value(type_.__fields__["__root__"], value)
+        return restore(type_, value)
+    return value
+
+
+def restore(
+    model: tp.Type[BaseModel], values: tp.Dict[str, tp.Any]
+) -> tp.Dict[str, tp.Any]:
+    """Parse back the (iso) dates of the json decoded `to_data` of a `model`."""
+    return {
+        key: _restore_value(model.__fields__[key], value)
+        if key in model.__fields__
+        else value
+        for key, value in values.items()
+    }
+
+
+def dumps(
+    kind: str,
+    meta: tp.Dict[str, tp.Any],
+    arrays: tp.Optional[tp.Dict[str, np.ndarray]] = None,
+) -> bytes:
+    arrays = {
+        name: np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+        for name, array in (arrays or {}).items()
+    }
+    buffers = []
+    offset = 0
+    for name, array in arrays.items():
+        buffers.append([name, array.dtype.str, offset, len(array)])
+        offset += array.nbytes + _padding(array.nbytes)
+
+    header = json.dumps(
+        {"kind": kind, "meta": meta, "buffers": buffers},
+        separators=(",", ":"),
+        default=_json_default,
+    ).encode()
+    start = _PREFIX.size + len(header)
+    chunks = [
+        _PREFIX.pack(MAGIC, VERSION, len(header)),
+        header,
+        b"\0" * _padding(start),
+    ]
+    for array in arrays.values():
+        chunks.append(array.tobytes())
+        chunks.append(b"\0" * _padding(array.nbytes))
+    return b"".join(chunks)
+
+
+def loads(
+    data: Buffer, kind: str
+) -> tp.Tuple[tp.Dict[str, tp.Any], tp.Dict[str, np.ndarray]]:
+    """Read the metadata and the (not copied) buffers of a `kind` model."""
+    view = memoryview(data)
+    if len(view) < _PREFIX.size:
+        raise ValueError("Not a pstock binary: too short.")
+    magic, version, header_length = _PREFIX.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("Not a pstock binary: bad magic number.")
+    if version > VERSION:
+        raise ValueError(
+            f"Unsupported pstock binary version {version}, this version of pstock "
+            f"reads versions <= {VERSION}."
+        )
+    header = json.loads(bytes(view[_PREFIX.size : _PREFIX.size + header_length]))
+    if header["kind"] != kind:
+        raise ValueError(f"Expected a {kind} binary, got a {header['kind']} one.")
+
+    start = _PREFIX.size + header_length
+    start += _padding(start)
+    arrays = {
+        name: (
+            np.frombuffer(view, dtype=dtype, count=count, offset=start + offset)
+            if count
+            else np.empty(0, dtype=dtype)
+        )
+        for name, dtype, offset, count in header["buffers"]
+    }
+    return header["meta"], arrays
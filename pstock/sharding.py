@@ -0,0 +1,180 @@
+"""Fetch large symbol universes with multiple processes.
+
+A single event loop is limited to one core for html parsing, validation and
+dataframe generation. `ShardedExecutor` splits the symbols across worker
+processes, each one running its own event loop and connection pool. Workers send
+back flat data (numpy arrays for bars, plain dicts for assets) instead of
+pickled models, and the parent builds the (trusted) models from it.
+
+```python
+async with ShardedExecutor(processes=8) as executor:
+    bars = await executor.get_bars(symbols, period="1y", interval="1d")
+    assets = await executor.get_assets(symbols)
+```
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import typing as tp
+from concurrent.futures import ProcessPoolExecutor
+
+import anyio
+import asyncer
+import httpx
+
+from pstock.asset import Asset, Assets
+from pstock.bar import Bars, BarsMulti
+from pstock.concurrency import AIMDController, use_controller
+
+_Results = tp.Tuple[tp.Dict[str, tp.Any], tp.Dict[str, BaseException]]
+
+
+def split_symbols(symbols: tp.Sequence[str], shards: int) -> tp.List[tp.List[str]]:
+    """Split `symbols` in (at most) `shards` lists of almost equal size."""
+    shards = max(1, min(shards, len(symbols)))
+    return [list(symbols[idx::shards]) for idx in range(shards)]
+
+
+def _picklable(error: Exception) -> Exception:
+    # some exceptions (httpx ones for example) can't be unpickled in the parent
+    try:
+        pickle.loads(pickle.dumps(error))
+    except Exception:
+        return RuntimeError(repr(error))
+    return error
+
+
+async def _get_shard(
+    get: tp.Callable[[str, httpx.AsyncClient], tp.Awaitable[tp.Any]],
+    symbols: tp.List[str],
+    concurrency: int,
+    transport: tp.Optional[httpx.AsyncBaseTransport],
+) -> _Results:
+    results: tp.Dict[str, tp.Any] = {}
+    errors: tp.Dict[str, BaseException] = {}
+
+    async def _get(symbol: str, client: httpx.AsyncClient) -> None:
+        try:
+            results[symbol] = await get(symbol, client)
+        except Exception as error:
+            errors[symbol] = _picklable(error)
+
+    controller = AIMDController(
+        initial=min(8, concurrency), max_limit=max(1, concurrency)
+    )
+    client_kwargs: tp.Dict[str, tp.Any] = {}
+    if transport is not None:
+        client_kwargs["transport"] = transport
+    with use_controller(controller):
+        async with httpx.AsyncClient(**client_kwargs) as client:
+            async with asyncer.create_task_group() as tg:
+                for symbol in symbols:
+                    tg.soonify(_get)(symbol, client)
+    return results, errors
+
+
+def _bars_worker(
+    symbols: tp.List[str],
+    concurrency: int,
+    transport: tp.Optional[httpx.AsyncBaseTransport],
+    params: tp.Dict[str, tp.Any],
+) -> _Results:
+    async def _get(symbol: str, client: httpx.AsyncClient) -> tp.Dict[str, tp.Any]:
+        bars = await Bars.get(symbol, client=client, validate=False, **params)
+        return bars.to_columns()
+
+    return anyio.run(_get_shard, _get, symbols, concurrency, transport)
+
+
+def _assets_worker(
+    symbols: tp.List[str],
+    concurrency: int,
+    transport: tp.Optional[httpx.AsyncBaseTransport],
+    validate: bool,
+) -> _Results:
+    async def _get(symbol: str, client: httpx.AsyncClient) -> tp.Dict[str, tp.Any]:
+        response, financials_response = await Asset.get_responses(symbol, client=client)
+        data = Asset.extract(response=response, financials_response=financials_response)
+        if validate:
+            # validated in the workers, the parent only builds trusted models
+            data = Asset.parse_obj(data).dict()
+        return data
+
+    return anyio.run(_get_shard, _get, symbols, concurrency, transport)
+
+
+class ShardedExecutor:
+    def __init__(
+        self,
+        processes: tp.Optional[int] = None,
+        *,
+        concurrency: int = 16,
+        mp_context: tp.Optional[tp.Any] = None,
+        transport: tp.Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        """
+        Args:
+            processes: Number of worker processes, defaults to the number of CPUs.
+            concurrency: Maximum number of in-flight requests of each worker.
+            mp_context: Multiprocessing context of the process pool.
+            transport: Transport of the clients of the workers (a
+                `pstock.testing.ReplayTransport` for example), pickled to every
+                worker.
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.concurrency = concurrency
+        self.transport = transport
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.processes, mp_context=mp_context
+        )
+
+    async def __aenter__(self) -> ShardedExecutor:
+        return self
+
+    async def __aexit__(self, *args: tp.Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        # waits for the workers to exit, out of the event loop thread
+        await anyio.to_thread.run_sync(self._pool.shutdown)
+
+    async def _run(
+        self, worker: tp.Callable[..., _Results], symbols: tp.List[str], *args: tp.Any
+    ) -> tp.Dict[str, tp.Any]:
+        def _submit_and_wait() -> tp.List[_Results]:
+            # submitted out of the event loop thread: the pool forks its workers
+            # from the submitting thread, they shouldn't inherit a running loop.
+            futures = [
+                self._pool.submit(
+                    worker, shard, self.concurrency, self.transport, *args
+                )
+                for shard in split_symbols(symbols, self.processes)
+            ]
+            return [future.result() for future in futures]
+
+        results: tp.Dict[str, tp.Any] = {}
+        errors: tp.Dict[str, BaseException] = {}
+        for _results, _errors in await anyio.to_thread.run_sync(_submit_and_wait):
+            results.update(_results)
+            errors.update(_errors)
+        for symbol in symbols:
+            if symbol in errors:
+                raise errors[symbol]
+        return {symbol: results[symbol] for symbol in symbols}
+
+    async def get_bars(self, symbols: tp.List[str], **params: tp.Any) -> BarsMulti:
+        """Sharded `BarsMulti.get`, `params` are the ones of `Bars.get`."""
+        columns = await self._run(_bars_worker, symbols, params)
+        return BarsMulti.trusted(
+            __root__={
+                symbol: Bars.from_columns(_columns)
+                for symbol, _columns in columns.items()
+            }
+        )
+
+    async def get_assets(self, symbols: tp.List[str], validate: bool = True) -> Assets:
+        """Sharded `Assets.get`, the assets are validated by the workers unless
+        `validate=False`."""
+        data = await self._run(_assets_worker, symbols, validate)
+        return Assets.trusted(__root__=list(data.values()))
@@ -0,0 +1,148 @@
+"""Synchronous facade of pstock's async API.
+
+The coroutines run on one long-lived event loop, in a background thread, with a
+persistent (pooled) `httpx.AsyncClient`. Calls from many threads at the same
+time run concurrently on that loop and share the same connections:
+
+```python
+from pstock import sync
+
+bars = sync.Bars.get("TSLA", period="1mo", interval="1d")
+assets = sync.Assets.get(["TSLA", "AAPL"])
+```
+
+`sync.Client()` gives a separate loop and connection pool (for example with
+custom `httpx` options), the module level facades use a shared default one.
+"""
+from __future__ import annotations
+
+import atexit
+import threading
+import typing as tp
+
+import httpx
+from anyio.from_thread import BlockingPortal, start_blocking_portal
+
+from pstock import asset, bar, earnings, income_statement, news, trend
+
+R = tp.TypeVar("R")
+
+
+class Client:
+    def __init__(self, **client_kwargs: tp.Any) -> None:
+        """
+        Args:
+            client_kwargs: Keyword arguments of the `httpx.AsyncClient`.
+        """
+        self.client_kwargs = client_kwargs
+        self._lock = threading.Lock()
+        self._portal_cm: tp.Optional[tp.ContextManager[BlockingPortal]] = None
+        self._portal: tp.Optional[BlockingPortal] = None
+        self._client: tp.Optional[httpx.AsyncClient] = None
+
+    def __enter__(self) -> Client:
+        return self
+
+    def __exit__(self, *args: tp.Any) -> None:
+        self.close()
+
+    @property
+    def running(self) -> bool:
+        return self._portal is not None
+
+    def _start(self) -> tp.Tuple[BlockingPortal, httpx.AsyncClient]:
+        with self._lock:
+            if self._portal is None:
+                portal_cm = start_blocking_portal()
+                portal = portal_cm.__enter__()
+
+                async def _open() -> httpx.AsyncClient:
+                    return httpx.AsyncClient(**self.client_kwargs)
+
+                self._client = portal.call(_open)
+                self._portal_cm, self._portal = portal_cm, portal
+            if self._client is None:
+                raise RuntimeError("client is closed")
+            return self._portal, self._client
+
+    def call(
+        self, func: tp.Callable[..., tp.Awaitable[R]], *args: tp.Any, **kwargs: tp.Any
+    ) -> R:
+        """Run `func(*args, **kwargs)` on the background loop and wait for it.
+
+        `func` gets the persistent `client` unless another one is given. Raises a
+        `RuntimeError` if the client is closed (by `close` in another thread)
+        before the call starts.
+        """
+        portal, client = self._start()
+        kwargs.setdefault("client", client)
+
+        async def _call() -> R:
+            if client.is_closed:
+                raise RuntimeError("client is closed")
+            return await func(*args, **kwargs)
+
+        try:
+            future = portal.start_task_soon(_call)
+        except RuntimeError as error:
+            # the portal was stopped since `_start`
+            raise RuntimeError("client is closed") from error
+        return future.result()
+
+    def close(self) -> None:
+        """Close the connections and stop the background loop (restarted by the
+        next call)."""
+        with self._lock:
+            if self._portal is None or self._portal_cm is None:
+                return
+            if self._client is not None:
+                self._portal.call(self._client.aclose)
+            self._portal_cm.__exit__(None, None, None)
+            self._portal_cm = self._portal = self._client = None
+
+
+class _Facade:
+    def __init__(self, model: tp.Any, client: tp.Optional[Client] = None) -> None:
+        self.model = model
+        self.client = client
+
+    def __repr__(self) -> str:
+        return f"sync.{self.model.__name__}"
+
+    def get(self, *args: tp.Any, **kwargs: tp.Any) -> tp.Any:
+        """Blocking `.get` of the model, same arguments."""
+        return (self.client or default_client()).call(self.model.get, *args, **kwargs)
+
+    def load(self, *args: tp.Any, **kwargs: tp.Any) -> tp.Any:
+        return self.model.load(*args, **kwargs)
+
+
+_default_client: tp.Optional[Client] = None
+_default_lock = threading.Lock()
+
+
+def default_client() -> Client:
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = Client()
+            atexit.register(_default_client.close)
+        return _default_client
+
+
+def run(func: tp.Callable[..., tp.Awaitable[R]], *args: tp.Any, **kwargs: tp.Any) -> R:
+    """Run any pstock coroutine function accepting a `client` on the default
+    loop."""
+    return default_client().call(func, *args, **kwargs)
+
+
+Asset = _Facade(asset.Asset)
+Assets = _Facade(asset.Assets)
+Bars = _Facade(bar.Bars)
+BarsMulti = _Facade(bar.BarsMulti)
+Earnings = _Facade(earnings.Earnings)
+IncomeStatements = _Facade(income_statement.IncomeStatements)
+QuarterlyIncomeStatements = _Facade(income_statement.QuarterlyIncomeStatements)
+News = _Facade(news.News)
+NewsMulti = _Facade(news.NewsMulti)
+Trends = _Facade(trend.Trends)
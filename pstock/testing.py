@@ -0,0 +1,236 @@
+"""Offline replay of yahoo-finance responses, to benchmark fan-out calls.
+
+`ReplayTransport` is an `httpx` transport serving recorded chart, spark, quote,
+financials and RSS responses for any symbol, with configurable latency,
+bandwidth, `429`/`5xx` injection and a server-side concurrency limit:
+
+```python
+import httpx
+from pstock import BarsMulti
+from pstock.concurrency import AIMDController
+from pstock.testing import ReplayTransport, lognormal
+
+transport = ReplayTransport(
+    chart=chart_json,
+    latency=lognormal(median=0.2, sigma=0.5),
+    errors={429: 0.02, 503: 0.01},
+    max_in_flight=32,
+    bandwidth=1_000_000,
+    seed=42,
+)
+async with httpx.AsyncClient(transport=transport) as client:
+    bars = await BarsMulti.get(symbols, client=client, concurrency=AIMDController())
+print(transport.stats)
+```
+
+Given the same `seed` (and the same order of requests), the injected latencies
+and errors are the same from one run to the other.
+"""
+from __future__ import annotations
+
+import json
+import math
+import random
+import typing as tp
+from collections import Counter
+from pathlib import Path
+
+import anyio
+import httpx
+
+Recording = tp.Union[str, bytes, tp.Dict[str, tp.Any], httpx.Response]
+Latency = tp.Union[float, tp.Callable[[random.Random], float]]
+
+_FILES = {
+    "chart": "chart.json",
+    "spark": "spark.json",
+    "quote": "quote.html",
+    "financials": "financials.html",
+    "rss": "rss.xml",
+}
+_CONTENT_TYPES = {
+    "chart": "application/json",
+    "spark": "application/json",
+    "quote": "text/html",
+    "financials": "text/html",
+    "rss": "application/rss+xml",
+}
+
+
+def uniform(low: float, high: float) -> tp.Callable[[random.Random], float]:
+    """Latency uniformly distributed between `low` and `high` seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float) -> tp.Callable[[random.Random], float]:
+    """Log-normal latency (long tail) of `median` seconds."""
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def _content(recording: Recording) -> bytes:
+    if isinstance(recording, httpx.Response):
+        return recording.content
+    if isinstance(recording, dict):
+        return json.dumps(recording).encode()
+    if isinstance(recording, str):
+        return recording.encode()
+    return recording
+
+
+class ReplayStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.status_codes: tp.Counter[int] = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.bytes_sent = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"ReplayStats(requests={self.requests}, "
+            f"status_codes={dict(self.status_codes)}, "
+            f"max_in_flight={self.max_in_flight}, bytes_sent={self.bytes_sent})"
+        )
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        *,
+        chart: tp.Optional[Recording] = None,
+        spark: tp.Optional[Recording] = None,
+        quote: tp.Optional[Recording] = None,
+        financials: tp.Optional[Recording] = None,
+        rss: tp.Optional[Recording] = None,
+        symbol: tp.Optional[str] = None,
+        latency: Latency = 0.0,
+        bandwidth: tp.Optional[float] = None,
+        errors: tp.Optional[tp.Dict[int, float]] = None,
+        max_in_flight: tp.Optional[int] = None,
+        retry_after: tp.Optional[float] = None,
+        seed: tp.Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            chart, spark, quote, financials, rss: Recorded responses (body, json
+                or `httpx.Response`) served for every symbol, `404` when not set.
+            symbol: Symbol of the recordings, replaced by the requested one. The
+                spark recording (of this one symbol) is repeated for every
+                requested symbol.
+            latency: Seconds before responding, or a distribution
+                (`uniform`, `lognormal`, any `f(random.Random) -> float`).
+            bandwidth: Bytes per second of each response body.
+            errors: Probability of answering with a status code instead of the
+                recording, for example `{429: 0.05, 503: 0.01}`.
+            max_in_flight: Requests above this number of concurrent requests
+                are answered with a `429`, like a rate limiting server.
+            retry_after: `Retry-After` header (seconds) of the `429` responses.
+            seed: Seed of the latency and errors random generator.
+        """
+        self.recordings = {
+            kind: _content(recording)
+            for kind, recording in {
+                "chart": chart,
+                "spark": spark,
+                "quote": quote,
+                "financials": financials,
+                "rss": rss,
+            }.items()
+            if recording is not None
+        }
+        self.symbol = symbol
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.errors = errors or {}
+        self.max_in_flight = max_in_flight
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.stats = ReplayStats()
+
+    @classmethod
+    def from_directory(
+        cls, directory: tp.Union[str, Path], **kwargs: tp.Any
+    ) -> ReplayTransport:
+        """Load the recordings from `chart.json`, `spark.json`, `quote.html`,
+        `financials.html` and `rss.xml` files of `directory` (the ones that
+        exist)."""
+        directory = Path(directory)
+        recordings: tp.Dict[str, tp.Any] = {
+            kind: (directory / filename).read_bytes()
+            for kind, filename in _FILES.items()
+            if (directory / filename).exists()
+        }
+        return cls(**recordings, **kwargs)
+
+    @staticmethod
+    def route(url: httpx.URL) -> tp.Tuple[tp.Optional[str], tp.Optional[str]]:
+        """`(kind, symbol)` of a yahoo-finance url, `(None, None)` if unknown."""
+        parts = [part for part in url.path.split("/") if part]
+        if url.host.startswith("query") and parts[:3] == ["v8", "finance", "chart"]:
+            return "chart", parts[3] if len(parts) > 3 else None
+        if url.host.startswith("query") and parts[:3] == ["v7", "finance", "spark"]:
+            return "spark", url.params.get("symbols")
+        if url.host == "finance.yahoo.com" and parts[:1] == ["quote"]:
+            if len(parts) > 2 and parts[2] == "financials":
+                return "financials", parts[1]
+            return "quote", parts[1] if len(parts) > 1 else None
+        if url.host == "feeds.finance.yahoo.com" and parts[:1] == ["rss"]:
+            return "rss", url.params.get("s")
+        return None, None
+
+    def _status_code(self, kind: tp.Optional[str]) -> int:
+        if kind not in self.recordings:
+            return 404
+        if self.max_in_flight is not None and self.stats.in_flight > self.max_in_flight:
+            return 429
+        draw = self.rng.random()
+        for status_code, probability in self.errors.items():
+            if draw < probability:
+                return status_code
+            draw -= probability
+        return 200
+
+    def _body(self, kind: str, symbol: tp.Optional[str]) -> bytes:
+        content = self.recordings[kind]
+        if kind == "spark" and self.symbol and symbol:
+            (result,) = json.loads(content)["spark"]["result"]
+            template = json.dumps(result)
+            results = [
+                json.loads(template.replace(self.symbol, name.upper()))
+                for name in symbol.split(",")
+            ]
+            return json.dumps({"spark": {"result": results, "error": None}}).encode()
+        if self.symbol and symbol and symbol.upper() != self.symbol.upper():
+            content = content.replace(self.symbol.encode(), symbol.upper().encode())
+        return content
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats.requests += 1
+        self.stats.in_flight += 1
+        self.stats.max_in_flight = max(self.stats.max_in_flight, self.stats.in_flight)
+        try:
+            kind, symbol = self.route(request.url)
+            status_code = self._status_code(kind)
+            latency = self.latency(self.rng) if callable(self.latency) else self.latency
+
+            headers: tp.Dict[str, str] = {}
+            content = b""
+            if status_code == 200 and kind is not None:
+                content = self._body(kind, symbol)
+                headers["content-type"] = _CONTENT_TYPES[kind]
+                if self.bandwidth:
+                    latency += len(content) / self.bandwidth
+            elif status_code == 429 and self.retry_after is not None:
+                headers["retry-after"] = str(self.retry_after)
+
+            if latency > 0:
+                await anyio.sleep(latency)
+        finally:
+            self.stats.in_flight -= 1
+
+        self.stats.status_codes[status_code] += 1
+        self.stats.bytes_sent += len(content)
+        return httpx.Response(
+            status_code, headers=headers, content=content, request=request
+        )
@@ -1,12 +1,13 @@
 import datetime
 import typing as tp
+from operator import attrgetter
 
 import numpy as np
 import pandas as pd
 from pydantic import validator
 
 from pstock.base import BaseModel, BaseModelSequence
-from pstock.quote import QuoteSummary
+from pstock.quote import QuoteStore, QuoteSummary, fingerprint
 from pstock.utils.quote import get_trends_data_from_quote
 
 
@@ -28,23 +29,7 @@ class Trend(BaseModel):
     ) -> float:
         if value is not None:
             return value
-        numerator = (
-            values["strong_buy"]
-            + values["buy"] * 2
-            + values["hold"] * 3
-            + values["sell"] * 4
-            + values["strong_sell"] * 5
-        )
-        denominator = (
-            values["strong_buy"]
-            + values["buy"]
-            + values["hold"]
-            + values["sell"]
-            + values["strong_sell"]
-        )
-        if denominator == 0:
-            return np.nan
-        return round(numerator / denominator, 2)
+        return _get_score(values)
 
     @validator("recomendation", always=True)
     def compute_recomendation(
@@ -52,35 +37,149 @@ class Trend(BaseModel):
     ):
         if value is not None:
             return value
-        score = values["score"]
-        if np.isnan(score):
-            return "UNKNOWN"
-        elif score >= 4.5:
-            return "STRONG_SELL"
-        elif score >= 3.5:
-            return "SELL"
-        elif score >= 2.5:
-            return "HOLD"
-        elif score >= 1.5:
-            return "BUY"
+        return _get_recomendation(values["score"])
+
+    @classmethod
+    def trusted(cls, **values: tp.Any) -> "Trend":
+        for field in ("strong_buy", "buy", "hold", "sell", "strong_sell"):
+            values.setdefault(field, 0)
+        if values.get("score") is None:
+            values["score"] = _get_score(values)
+        if values.get("recomendation") is None:
+            values["recomendation"] = _get_recomendation(values["score"])
+        return super().trusted(**values)
+
+
+_COUNT_FIELDS = ("strong_buy", "buy", "hold", "sell", "strong_sell")
+_RECOMENDATIONS = ("STRONG_BUY", "BUY", "HOLD", "SELL", "STRONG_SELL")
+
+
+def _get_score(values: tp.Dict[str, tp.Any]) -> float:
+    numerator = (
+        values["strong_buy"]
+        + values["buy"] * 2
+        + values["hold"] * 3
+        + values["sell"] * 4
+        + values["strong_sell"] * 5
+    )
+    denominator = (
+        values["strong_buy"]
+        + values["buy"]
+        + values["hold"]
+        + values["sell"]
+        + values["strong_sell"]
+    )
+    if denominator == 0:
+        return np.nan
+    return round(numerator / denominator, 2)
+
+
+def _get_recomendation(score: float) -> str:
+    if np.isnan(score):
+        return "UNKNOWN"
+    elif score >= 4.5:
+        return "STRONG_SELL"
+    elif score >= 3.5:
+        return "SELL"
+    elif score >= 2.5:
+        return "HOLD"
+    elif score >= 1.5:
+        return "BUY"
+    else:
+        return "STRONG_BUY"
+
+
+def get_scores(counts: np.ndarray) -> np.ndarray:
+    """Vectorized `_get_score` of a `(n, 5)` array of recommendation counts."""
+    counts = np.asarray(counts, dtype="float64").reshape(-1, len(_COUNT_FIELDS))
+    numerator = counts @ np.arange(1, len(_COUNT_FIELDS) + 1, dtype="float64")
+    denominator = counts.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.round(numerator / denominator, 2)
+    scores[denominator == 0] = np.nan
+    return scores
+
+
+def get_recomendations(scores: np.ndarray) -> np.ndarray:
+    """Vectorized `_get_recomendation`."""
+    scores = np.asarray(scores, dtype="float64")
+    # digitize puts NaN after the last bin, mapped to "UNKNOWN"
+    labels = np.array(_RECOMENDATIONS + ("UNKNOWN",), dtype=object)
+    return labels[np.digitize(scores, [1.5, 2.5, 3.5, 4.5, np.inf])]
+
+
+def score_trends(trends: tp.List[tp.Any], *, copy: bool = True) -> tp.List[tp.Any]:
+    """Fill the missing `score`/`recomendation` of raw trend dicts in one pass.
+
+    Returns a copy of `trends`, the input dicts are not modified (unless
+    `copy=False`, for dicts the caller already owns). Other items (`Trend`
+    models) are left as is. The list can hold the trends of many assets, to score
+    them all at once.
+    """
+    if copy:
+        trends = [dict(trend) if isinstance(trend, dict) else trend for trend in trends]
+    missing = [
+        trend
+        for trend in trends
+        if isinstance(trend, dict)
+        and (trend.get("score") is None or trend.get("recomendation") is None)
+    ]
+    if not missing:
+        return trends
+    counts = np.array(
+        [[trend.get(field) or 0 for field in _COUNT_FIELDS] for trend in missing],
+        dtype="float64",
+    )
+    scores = get_scores(counts)
+    recomendations = get_recomendations(scores)
+    for trend, score, recomendation in zip(missing, scores, recomendations):
+        for field in _COUNT_FIELDS:
+            trend.setdefault(field, 0)
+        if trend.get("score") is None:
+            trend["score"] = float(score)
         else:
-            return "STRONG_BUY"
+            recomendation = _get_recomendation(trend["score"])
+        if trend.get("recomendation") is None:
+            trend["recomendation"] = recomendation
+    return trends
 
 
 class Trends(BaseModelSequence[Trend], QuoteSummary):
     __root__: tp.List[Trend]
 
+    modules: tp.ClassVar[tp.Tuple[str, ...]] = ("recommendationTrend",)
+
+    @classmethod
+    def fingerprint(cls, store: QuoteStore) -> tp.Optional[bytes]:
+        # the dates of the trends are relative to today
+        digest = super().fingerprint(store)
+        return fingerprint(f"{datetime.date.today()}".encode() + (digest or b""))
+
     def gen_df(self) -> pd.DataFrame:
         df = super().gen_df()
         if not df.empty:
             df = df.set_index("date").sort_index()
         return df
 
+    @validator("__root__", pre=True)
+    def set_scores(cls, value: tp.Any) -> tp.Any:
+        if not isinstance(value, list):
+            return value
+        return score_trends(value)
+
     @validator("__root__")
     def sort_trends(cls, value: tp.List[Trend]) -> tp.List[Trend]:
         if not value:
             return value
-        return sorted(value, key=lambda trend: pd.to_datetime(trend.date))
+        return sorted(value, key=attrgetter("date"))
+
+    @classmethod
+    def trusted(cls, **values: tp.Any) -> "Trends":
+        if isinstance(values.get("__root__"), list):
+            values["__root__"] = score_trends(values["__root__"])
+        trends = super().trusted(**values)
+        trends.__root__ = cls.sort_trends(trends.__root__)
+        return trends
 
     @classmethod
     def process_quote(cls, quote: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Any]:
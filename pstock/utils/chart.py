@@ -1,16 +1,125 @@
 import logging
 import typing as tp
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone, tzinfo
+from operator import itemgetter
 
 import numpy as np
+import pandas as pd
+import pendulum
 
 from pstock.utils.utils import parse_duration
 
 
-def get_ohlc_from_chart(
+def get_exchange_timezone(meta: tp.Dict[str, tp.Any]) -> tp.Union[str, tzinfo]:
+    name = meta.get("exchangeTimezoneName")
+    if name:
+        return name
+    offset = meta.get("gmtoffset")
+    if offset is not None:
+        return timezone(timedelta(seconds=offset))
+    return "UTC"
+
+
+def get_trading_session_from_chart(
     data: tp.Dict[str, tp.Any]
-) -> tp.List[tp.Dict[str, tp.Union[datetime, float, timedelta]]]:
+) -> tp.Optional[tp.Dict[str, tp.Any]]:
+    """Current (or last) trading session of the exchange, from the chart meta."""
+    result = data.get("chart", {}).get("result")
+    if not result:
+        return None
+    meta = result[0].get("meta", {})
+    period = meta.get("currentTradingPeriod")
+    if not period or "regular" not in period:
+        return None
+
+    regular = period["regular"]
+    pre = period.get("pre") or regular
+    post = period.get("post") or regular
+    return {
+        "exchange": meta.get("exchangeName"),
+        "timezone": meta.get("exchangeTimezoneName") or "UTC",
+        "pre_start": pendulum.from_timestamp(pre["start"]),
+        "regular_start": pendulum.from_timestamp(regular["start"]),
+        "regular_end": pendulum.from_timestamp(regular["end"]),
+        "post_end": pendulum.from_timestamp(post["end"]),
+    }
+
+
+def get_latest_price_from_chart(data: tp.Dict[str, tp.Any]) -> float:
+    """Latest (regular market) price of the chart, the last close if not in the
+    meta."""
+    result = data.get("chart", {}).get("result")
+    if not result:
+        raise ValueError(
+            "Got invalid value for result field in yahoo-finance chart "
+            f"response: {result}"
+        )
+    meta = result[0].get("meta", {})
+    if meta.get("regularMarketPrice") is not None:
+        return float(meta["regularMarketPrice"])
+    quote = (result[0].get("indicators", {}).get("quote") or [{}])[0]
+    closes = np.asarray(quote.get("close") or [], dtype="float64")
+    closes = closes[~np.isnan(closes)]
+    return float(closes[-1]) if closes.size else np.nan
+
+
+def get_dates_from_chart(
+    timestamps: tp.Sequence[int],
+    *,
+    interval: timedelta,
+    exchange_timezone: tp.Union[str, tzinfo],
+    tz: tp.Literal["utc", "exchange"] = "utc",
+) -> pd.DatetimeIndex:
+    dates = pd.to_datetime(np.asarray(timestamps, dtype="int64"), unit="s", utc=True)
+    if interval >= timedelta(days=1):
+        # daily (or larger) bars are stamped at the exchange open, their date is
+        # the calendar date of the exchange, not the one of the UTC timestamp.
+        dates = dates.tz_convert(exchange_timezone).normalize()
+        if tz == "utc":
+            dates = dates.tz_localize(None).tz_localize("UTC")
+    elif tz == "exchange":
+        dates = dates.tz_convert(exchange_timezone)
+    return dates
+
+
+def get_events_from_chart(
+    data: tp.Dict[str, tp.Any],
+    tz: tp.Literal["utc", "exchange"] = "utc",
+) -> tp.Dict[str, pd.DataFrame]:
+    """Dividends (`amount`) and splits (`numerator`, `denominator`) of the chart,
+    indexed by ex-date, on the same dates as the bars."""
+    result = data.get("chart", {}).get("result") or [{}]
+    meta = result[0].get("meta", {})
+    events = result[0].get("events") or {}
+    interval = parse_duration(meta.get("dataGranularity", "1d"))
+    exchange_timezone = get_exchange_timezone(meta)
+
+    def _table(kind: str, columns: tp.Tuple[str, ...]) -> pd.DataFrame:
+        values = sorted((events.get(kind) or {}).values(), key=itemgetter("date"))
+        dates = get_dates_from_chart(
+            [value["date"] for value in values],
+            interval=interval,
+            exchange_timezone=exchange_timezone,
+            tz=tz,
+        )
+        return pd.DataFrame(
+            {
+                column: np.array([value[column] for value in values], dtype="float64")
+                for column in columns
+            },
+            index=dates.rename("date"),
+        )
+
+    return {
+        "dividends": _table("dividends", ("amount",)),
+        "splits": _table("splits", ("numerator", "denominator")),
+    }
+
+
+_OHLCV_KEYS = ("open", "high", "low", "close", "volume")
 
+
+def _get_chart_result(data: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Any]:
     result = data.get("chart", {}).get("result")
     if not result:
         error = data.get("chart", {}).get("error")
@@ -20,8 +129,16 @@ def get_ohlc_from_chart(
             "Got invalid value for result field in yahoo-finance chart "
             f"response: {result}"
         )
+    return result[0]
+
 
-    result = result[0]
+def get_ohlc_df_from_chart(
+    data: tp.Dict[str, tp.Any],
+    tz: tp.Literal["utc", "exchange"] = "utc",
+) -> pd.DataFrame:
+    """Prices (`open`, `high`, `low`, `close`, `adj_close`, `volume`) and interval
+    of the chart indexed by date, built column-wise. Missing prices are NaN."""
+    result = _get_chart_result(data)
     meta = result["meta"]
 
     interval = parse_duration(meta["dataGranularity"])
@@ -34,34 +151,105 @@ def get_ohlc_from_chart(
             "Please make sure that provided params are valid (for example that "
             "start/end times are valid UTC market times)."
         )
-        return []
+        timestamps: tp.Sequence[int] = []
+        indicators: tp.Dict[str, tp.Any] = {
+            "quote": [{column: [] for column in _OHLCV_KEYS}]
+        }
+    else:
+        timestamps = result["timestamp"]
+        indicators = result["indicators"]
 
-    timestamps = result["timestamp"]
-    indicators = result["indicators"]
+    dates = get_dates_from_chart(
+        timestamps,
+        interval=interval,
+        exchange_timezone=get_exchange_timezone(meta),
+        tz=tz,
+    )
     ohlc = indicators["quote"][0]
-    volumes = ohlc["volume"]
-    opens = ohlc["open"]
-    closes = ohlc["close"]
-    lows = ohlc["low"]
-    highs = ohlc["high"]
-
+    columns = {
+        column: np.asarray(ohlc[column], dtype="float64") for column in _OHLCV_KEYS
+    }
     if "adjclose" in indicators:
-        adj_closes = indicators["adjclose"][0]["adjclose"]
+        adj_closes = np.asarray(indicators["adjclose"][0]["adjclose"], dtype="float64")
     else:
-        adj_closes = closes
-
-    return [
+        adj_closes = columns["close"]
+    return pd.DataFrame(
         {
-            "date": timestamp,
-            "close": close if close is not None else np.nan,
-            "adj_close": adj_close if adj_close is not None else np.nan,
-            "high": high if high is not None else np.nan,
-            "low": low if low is not None else np.nan,
-            "open": open if open is not None else np.nan,
-            "volume": volume if volume is not None else np.nan,
-            "interval": interval,
-        }
-        for timestamp, volume, open, close, adj_close, low, high in zip(
-            timestamps, volumes, opens, closes, adj_closes, lows, highs
+            "open": columns["open"],
+            "high": columns["high"],
+            "low": columns["low"],
+            "close": columns["close"],
+            "adj_close": adj_closes,
+            "volume": columns["volume"],
+            "interval": pd.Timedelta(interval),
+        },
+        index=dates.rename("date"),
+    )
+
+
+def get_ohlc_from_chart(
+    data: tp.Dict[str, tp.Any],
+    tz: tp.Literal["utc", "exchange"] = "utc",
+) -> tp.List[tp.Dict[str, tp.Union[datetime, float, timedelta]]]:
+    """Bars of the chart as dicts, see `get_ohlc_df_from_chart`."""
+    df = get_ohlc_df_from_chart(data, tz=tz)
+    if df.empty:
+        return []
+    interval = df["interval"].iloc[0].to_pytimedelta()
+    records = df.drop(columns="interval").reset_index().to_dict(orient="records")
+    return [{**record, "interval": interval} for record in records]
+
+
+def get_closes_from_chart(
+    data: tp.Dict[str, tp.Any],
+    tz: tp.Literal["utc", "exchange"] = "utc",
+) -> pd.DataFrame:
+    """Close prices (and interval) of the chart indexed by date, the only series of
+    the spark responses. Missing closes are dropped."""
+    result = _get_chart_result(data)
+    meta = result["meta"]
+    interval = parse_duration(meta["dataGranularity"])
+
+    if "timestamp" not in result:
+        logging.getLogger(__name__).warning(
+            f"Yahoo-finance returned an empty chart for symbol '{meta['symbol']}'."
+        )
+        timestamps: tp.Sequence[int] = []
+        closes = np.array([], dtype="float64")
+    else:
+        timestamps = result["timestamp"]
+        closes = np.asarray(result["indicators"]["quote"][0]["close"], dtype="float64")
+
+    dates = get_dates_from_chart(
+        timestamps,
+        interval=interval,
+        exchange_timezone=get_exchange_timezone(meta),
+        tz=tz,
+    )
+    df = pd.DataFrame(
+        {"close": closes, "interval": pd.Timedelta(interval)},
+        index=dates.rename("date"),
+    )
+    return df[~np.isnan(closes)]
+
+
+def get_charts_from_spark(
+    data: tp.Dict[str, tp.Any]
+) -> tp.Dict[str, tp.Dict[str, tp.Any]]:
+    """Chart response of every symbol of a spark (multi-symbol) response."""
+    spark = data.get("spark", {})
+    result = spark.get("result")
+    if result is None:
+        error = spark.get("error")
+        if error:
+            raise ValueError(f"Yahoo-finance responded with an error:\n{error}")
+        raise ValueError(
+            "Got invalid value for result field in yahoo-finance spark "
+            f"response: {result}"
         )
-    ]
+    return {
+        item["symbol"].upper(): {
+            "chart": {"result": item.get("response"), "error": item.get("error")}
+        }
+        for item in result
+    }
@@ -1,4 +1,17 @@
 import typing as tp
+from datetime import datetime, timezone
+
+
+def _raw_float(value: tp.Dict[str, tp.Any]) -> tp.Optional[float]:
+    raw = value.get("raw")
+    return float(raw) if raw is not None else None
+
+
+def _raw_date(value: tp.Dict[str, tp.Any]) -> tp.Any:
+    raw = value.get("raw")
+    if isinstance(raw, (int, float)):
+        return datetime.fromtimestamp(raw, tz=timezone.utc).date()
+    return raw
 
 
 def get_income_statement_data_from_financials_quote(
@@ -14,10 +27,10 @@ def get_income_statement_data_from_financials_quote(
 
     return [
         {
-            "date": statement.get("endDate", {}).get("raw"),
-            "ebit": statement.get("ebit", {}).get("raw"),
-            "total_revenue": statement.get("totalRevenue", {}).get("raw"),
-            "gross_profit": statement.get("grossProfit", {}).get("raw"),
+            "date": _raw_date(statement.get("endDate", {})),
+            "ebit": _raw_float(statement.get("ebit", {})),
+            "total_revenue": _raw_float(statement.get("totalRevenue", {})),
+            "gross_profit": _raw_float(statement.get("grossProfit", {})),
         }
         for statement in statement_history
     ]
@@ -0,0 +1,95 @@
+import calendar
+import typing as tp
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from xml.etree import ElementTree
+
+
+def get_publications_from_feed(feed: tp.Any) -> tp.List[tp.Dict[str, tp.Any]]:
+    return [
+        {
+            "date": datetime.fromtimestamp(
+                calendar.timegm(entry["published_parsed"]), tz=timezone.utc
+            ),
+            "title": entry["title"],
+            "url": entry["link"],
+            "summary": entry.get("summary"),
+            "guid": entry.get("id"),
+        }
+        for entry in feed.entries
+    ]
+
+
+def merge_publications(
+    publications: tp.Mapping[str, tp.List[tp.Dict[str, tp.Any]]]
+) -> tp.List[tp.Dict[str, tp.Any]]:
+    """Merge the publications of multiple symbols, deduplicated by guid or url.
+
+    Each merged publication has a `symbols` list with all the symbols whose feed
+    contained it, in the order they were given.
+    """
+    merged: tp.Dict[str, tp.Dict[str, tp.Any]] = {}
+    for symbol, _publications in publications.items():
+        for publication in _publications:
+            key = publication.get("guid") or publication["url"]
+            if key in merged:
+                if symbol not in merged[key]["symbols"]:
+                    merged[key]["symbols"].append(symbol)
+            else:
+                merged[key] = {**publication, "symbols": [symbol]}
+    return list(merged.values())
+
+
+class RssStreamParser:
+    """Incremental RSS parser, publications are returned as soon as their `<item>`
+    is complete and the parsed elements are dropped right away, so memory usage
+    doesn't grow with the size of the feed.
+    """
+
+    def __init__(self) -> None:
+        self._parser: ElementTree.XMLPullParser = ElementTree.XMLPullParser(
+            events=("end",)
+        )
+
+    def feed(self, chunk: tp.Union[str, bytes]) -> tp.List[tp.Dict[str, tp.Any]]:
+        self._parser.feed(chunk)
+        return self._read_events()
+
+    def close(self) -> tp.List[tp.Dict[str, tp.Any]]:
+        self._parser.close()
+        return self._read_events()
+
+    def _read_events(self) -> tp.List[tp.Dict[str, tp.Any]]:
+        publications = []
+        for event in self._parser.read_events():
+            # ("end", element) events, the element is the last item
+            element = event[-1]
+            if not isinstance(element, ElementTree.Element) or element.tag != "item":
+                continue
+            pub_date = element.findtext("pubDate")
+            # items without a date can't be sorted, they are skipped
+            if pub_date:
+                publications.append(
+                    {
+                        "date": parsedate_to_datetime(pub_date).astimezone(
+                            timezone.utc
+                        ),
+                        "title": element.findtext("title"),
+                        "url": element.findtext("link"),
+                        "summary": element.findtext("description"),
+                        "guid": element.findtext("guid"),
+                    }
+                )
+            element.clear()
+        return publications
+
+
+def get_publications_from_rss(
+    content: tp.Union[str, bytes], chunk_size: int = 65536
+) -> tp.List[tp.Dict[str, tp.Any]]:
+    parser = RssStreamParser()
+    publications = []
+    for idx in range(0, len(content), chunk_size):
+        publications.extend(parser.feed(content[idx : idx + chunk_size]))
+    publications.extend(parser.close())
+    return publications
@@ -41,7 +41,7 @@ def get_latest_price_from_quote(price_data: tp.Dict[str, tp.Any]) -> float:
 
     _, (_, price) = min(prices.items(), key=lambda x: abs(pendulum.now() - x[1][0]))
 
-    return price
+    return float(price)
 
 
 def get_asset_data_from_quote(quote: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Any]:
@@ -84,16 +84,16 @@ def get_earnings_data_from_quote(
 
     date_to_earnings = {
         e.get("date", ""): {
-            "actual": e.get("actual", {}).get("raw", np.nan),
-            "estimate": e.get("estimate", {}).get("raw", np.nan),
+            "actual": float(e.get("actual", {}).get("raw", np.nan)),
+            "estimate": float(e.get("estimate", {}).get("raw", np.nan)),
         }
         for e in quarterly_earnings
         if "date" in e
     }
     date_to_fin_chart = {
         c.get("date", ""): {
-            "revenue": c.get("revenue", {}).get("raw", np.nan),
-            "earnings": c.get("earnings", {}).get("raw", np.nan),
+            "revenue": float(c.get("revenue", {}).get("raw", np.nan)),
+            "earnings": float(c.get("earnings", {}).get("raw", np.nan)),
         }
         for c in quarterly_financial_chart
         if "date" in c
@@ -116,8 +116,8 @@ def get_earnings_data_from_quote(
                 f"{earnings_chart.get('currentQuarterEstimateDate', '')}"
                 f"{earnings_chart.get('currentQuarterEstimateYear', '')}"
             ),
-            estimate=earnings_chart.get("currentQuarterEstimate", {}).get(
-                "raw", np.nan
+            estimate=float(
+                earnings_chart.get("currentQuarterEstimate", {}).get("raw", np.nan)
             ),
             actual=np.nan,
             revenue=np.nan,
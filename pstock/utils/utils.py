@@ -1,9 +1,11 @@
 import random
 import re
+import time
 import typing as tp
 from contextlib import asynccontextmanager
 from datetime import date, datetime, timedelta
 
+import anyio
 import httpx
 import pendulum
 from pydantic.datetime_parse import parse_date as parse_date_pydantic
@@ -11,6 +13,11 @@ from pydantic.datetime_parse import parse_datetime as parse_datetime_pydantic
 from pydantic.datetime_parse import parse_duration as parse_duration_pydantic
 from pydantic.errors import DateError, DateTimeError, DurationError
 
+from pstock import metrics
+from pstock.concurrency import THROTTLING_STATUS_CODES, Slot, current_controller
+from pstock.instrumentation import span
+from pstock.scheduler import scheduled
+
 _UNITS_REGEX = r"(?P<val>\d+(\.\d+)?)(?P<unit>(mo|s|m|h|d|w|y)?)"
 _UNITS = {
     "s": ("seconds", float),
@@ -101,3 +108,75 @@ async def httpx_client_manager(
     finally:
         if _close:
             await client.aclose()
+
+
+async def _fetch(
+    client: httpx.AsyncClient,
+    url: str,
+    host: str,
+    params: tp.Optional[tp.Dict[str, tp.Any]] = None,
+    headers: tp.Optional[tp.Dict[str, str]] = None,
+    slot: tp.Optional[Slot] = None,
+) -> httpx.Response:
+    async with scheduled():
+        if slot is not None:
+            # the wait for the scheduler isn't latency of the host
+            slot.started_at = time.monotonic()
+        with span("http.get", host=host) as tags:
+            response = await client.get(url, params=params, headers=headers or {})
+            tags["status_code"] = response.status_code
+            tags["bytes"] = len(response.content)
+    return response
+
+
+def _retry_after(response: httpx.Response, default: float) -> float:
+    try:
+        return max(default, float(response.headers.get("retry-after", default)))
+    except ValueError:
+        return default
+
+
+async def fetch(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    params: tp.Optional[tp.Dict[str, tp.Any]] = None,
+    headers: tp.Optional[tp.Dict[str, str]] = None,
+) -> httpx.Response:
+    """GET `url` with `client`.
+
+    When called under a concurrency controller (see `pstock.concurrency`), the
+    request waits for a free slot of its host, reports its outcome to the
+    controller and is retried with an exponential backoff on throttling. Under
+    a request scheduler (see `pstock.scheduler`), it then waits for a slot of
+    the connection pool, by priority.
+    """
+    host = httpx.URL(url).host
+    controller = current_controller()
+    if controller is None:
+        return await _fetch(client, url, host, params=params, headers=headers)
+
+    attempt = 0
+    while True:
+        async with controller.slot(host) as slot:
+            try:
+                response = await _fetch(
+                    client, url, host, params=params, headers=headers, slot=slot
+                )
+            except httpx.TransportError:
+                slot.report(None)
+                if attempt >= controller.max_retries:
+                    raise
+                delay = controller.backoff * 2**attempt
+            else:
+                slot.report(response.status_code)
+                if (
+                    response.status_code not in THROTTLING_STATUS_CODES
+                    or attempt >= controller.max_retries
+                ):
+                    return response
+                delay = _retry_after(response, controller.backoff * 2**attempt)
+
+        metrics.increment("retries_total", host=host)
+        attempt += 1
+        await anyio.sleep(delay)
@@ -0,0 +1,256 @@
+"""Live view of the assets of a set of symbols, refreshed in place.
+
+A `Watchlist` keeps one frame (a row per symbol) that is updated in place:
+prices are refreshed often (from the chart endpoint, a small json), the rest of
+the assets (sector, trends, earnings, ...) rarely (from the quote pages). The
+refreshes of the symbols are staggered over their interval, each call of
+`refresh` only fetches the symbols that are due, and only the rows that
+actually changed emit a `WatchlistEvent`:
+
+```python
+watchlist = Watchlist(symbols, price_interval=60, fundamentals_interval=6 * 3600)
+watchlist.subscribe(lambda event: print(event.symbol, event.changes))
+
+async with httpx.AsyncClient() as client:
+    await watchlist.run(client=client)
+```
+"""
+import json
+import logging
+import time
+import typing as tp
+
+import anyio
+import asyncer
+import httpx
+import numpy as np
+import pandas as pd
+
+from pstock.asset import Asset
+from pstock.bar import Bars
+from pstock.concurrency import AIMDController, use_controller
+from pstock.instrumentation import span
+from pstock.utils.chart import get_latest_price_from_chart
+from pstock.utils.utils import fetch, httpx_client_manager
+
+PRICE_COLUMNS = ("latest_price",)
+FUNDAMENTAL_COLUMNS = (
+    "name",
+    "asset_type",
+    "currency",
+    "sector",
+    "industry",
+    "recomendation",
+    "score",
+    "eps_estimate",
+    "eps_actual",
+)
+COLUMNS = PRICE_COLUMNS + FUNDAMENTAL_COLUMNS
+_NUMERIC_COLUMNS = {"latest_price", "score", "eps_estimate", "eps_actual"}
+
+
+class WatchlistEvent(tp.NamedTuple):
+    symbol: str
+    # column -> (old value, new value)
+    changes: tp.Dict[str, tp.Tuple[tp.Any, tp.Any]]
+
+
+def _equal(old: tp.Any, new: tp.Any) -> bool:
+    if isinstance(old, float) and isinstance(new, float):
+        return old == new or (np.isnan(old) and np.isnan(new))
+    return bool(old == new)
+
+
+def get_asset_row(asset: Asset) -> tp.Dict[str, tp.Any]:
+    """Values of the watchlist columns of an `Asset`."""
+    row = {
+        column: getattr(asset, column)
+        for column in COLUMNS
+        if column in asset.__fields__
+    }
+    trends = asset.trends.__root__
+    row["recomendation"] = trends[-1].recomendation if trends else None
+    row["score"] = trends[-1].score if trends else np.nan
+    reported = [
+        earning for earning in asset.earnings.__root__ if not np.isnan(earning.actual)
+    ]
+    row["eps_estimate"] = reported[-1].estimate if reported else np.nan
+    row["eps_actual"] = reported[-1].actual if reported else np.nan
+    return row
+
+
+class Watchlist:
+    def __init__(
+        self,
+        symbols: tp.Iterable[str],
+        *,
+        price_interval: float = 60.0,
+        fundamentals_interval: float = 6 * 3600.0,
+        concurrency: tp.Optional[AIMDController] = None,
+        validate: bool = True,
+    ) -> None:
+        """
+        Args:
+            symbols: Symbols to watch.
+            price_interval: Seconds between two refreshes of the price of a
+                symbol.
+            fundamentals_interval: Seconds between two refreshes of the rest of
+                an asset.
+            concurrency: Concurrency controller of the requests.
+            validate: Validate the fetched assets.
+        """
+        self.symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        self.intervals = {
+            "price": price_interval,
+            "fundamentals": fundamentals_interval,
+        }
+        self.concurrency = concurrency
+        self.validate = validate
+        self.assets: tp.Dict[str, Asset] = {}
+        self.df = pd.DataFrame(
+            {
+                column: np.full(
+                    len(self.symbols),
+                    np.nan if column in _NUMERIC_COLUMNS else None,
+                    dtype="float64" if column in _NUMERIC_COLUMNS else object,
+                )
+                for column in COLUMNS
+            },
+            index=pd.Index(self.symbols, name="symbol"),
+        )
+        self._rows = {symbol: idx for idx, symbol in enumerate(self.symbols)}
+        self._columns = {column: idx for idx, column in enumerate(COLUMNS)}
+        # everything is due at the first refresh
+        self._due = {
+            symbol: {kind: -np.inf for kind in self.intervals}
+            for symbol in self.symbols
+        }
+        self._callbacks: tp.List[tp.Callable[[WatchlistEvent], tp.Any]] = []
+
+    def subscribe(self, callback: tp.Callable[[WatchlistEvent], tp.Any]) -> None:
+        """Call `callback` with the event of every changed row."""
+        self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: tp.Callable[[WatchlistEvent], tp.Any]) -> None:
+        self._callbacks.remove(callback)
+
+    def due(self, kind: str, now: tp.Optional[float] = None) -> tp.List[str]:
+        now = time.monotonic() if now is None else now
+        return [symbol for symbol in self.symbols if self._due[symbol][kind] <= now]
+
+    def next_due(self) -> float:
+        return min(min(dues.values()) for dues in self._due.values())
+
+    def _reschedule(self, kind: str, symbols: tp.List[str], now: float) -> None:
+        interval = self.intervals[kind]
+        for symbol in symbols:
+            if np.isinf(self._due[symbol][kind]):
+                # first refresh: the next ones are spread over the interval
+                offset = (self._rows[symbol] + 1) / len(self.symbols)
+                self._due[symbol][kind] = now + interval * offset
+            else:
+                self._due[symbol][kind] = now + interval
+
+    def _update(
+        self, symbol: str, values: tp.Dict[str, tp.Any]
+    ) -> tp.Optional[WatchlistEvent]:
+        row = self._rows[symbol]
+        changes = {}
+        for column, value in values.items():
+            col = self._columns[column]
+            old = self.df.iat[row, col]
+            if column in _NUMERIC_COLUMNS:
+                value = np.nan if value is None else float(value)
+            if not _equal(old, value):
+                self.df.iat[row, col] = value
+                changes[column] = (old, value)
+        return WatchlistEvent(symbol, changes) if changes else None
+
+    async def _price(
+        self, symbol: str, client: httpx.AsyncClient
+    ) -> tp.Optional[float]:
+        try:
+            response = await fetch(
+                client,
+                Bars.base_uri(symbol),
+                params=Bars.params(interval="1d", period="1d"),
+            )
+            return get_latest_price_from_chart(json.loads(response.content))
+        except (httpx.HTTPError, ValueError) as error:
+            logging.getLogger(__name__).warning(
+                f"Couldn't refresh the price of {symbol}: {error!r}"
+            )
+            return None
+
+    async def _asset(
+        self, symbol: str, client: httpx.AsyncClient
+    ) -> tp.Optional[Asset]:
+        try:
+            return await Asset.get(symbol, client=client, validate=self.validate)
+        except (httpx.HTTPError, ValueError) as error:
+            logging.getLogger(__name__).warning(
+                f"Couldn't refresh the asset {symbol}: {error!r}"
+            )
+            return None
+
+    async def refresh(
+        self,
+        *,
+        client: tp.Optional[httpx.AsyncClient] = None,
+        now: tp.Optional[float] = None,
+    ) -> tp.List[WatchlistEvent]:
+        """Refresh the symbols that are due, returns the events of the rows that
+        changed (also sent to the subscribers)."""
+        now = time.monotonic() if now is None else now
+        fundamentals = self.due("fundamentals", now)
+        # the quote pages also have the price
+        prices = [
+            symbol for symbol in self.due("price", now) if symbol not in fundamentals
+        ]
+        if not fundamentals and not prices:
+            return []
+
+        with span(
+            "watchlist.refresh", prices=len(prices), fundamentals=len(fundamentals)
+        ):
+            with use_controller(self.concurrency):
+                async with httpx_client_manager(client=client) as _client:
+                    async with asyncer.create_task_group() as tg:
+                        soon_prices = [
+                            tg.soonify(self._price)(symbol, _client)
+                            for symbol in prices
+                        ]
+                        soon_assets = [
+                            tg.soonify(self._asset)(symbol, _client)
+                            for symbol in fundamentals
+                        ]
+
+            updates: tp.Dict[str, tp.Dict[str, tp.Any]] = {}
+            for symbol, soon_price in zip(prices, soon_prices):
+                if soon_price.value is not None:
+                    updates[symbol] = {"latest_price": soon_price.value}
+            for symbol, soon_asset in zip(fundamentals, soon_assets):
+                if soon_asset.value is not None:
+                    self.assets[symbol] = soon_asset.value
+                    updates[symbol] = get_asset_row(soon_asset.value)
+
+            events = []
+            for symbol, values in updates.items():
+                event = self._update(symbol, values)
+                if event is not None:
+                    events.append(event)
+
+        # failed symbols are retried at their next refresh as well
+        self._reschedule("price", prices + fundamentals, now)
+        self._reschedule("fundamentals", fundamentals, now)
+        for event in events:
+            for callback in self._callbacks:
+                callback(event)
+        return events
+
+    async def run(self, *, client: tp.Optional[httpx.AsyncClient] = None) -> None:
+        """Refresh the watchlist forever (until cancelled)."""
+        async with httpx_client_manager(client=client) as _client:
+            while True:
+                await self.refresh(client=_client)
+                await anyio.sleep(max(0.0, self.next_due() - time.monotonic()))
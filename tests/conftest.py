@@ -1,4 +1,5 @@
 import pickle
+import typing as tp
 from pathlib import Path
 
 import pendulum
@@ -7,6 +8,11 @@ from httpx import Response
 from pytest_cases import case, fixture, parametrize_with_cases
 
 
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
 @pytest.fixture
 def pendulum_now():
     now = pendulum.now()
@@ -15,6 +21,50 @@ def pendulum_now():
     pendulum.set_test_now()
 
 
+def _chart(
+    timestamps: tp.List[int], granularity: str, timezone: str, gmtoffset: int
+) -> tp.Dict[str, tp.Any]:
+    return {
+        "chart": {
+            "result": [
+                {
+                    "meta": {
+                        "symbol": "TEST",
+                        "dataGranularity": granularity,
+                        "exchangeTimezoneName": timezone,
+                        "gmtoffset": gmtoffset,
+                    },
+                    "timestamp": timestamps,
+                    "indicators": {
+                        "quote": [
+                            {
+                                "open": [1, 2],
+                                "high": [1, 2],
+                                "low": [1, None],
+                                "close": [1, 2],
+                                "volume": [10, 20],
+                            }
+                        ],
+                        "adjclose": [{"adjclose": [1, 2]}],
+                    },
+                }
+            ],
+            "error": None,
+        }
+    }
+
+
+@pytest.fixture
+def daily_chart() -> tp.Dict[str, tp.Any]:
+    # 2022-01-04 & 2022-01-05 09:00 in Tokyo, still the previous day in UTC
+    return _chart([1641254400, 1641340800], "1d", "Asia/Tokyo", 32400)
+
+
+@pytest.fixture
+def intraday_chart() -> tp.Dict[str, tp.Any]:
+    return _chart([1641254400, 1641254460], "1m", "Asia/Tokyo", 32400)
+
+
 class QuoteResponseCases:
     def _load_response(self, filename: str) -> Response:
         with open(Path(__file__).parent / "data" / filename, "rb") as f:
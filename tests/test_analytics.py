@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pstock import analytics
+from pstock.bar import Bars, BarsMulti
+
+
+@pytest.fixture
+def bars() -> BarsMulti:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2022-01-03", periods=60, freq="D", tz="UTC")
+    data = {}
+    for idx, symbol in enumerate(["A", "B", "C", "D", "E"]):
+        prices = 100 * np.cumprod(1 + rng.normal(0, 0.02, len(dates)))
+        # symbols listed later / with gaps
+        keep = np.arange(len(dates)) >= idx * 3
+        keep[20 + idx] = False
+        data[symbol] = Bars.parse_obj(
+            [
+                dict(
+                    date=date,
+                    open=price,
+                    high=price,
+                    low=price,
+                    close=price,
+                    adj_close=price,
+                    volume=1000,
+                    interval=86400,
+                )
+                for date, price in zip(dates[keep], prices[keep])
+            ]
+        )
+    return BarsMulti.parse_obj(data)
+
+
+def _prices(bars: BarsMulti) -> pd.DataFrame:
+    return bars.df.xs("adj_close", axis=1, level=1)
+
+
+def test_get_panel(bars: BarsMulti):
+    panel = analytics.get_panel(bars)
+    assert panel.symbols == ["A", "B", "C", "D", "E"]
+    pd.testing.assert_frame_equal(
+        panel.to_frame(), _prices(bars), check_names=False, check_freq=False
+    )
+    chunks = list(analytics.iter_panels(bars, chunk_size=2))
+    assert [chunk.symbols for chunk in chunks] == [["A", "B"], ["C", "D"], ["E"]]
+    np.testing.assert_array_equal(
+        np.hstack([chunk.values for chunk in chunks]), panel.values
+    )
+
+
+def test_kernels_match_pandas(bars: BarsMulti):
+    prices = _prices(bars)
+    rets = analytics.returns(prices.to_numpy())
+    expected = prices / prices.shift(1) - 1
+    np.testing.assert_allclose(rets, expected.to_numpy())
+
+    vol = analytics.rolling_volatility(rets, window=10, min_periods=5)
+    expected_vol = expected.rolling(10, min_periods=5).std()
+    np.testing.assert_allclose(vol, expected_vol.to_numpy(), atol=1e-10)
+
+    dd = analytics.drawdowns(prices.to_numpy())
+    expected_dd = prices / prices.cummax() - 1
+    np.testing.assert_allclose(dd, expected_dd.to_numpy())
+    np.testing.assert_allclose(
+        analytics.max_drawdowns(prices.to_numpy()), expected_dd.min().to_numpy()
+    )
+
+    np.testing.assert_allclose(
+        analytics.correlation(rets), expected.corr().to_numpy(), atol=1e-10
+    )
+
+
+def test_chunked_matches_in_memory(bars: BarsMulti):
+    pd.testing.assert_frame_equal(
+        analytics.correlation_matrix(bars, chunk_size=2),
+        analytics.correlation_matrix(bars),
+    )
+    summary = analytics.summary(bars)
+    pd.testing.assert_frame_equal(analytics.summary(bars, chunk_size=3), summary)
+    prices = _prices(bars)
+    np.testing.assert_allclose(
+        summary["volatility"], prices.pct_change(fill_method=None).std() * np.sqrt(252)
+    )
@@ -0,0 +1,46 @@
+import pickle
+import typing as tp
+from pathlib import Path
+
+import httpx
+import pandas as pd
+import pytest
+
+from pstock.asset import Asset, Assets, build_tables
+
+
+def _load_response(filename: str) -> httpx.Response:
+    with open(Path(__file__).parent / "data" / filename, "rb") as f:
+        return pickle.load(f)
+
+
+@pytest.fixture(scope="module")
+def equity_data() -> tp.Dict[str, tp.Any]:
+    return Asset.extract(
+        response=_load_response("EQUITY-quote.obj"),
+        financials_response=_load_response("EQUITY-financials.obj"),
+    )
+
+
+def test_assets_tables(equity_data: tp.Dict[str, tp.Any]):
+    assets = Assets.parse_obj(
+        [{**equity_data, "symbol": symbol} for symbol in ("b", "a")]
+    )
+    df = assets.df
+    assert list(df.index) == ["A", "B"]
+    assert df["latest_price"].dtype == "float64"
+    assert not {"earnings", "trends", "income_statement"} & set(df.columns)
+
+    earnings = assets.earnings_df
+    assert earnings.index.names == ["symbol", "quarter"]
+    assert earnings.loc["B"].equals(assets[0].earnings.df)
+    trends = assets.trends_df
+    assert trends.index.names == ["symbol", "date"]
+    assert trends.loc["A"].equals(assets[1].trends.df)
+    income_statements = assets.income_statements_df
+    assert income_statements.loc["A"].equals(assets[1].income_statement.df)
+
+    # the same tables straight from the extracted dicts, without the models
+    tables = build_tables([{**equity_data, "symbol": symbol} for symbol in "ba"])
+    for name, table in assets.tables.items():
+        pd.testing.assert_frame_equal(tables[name], table)
@@ -0,0 +1,208 @@
+import typing as tp
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+
+from pstock.adjustment import adjust, get_adjustment_factors
+from pstock.bar import Bars, BarsMulti
+from pstock.cache import BarsCache
+from pstock.testing import ReplayTransport
+
+
+@pytest.mark.parametrize(
+    "tz,expected",
+    [
+        ("utc", pd.DatetimeIndex(["2022-01-04", "2022-01-05"], tz="UTC")),
+        ("exchange", pd.DatetimeIndex(["2022-01-04", "2022-01-05"], tz="Asia/Tokyo")),
+    ],
+)
+@pytest.mark.parametrize("validate", [True, False])
+def test_bars_daily_dates(
+    daily_chart: tp.Dict[str, tp.Any],
+    tz: str,
+    expected: pd.DatetimeIndex,
+    validate: bool,
+):
+    bars = Bars.load(response=daily_chart, tz=tz, validate=validate)
+    assert bars.df.index.equals(expected.rename("date"))
+    assert bars.df["low"].isna().tolist() == [False, True]
+
+
+def test_bars_load_trusted(daily_chart: tp.Dict[str, tp.Any]):
+    result = daily_chart["chart"]["result"][0]
+    result["timestamp"].append(1641427200)
+    for values in [
+        *result["indicators"]["quote"][0].values(),
+        *result["indicators"]["adjclose"][0].values(),
+    ]:
+        values.append(None)
+
+    validated = Bars.load(response=daily_chart)
+    trusted = Bars.load(response=daily_chart, validate=False)
+    assert len(trusted) == len(validated) == 3
+    pd.testing.assert_frame_equal(trusted.df, validated.df)
+    pd.testing.assert_frame_equal(trusted.df, trusted.gen_df())
+    assert len(trusted.df) == 2
+
+
+def test_bars_intraday_dates(intraday_chart: tp.Dict[str, tp.Any]):
+    utc = Bars.load(response=intraday_chart).df.index
+    exchange = Bars.load(response=intraday_chart, tz="exchange").df.index
+    assert str(utc.tz) == "UTC"
+    assert str(exchange.tz) == "Asia/Tokyo"
+    assert (utc == exchange).all()
+    assert exchange[0].hour == 9
+
+
+@pytest.fixture
+def events_chart() -> tp.Dict[str, tp.Any]:
+    # 2022-01-03 to 2022-01-06 09:00 in Tokyo
+    timestamps = [1641168000 + day * 86400 for day in range(4)]
+    closes = [10.0, 10.0, 20.0, 20.0]
+    return {
+        "chart": {
+            "result": [
+                {
+                    "meta": {
+                        "symbol": "TEST",
+                        "dataGranularity": "1d",
+                        "exchangeTimezoneName": "Asia/Tokyo",
+                    },
+                    "timestamp": timestamps,
+                    "events": {
+                        "splits": {
+                            str(timestamps[3]): {
+                                "date": timestamps[3],
+                                "numerator": 2,
+                                "denominator": 1,
+                                "splitRatio": "2:1",
+                            }
+                        },
+                        "dividends": {
+                            str(timestamps[2]): {"date": timestamps[2], "amount": 1.0}
+                        },
+                    },
+                    "indicators": {
+                        "quote": [
+                            {
+                                "open": closes,
+                                "high": closes,
+                                "low": closes,
+                                "close": closes,
+                                "volume": [100, 100, 100, 100],
+                            }
+                        ],
+                    },
+                }
+            ],
+            "error": None,
+        }
+    }
+
+
+@pytest.mark.parametrize("tz", ["utc", "exchange"])
+def test_bars_events(events_chart: tp.Dict[str, tp.Any], tz: str):
+    bars = Bars.load(response=events_chart, tz=tz)
+    assert bars.dividends.index.equals(bars.df.index[[2]])
+    assert bars.dividends["amount"].tolist() == [1.0]
+    assert bars.splits.index.equals(bars.df.index[[3]])
+    assert bars.splits[["numerator", "denominator"]].values.tolist() == [[2.0, 1.0]]
+
+    loaded = Bars.from_bytes(bars.to_bytes())
+    assert loaded.dividends.equals(bars.dividends)
+    assert loaded.splits.equals(bars.splits)
+
+
+def test_bars_adjusted(events_chart: tp.Dict[str, tp.Any]):
+    bars = Bars.load(response=events_chart)
+    # 1 - 1 / 10 before the dividend, / 2 before the split
+    assert bars.adjusted()["close"].tolist() == pytest.approx([9, 9, 20, 20])
+    adjusted = bars.adjusted(splits=True)
+    assert adjusted["close"].tolist() == pytest.approx([4.5, 4.5, 10, 20])
+    assert adjusted["volume"].tolist() == pytest.approx([200, 200, 200, 100])
+    assert bars.df["close"].tolist() == [10, 10, 20, 20]
+
+    # new events can be applied on top of already adjusted bars
+    df = bars.df
+    first = adjust(
+        df, get_adjustment_factors(df.index, df["close"], dividends=bars.dividends)
+    )
+    second = adjust(
+        first,
+        get_adjustment_factors(
+            first.index, first["close"], splits=bars.splits, adjust_splits=True
+        ),
+    )
+    pd.testing.assert_frame_equal(second, adjusted)
+
+    assert Bars.parse_obj([]).adjusted().empty
+    assert Bars.parse_obj([]).dividends.empty
+
+
+@pytest.fixture
+def spark_chart(daily_chart: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Any]:
+    result = daily_chart["chart"]["result"][0]
+    response = {
+        "meta": result["meta"],
+        "timestamp": result["timestamp"] + [1641427200],
+        "indicators": {"quote": [{"close": [1, 2, None]}]},
+    }
+    return {
+        "spark": {
+            "result": [{"symbol": "TEST", "response": [response]}],
+            "error": None,
+        }
+    }
+
+
+@pytest.mark.anyio
+async def test_bars_multi_spark(
+    daily_chart: tp.Dict[str, tp.Any], spark_chart: tp.Dict[str, tp.Any]
+):
+    transport = ReplayTransport(spark=spark_chart, symbol="TEST")
+    symbols = [f"S{idx}" for idx in range(45)]
+    cache = BarsCache()
+    async with httpx.AsyncClient(transport=transport) as client:
+        multi = await BarsMulti.get(
+            symbols, interval="1d", client=client, spark=True, cache=cache
+        )
+        assert transport.stats.requests == 3
+        assert list(multi) == symbols
+
+        # the cached symbols are not fetched again
+        multi = await BarsMulti.get(
+            ["s0", "S45"], interval="1d", client=client, spark=True, cache=cache
+        )
+        assert transport.stats.requests == 4
+
+    expected = Bars.load(response=daily_chart).df
+    df = multi["s0"].df
+    pd.testing.assert_index_equal(df.index, expected.index)
+    assert df["close"].tolist() == expected["close"].tolist()
+    assert df[["open", "high", "low", "adj_close", "volume"]].isna().all().all()
+    assert (df["interval"] == expected["interval"]).all()
+    assert multi["s0"].dividends.empty
+
+
+def test_bars_multi_load_spark(spark_chart: tp.Dict[str, tp.Any]):
+    multi = BarsMulti.load_spark(response=spark_chart, tz="exchange")
+    assert list(multi) == ["TEST"]
+    assert str(multi["TEST"].df.index.tz) == "Asia/Tokyo"
+    assert multi.df[("TEST", "close")].tolist() == [1, 2]
+    assert np.isnan(multi["TEST"].to_columns()["open"]).all()
+
+    trusted = BarsMulti.load_spark(response=spark_chart, tz="exchange", validate=False)
+    pd.testing.assert_frame_equal(trusted.df, multi.df)
+
+    with pytest.raises(ValueError):
+        BarsMulti.load_spark(response={"spark": {"result": None, "error": "Boom"}})
+
+
+@pytest.mark.anyio
+async def test_bars_multi_spark_missing_symbol(spark_chart: tp.Dict[str, tp.Any]):
+    transport = ReplayTransport(spark=spark_chart)
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(ValueError, match="AAPL"):
+            await BarsMulti.get(["TEST", "AAPL"], client=client, spark=True)
@@ -78,3 +78,24 @@ def test_pstock_base_model_mapping(pendulum_now: pendulum.DateTime):
     assert isinstance(model.df, pd.DataFrame)
     assert model.df["key1"].equals(submodel1.df)
     assert model.df["key2"].equals(submodel2.df)
+
+
+def test_pstock_base_model_trusted(pendulum_now: pendulum.DateTime):
+    class TestModel(BaseModel):
+        col1: int
+        col2: int = 0
+
+    class TestModelSequence(BaseModelSequence[TestModel]):
+        __root__: tp.List[TestModel]
+
+    class TestModelMapping(BaseModelMapping[TestModelSequence]):
+        __root__: tp.Dict[str, TestModelSequence]
+
+    data = {"key1": [{"col1": 1, "col2": 3}, {"col1": 2}]}
+    model = TestModelMapping.trusted(__root__=data)
+
+    assert model.created_at == pendulum_now
+    assert model == TestModelMapping.parse_obj(data)
+    assert isinstance(model["key1"], TestModelSequence)
+    assert isinstance(model["key1"][1], TestModel)
+    assert model["key1"][1].col2 == 0
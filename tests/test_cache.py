@@ -0,0 +1,148 @@
+import typing as tp
+
+import httpx
+import pendulum
+import pytest
+import respx
+
+from pstock import metrics
+from pstock.bar import Bars, BarsMulti
+from pstock.cache import BarsCache
+from pstock.market import TradingSession
+
+# Wednesday 2022-01-05, 09:00 - 15:00 in Tokyo
+REGULAR_START = 1641340800
+REGULAR_END = REGULAR_START + 6 * 3600
+PRE_START = REGULAR_START - 3600
+POST_END = REGULAR_END + 3600
+
+
+def _at(day: int, hour: int, minute: int = 0) -> pendulum.DateTime:
+    return pendulum.datetime(2022, 1, day, hour, minute)
+
+
+@pytest.fixture
+def session() -> TradingSession:
+    return TradingSession(
+        exchange="JPX",
+        timezone="Asia/Tokyo",
+        pre_start=pendulum.from_timestamp(PRE_START),
+        regular_start=pendulum.from_timestamp(REGULAR_START),
+        regular_end=pendulum.from_timestamp(REGULAR_END),
+        post_end=pendulum.from_timestamp(POST_END),
+    )
+
+
+@pytest.fixture
+def chart(daily_chart: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Any]:
+    daily_chart["chart"]["result"][0]["meta"].update(
+        exchangeName="JPX",
+        currentTradingPeriod={
+            "pre": {"start": PRE_START, "end": REGULAR_START},
+            "regular": {"start": REGULAR_START, "end": REGULAR_END},
+            "post": {"start": REGULAR_END, "end": POST_END},
+        },
+    )
+    return daily_chart
+
+
+@pytest.mark.parametrize(
+    "fetched_at, now, include_prepost, fresh",
+    [
+        # open: fresh for max_age
+        (_at(5, 1), _at(5, 1, 0).add(seconds=30), False, True),
+        (_at(5, 1), _at(5, 1, 2), False, False),
+        # fetched while open, not fresh after the close
+        (_at(5, 5, 59), _at(5, 6, 0).add(seconds=1), False, False),
+        # after the close: fresh until the next open
+        (_at(5, 7), _at(5, 23), False, True),
+        (_at(5, 7), _at(6, 0, 1), False, False),
+        # post market is open with include_prepost
+        (_at(5, 6, 30), _at(5, 6, 32), True, False),
+        (_at(5, 6, 30), _at(5, 6, 32), False, True),
+        # before the open
+        (_at(4, 23), _at(4, 23, 59), False, True),
+        (_at(4, 23), _at(5, 0, 1), False, False),
+    ],
+)
+def test_trading_session_is_fresh(
+    session: TradingSession,
+    fetched_at: pendulum.DateTime,
+    now: pendulum.DateTime,
+    include_prepost: bool,
+    fresh: bool,
+):
+    assert session.is_fresh(fetched_at, now, include_prepost=include_prepost) is fresh
+
+
+def test_trading_session_weekend(session: TradingSession):
+    friday = session.copy(
+        update={
+            field: getattr(session, field).add(days=2)
+            for field in ("pre_start", "regular_start", "regular_end", "post_end")
+        }
+    )
+    assert friday.next_open() == _at(10, 0)
+    assert friday.is_fresh(_at(7, 8), _at(9, 12))
+    assert not friday.is_fresh(_at(7, 8), _at(10, 0, 1))
+
+
+def test_trading_session_always_open():
+    session = TradingSession(
+        pre_start=_at(5, 0),
+        regular_start=_at(5, 0),
+        regular_end=_at(5, 23, 59),
+        post_end=_at(5, 23, 59),
+    )
+    assert session.always_open
+    assert session.is_open(_at(8, 12))
+    assert session.is_fresh(_at(5, 1), _at(5, 1).add(seconds=30))
+    assert not session.is_fresh(_at(5, 1), _at(5, 1, 2))
+
+
+def test_bars_session(chart: tp.Dict[str, tp.Any], session: TradingSession):
+    bars = Bars.load(response=httpx.Response(200, json=chart))
+    assert bars.session == session
+
+
+@respx.mock
+@pytest.mark.anyio
+async def test_bars_cache(chart: tp.Dict[str, tp.Any]):
+    route = respx.get(url__startswith=Bars.base_uri("")).mock(
+        return_value=httpx.Response(200, json=chart)
+    )
+    cache = BarsCache()
+    metrics.enable()
+    try:
+        pendulum.set_test_now(_at(5, 7))
+        bars = await Bars.get("TSLA", interval="1d", cache=cache)
+        pendulum.set_test_now(_at(5, 23))
+        assert await Bars.get("tsla", interval="1d", cache=cache) is bars
+        assert route.call_count == 1
+
+        multi = await BarsMulti.get(["TSLA", "AAPL"], interval="1d", cache=cache)
+        assert multi["TSLA"] == bars
+        assert route.call_count == 2
+
+        # next open
+        pendulum.set_test_now(_at(6, 0, 1))
+        await Bars.get("TSLA", interval="1d", cache=cache)
+        assert route.call_count == 3
+        snapshot = metrics.snapshot()
+    finally:
+        pendulum.set_test_now()
+        metrics.disable()
+        metrics.reset()
+
+    labels = {"cache": "bars"}
+    assert snapshot["cache_hits_total"] == [{"labels": labels, "value": 2}]
+    assert snapshot["cache_misses_total"] == [{"labels": labels, "value": 3}]
+
+
+def test_bars_cache_eviction(chart: tp.Dict[str, tp.Any]):
+    cache = BarsCache(maxsize=2)
+    bars = Bars.load(response=httpx.Response(200, json=chart))
+    for symbol in ("A", "B", "C"):
+        cache.put(cache.key(symbol, interval="1d"), bars)
+    assert len(cache) == 2
+    assert cache.get(cache.key("A", interval="1d")) is None
@@ -0,0 +1,69 @@
+import json
+import typing as tp
+from pathlib import Path
+
+import httpx
+import pandas as pd
+import pytest
+import respx
+
+from pstock.bar import Bars
+from pstock.cli import main
+
+
+@respx.mock
+def test_cli_fetch_bars_resume(tmp_path: Path, daily_chart: tp.Dict[str, tp.Any]):
+    symbols = tmp_path / "symbols.txt"
+    symbols.write_text("tsla\nAAPL # comment\n\nTSLA\n")
+    output = tmp_path / "output"
+    argv = [
+        "fetch",
+        "bars",
+        "--symbols",
+        str(symbols),
+        "--output",
+        str(output),
+        "--format",
+        "csv",
+        "--interval",
+        "1d",
+        "--period",
+        "5d",
+    ]
+    tsla = respx.get(Bars.base_uri("TSLA")).mock(
+        return_value=httpx.Response(200, json=daily_chart)
+    )
+    aapl = respx.get(Bars.base_uri("AAPL")).mock(
+        return_value=httpx.Response(404, json={"chart": {"error": "Not Found"}})
+    )
+
+    assert main(argv) == 1
+    bars = pd.read_csv(output / "bars" / "symbol=TSLA" / "bars.csv")
+    assert len(bars) == 2
+    assert not (output / "bars" / "symbol=AAPL").exists()
+
+    aapl.mock(return_value=httpx.Response(200, json=daily_chart))
+    assert main(argv) == 0
+    assert tsla.call_count == 1
+    assert aapl.call_count == 2
+    assert (output / "bars" / "symbol=AAPL" / "bars.csv").exists()
+
+    records = [
+        json.loads(line)
+        for line in (output / "bars" / "manifest.jsonl").read_text().splitlines()
+    ]
+    assert records[0]["params"]["interval"] == "1d"
+    statuses = [(record["symbol"], record["status"]) for record in records[1:]]
+    assert sorted(statuses[:2]) == [("AAPL", "failed"), ("TSLA", "done")]
+    assert statuses[2:] == [("AAPL", "done")]
+
+
+@pytest.mark.parametrize("concurrency", ["0", "-1", "two"])
+def test_cli_invalid_concurrency(
+    tmp_path: Path, capsys: pytest.CaptureFixture, concurrency: str
+):
+    argv = ["fetch", "bars", "--symbols", "-", "--output", str(tmp_path)]
+    with pytest.raises(SystemExit) as exc_info:
+        main([*argv, "--concurrency", concurrency])
+    assert exc_info.value.code == 2
+    assert "--concurrency" in capsys.readouterr().err
@@ -0,0 +1,125 @@
+import pickle
+import typing as tp
+from datetime import timedelta
+from pathlib import Path
+
+import anyio
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+
+from pstock import compact
+from pstock.asset import Asset, Assets
+from pstock.bar import Bars, BarsMulti
+
+
+def _load_response(filename: str) -> httpx.Response:
+    with open(Path(__file__).parent / "data" / filename, "rb") as f:
+        return pickle.load(f)
+
+
+@pytest.fixture
+def large_chart(daily_chart: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Any]:
+    size = 10_000
+    result = daily_chart["chart"]["result"][0]
+    result["timestamp"] = (1641254400 + 86400 * np.arange(size)).tolist()
+    prices = np.linspace(100, 200, size).tolist()
+    result["indicators"] = {
+        "quote": [
+            {
+                "open": prices,
+                "high": prices,
+                "low": prices,
+                "close": prices,
+                "volume": np.arange(size).tolist(),
+            }
+        ],
+        "adjclose": [{"adjclose": prices}],
+    }
+    return daily_chart
+
+
+def test_compact_bars(large_chart: tp.Dict[str, tp.Any]):
+    bars = Bars.load(response=large_chart)
+    with compact.compact_mode():
+        compact_bars = Bars.load(response=large_chart)
+        df = compact_bars.df
+    assert not compact.enabled()
+
+    assert "interval" not in df
+    assert df.attrs["interval"] == timedelta(days=1)
+    assert df["close"].dtype == "float32"
+    assert df["volume"].dtype == "uint16"
+    assert df["close"].to_numpy() == pytest.approx(bars.df["close"].to_numpy())
+    assert df.memory_usage(deep=True).sum() <= bars.df.memory_usage(deep=True).sum() / 2
+
+    # the compact frame is still a valid input of the rest of the library
+    pd.testing.assert_frame_equal(
+        Bars.from_columns(compact_bars.to_columns()).df, bars.df, rtol=1e-6
+    )
+
+
+def test_compact_bars_multi(daily_chart: tp.Dict[str, tp.Any]):
+    weekly = Bars.load(response=daily_chart)
+    weekly.df["interval"] = pd.Timedelta(weeks=1)
+    with compact.compact_mode():
+        multi = BarsMulti.trusted(
+            __root__={"A": Bars.load(response=daily_chart), "B": weekly}
+        )
+        df = multi.df
+    assert {column for _, column in df.columns} == {
+        "open",
+        "high",
+        "low",
+        "close",
+        "adj_close",
+        "volume",
+    }
+    assert df.attrs["interval"] == {"A": timedelta(days=1), "B": timedelta(weeks=1)}
+
+
+def test_compact_missing_volumes():
+    df = compact.compact(pd.DataFrame({"volume": [1.0, np.nan, 70000.0]}))
+    assert df["volume"].dtype == "UInt32"
+    assert df["volume"].isna().tolist() == [False, True, False]
+
+
+def test_compact_assets():
+    data = Asset.extract(
+        response=_load_response("EQUITY-quote.obj"),
+        financials_response=_load_response("EQUITY-financials.obj"),
+    )
+    with compact.compact_mode():
+        assets = Assets.parse_obj(
+            [{**data, "symbol": symbol} for symbol in ("A", "B", "C")]
+        )
+        df = assets.df
+        trends = assets.trends_df
+    assert df["sector"].dtype == "category"
+    assert df["currency"].dtype == "category"
+    assert df["latest_price"].dtype == "float32"
+    assert trends["recomendation"].dtype == "category"
+    assert trends["strong_buy"].dtype == "uint8"
+
+
+@pytest.mark.anyio
+async def test_compact_mode_is_scoped_to_the_task():
+    seen: tp.Dict[bool, tp.List[bool]] = {}
+
+    async def _check(enable: bool) -> None:
+        with compact.compact_mode(enable):
+            seen[enable] = [compact.enabled()]
+            await anyio.sleep(0.01)
+            seen[enable].append(compact.enabled())
+
+    compact.enable()
+    try:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(_check, True)
+            tg.start_soon(_check, False)
+        assert compact.enabled()
+    finally:
+        compact.disable()
+    assert seen == {True: [True, True], False: [False, False]}
+    assert not compact.enabled()
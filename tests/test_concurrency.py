@@ -0,0 +1,90 @@
+import anyio
+import httpx
+import pytest
+import respx
+
+from pstock.concurrency import AIMDController, current_controller, use_controller
+from pstock.utils.utils import fetch
+
+
+def test_aimd_controller_report():
+    controller = AIMDController(initial=4, min_limit=1, max_limit=5)
+    for _ in range(5):
+        controller.report("host", status_code=200, latency=0.1)
+    assert controller.limit("host") == 5
+    for _ in range(20):
+        controller.report("host", status_code=200, latency=0.1)
+    assert controller.limit("host") == 5
+
+    controller.report("host", status_code=429, latency=0.1)
+    assert controller.limit("host") == 2
+    # latency spike
+    controller.report("host", status_code=200, latency=1.0)
+    assert controller.limit("host") == 1
+    assert controller.limit("other-host") == 4
+
+
+def test_aimd_controller_single_decrease_per_congestion():
+    controller = AIMDController(initial=8)
+    controller.report("host", status_code=503, latency=0.1, started_at=0.0)
+    controller.report("host", status_code=503, latency=0.1, started_at=0.0)
+    assert controller.limit("host") == 4
+
+
+@pytest.mark.anyio
+async def test_aimd_controller_slot():
+    controller = AIMDController(initial=2, max_limit=2)
+    max_in_flight = 0
+
+    async def request():
+        nonlocal max_in_flight
+        async with controller.slot("host"):
+            max_in_flight = max(max_in_flight, controller.in_flight("host"))
+            await anyio.sleep(0.01)
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(6):
+            tg.start_soon(request)
+
+    assert max_in_flight == 2
+    assert controller.in_flight("host") == 0
+
+
+def test_use_controller():
+    controller = AIMDController()
+    with use_controller(controller):
+        assert current_controller() is controller
+        with use_controller(None):
+            assert current_controller() is controller
+    assert current_controller() is None
+
+
+@respx.mock
+@pytest.mark.anyio
+async def test_fetch_retries_throttled_requests():
+    route = respx.get("https://example.com/").mock(
+        side_effect=[httpx.Response(429), httpx.Response(503), httpx.Response(200)]
+    )
+    controller = AIMDController(initial=8, backoff=0)
+    async with httpx.AsyncClient() as client:
+        with use_controller(controller):
+            response = await fetch(client, "https://example.com/")
+    assert response.status_code == 200
+    assert route.call_count == 3
+    assert controller.limit("example.com") == 2
+
+
+@respx.mock
+@pytest.mark.anyio
+async def test_fetch_without_retries():
+    route = respx.get("https://example.com/").mock(
+        side_effect=[httpx.Response(429), httpx.ConnectError("boom")]
+    )
+    controller = AIMDController(backoff=0, max_retries=0)
+    async with httpx.AsyncClient() as client:
+        with use_controller(controller):
+            response = await fetch(client, "https://example.com/")
+            assert response.status_code == 429
+            with pytest.raises(httpx.ConnectError):
+                await fetch(client, "https://example.com/")
+    assert route.call_count == 2
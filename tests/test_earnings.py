@@ -1,7 +1,8 @@
 import httpx
+import numpy as np
 import pandas as pd
 
-from pstock.earnings import Earnings
+from pstock.earnings import Earnings, _get_status, get_statuses
 
 
 def test_earnings(main_quote_response: httpx.Response, snapshot):
@@ -9,3 +10,36 @@ def test_earnings(main_quote_response: httpx.Response, snapshot):
     assert earnings.dict() == snapshot(name="pydantic-model")
     assert isinstance(earnings.df, pd.DataFrame)
     assert earnings.df.to_dict() == snapshot(name="pandas-dataframe")
+
+
+def test_earnings_trusted(main_quote_response: httpx.Response):
+    earnings = Earnings.load(response=main_quote_response)
+    trusted = Earnings.load(response=main_quote_response, validate=False)
+    assert trusted.dict() == earnings.dict()
+    assert trusted.df.equals(earnings.df)
+
+
+def test_get_statuses():
+    estimates = [1.0, 2.0, np.nan, 1.0]
+    actuals = [1.5, 1.0, 1.0, np.nan]
+    statuses = get_statuses(estimates, actuals)
+    assert list(statuses) == [
+        _get_status(estimate, actual) for estimate, actual in zip(estimates, actuals)
+    ]
+    assert list(statuses) == ["Beat", "Missed", None, None]
+
+
+def test_earnings_sorted_by_quarter():
+    raw = [
+        dict(quarter=quarter, estimate=1, actual=2, revenue=0, earnings=0)
+        for quarter in ["1Q2022", "3Q2021", "4Q2021"]
+    ]
+    for earnings in (Earnings.parse_obj(raw), Earnings.trusted(__root__=raw)):
+        assert [earning.quarter for earning in earnings] == [
+            "3Q2021",
+            "4Q2021",
+            "1Q2022",
+        ]
+        assert all(earning.status == "Beat" for earning in earnings)
+    # the raw dicts are not modified
+    assert all("status" not in earning for earning in raw)
@@ -0,0 +1,73 @@
+import typing as tp
+from contextlib import contextmanager
+
+import httpx
+import pytest
+
+from pstock import instrumentation
+from pstock.earnings import Earnings
+
+
+@pytest.fixture
+def events() -> tp.Iterator[tp.List[instrumentation.SpanEvent]]:
+    _events: tp.List[instrumentation.SpanEvent] = []
+    instrumentation.add_hook(_events.append)
+    yield _events
+    instrumentation.remove_hook(_events.append)
+
+
+def test_span_disabled():
+    assert not instrumentation.enabled()
+    with instrumentation.span("test", symbol="TSLA") as tags:
+        tags["bytes"] = 10
+    assert tags == {"symbol": "TSLA", "bytes": 10}
+
+
+def test_span_hook(events: tp.List[instrumentation.SpanEvent]):
+    with instrumentation.span("parent", symbol="TSLA"):
+        with instrumentation.span("child") as tags:
+            tags["bytes"] = 10
+    with pytest.raises(ValueError):
+        with instrumentation.span("error"):
+            raise ValueError()
+
+    assert [event.name for event in events] == ["child", "parent", "error"]
+    assert events[0].tags == {"symbol": "TSLA", "bytes": 10}
+    assert events[0].duration <= events[1].duration
+    assert events[2].tags == {"symbol": None}
+    assert isinstance(events[2].error, ValueError)
+
+
+def test_span_tracer():
+    spans: tp.List[tp.Tuple[str, tp.Dict[str, tp.Any]]] = []
+
+    class Span:
+        def set_attributes(self, attributes):
+            spans.append((name, attributes))
+
+    class Tracer:
+        @contextmanager
+        def start_as_current_span(self, _name: str):
+            nonlocal name
+            name = _name
+            yield Span()
+
+    name = ""
+    instrumentation.set_tracer(Tracer())
+    try:
+        with instrumentation.span("test", symbol="TSLA", model=object()):
+            pass
+    finally:
+        instrumentation.set_tracer(None)
+    assert spans == [("test", {"pstock.symbol": "TSLA"})]
+
+
+def test_earnings_load_spans(
+    main_quote_response: httpx.Response, events: tp.List[instrumentation.SpanEvent]
+):
+    earnings = Earnings.load(response=main_quote_response)
+    earnings.df
+    names = [event.name for event in events]
+    assert names[:2] == ["json.loads", "quote.parse"]
+    assert names[-2:] == ["quote_summary.load", "gen_df"]
+    assert "validate" in names
@@ -0,0 +1,59 @@
+import typing as tp
+
+import httpx
+import pytest
+import respx
+
+from pstock import metrics
+from pstock.bar import Bars
+from pstock.instrumentation import span
+
+
+@pytest.fixture
+def registry() -> tp.Iterator[metrics.MetricsRegistry]:
+    metrics.enable()
+    yield metrics.registry
+    metrics.disable()
+    metrics.reset()
+
+
+def test_metrics_disabled():
+    with span("http.get", host="example.com", status_code=200, bytes=10):
+        pass
+    metrics.increment("cache_hits_total", cache="bars")
+    assert metrics.snapshot() == {}
+
+
+@respx.mock
+@pytest.mark.anyio
+async def test_metrics_bars_get(registry: metrics.MetricsRegistry):
+    respx.get(Bars.base_uri("TSLA")).mock(
+        return_value=httpx.Response(429, json={"chart": {"result": None}})
+    )
+    with pytest.raises(ValueError):
+        await Bars.get("TSLA", interval="1d")
+
+    snapshot = metrics.snapshot()
+    host = {"host": "query2.finance.yahoo.com"}
+    assert snapshot["requests_total"] == [
+        {"labels": {**host, "status_code": "429"}, "value": 1}
+    ]
+    assert snapshot["throttled_total"] == [{"labels": host, "value": 1}]
+    assert snapshot["fetches_total"] == [{"labels": {"kind": "bars"}, "value": 1}]
+    assert snapshot["fetch_errors_total"] == [{"labels": {"kind": "bars"}, "value": 1}]
+    assert snapshot["request_duration_seconds"][0]["count"] == 1
+    assert {item["labels"]["stage"] for item in snapshot["parse_duration_seconds"]} == {
+        "json.loads",
+        "process",
+    }
+
+    text = metrics.to_prometheus()
+    assert "# TYPE pstock_requests_total counter" in text
+    assert (
+        'pstock_requests_total{host="query2.finance.yahoo.com",status_code="429"} 1'
+        in text
+    )
+    assert 'pstock_request_duration_seconds{host="query2.finance.yahoo.com",' in text
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
@@ -0,0 +1,102 @@
+import typing as tp
+
+import httpx
+import pytest
+import respx
+
+from pstock.news import News, NewsMulti, NewsPoller
+
+
+def _rss(items: tp.List[tp.Tuple[str, str]]) -> str:
+    entries = "".join(
+        f"""
+        <item>
+            <title>{title}</title>
+            <link>https://finance.yahoo.com/news/{guid}.html</link>
+            <description>Summary of {title}</description>
+            <guid isPermaLink="false">{guid}</guid>
+            <pubDate>Tue, 15 Feb 2022 1{idx}:00:00 +0000</pubDate>
+        </item>"""
+        for idx, (guid, title) in enumerate(items)
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+    <rss version="2.0"><channel><title>Yahoo! Finance</title>{entries}</channel></rss>
+    """
+
+
+TSLA_RSS = _rss([("tsla-1", "Tesla news"), ("common-1", "Market news")])
+AAPL_RSS = _rss([("common-1", "Market news"), ("aapl-1", "Apple news")])
+
+
+def test_news_load():
+    news = News.load(response=TSLA_RSS)
+    assert len(news) == 2
+    assert news[0].guid == "tsla-1"
+    assert news[0].date.isoformat() == "2022-02-15T10:00:00+00:00"
+    assert news.df.index.is_monotonic_increasing
+
+
+@pytest.mark.parametrize("validate", [True, False])
+def test_news_multi_load(validate: bool):
+    news = NewsMulti.load(
+        responses={"TSLA": TSLA_RSS, "AAPL": AAPL_RSS}, validate=validate
+    )
+    assert [publication.guid for publication in news] == [
+        "tsla-1",
+        "common-1",
+        "aapl-1",
+    ]
+    assert news[1].symbols == ["TSLA", "AAPL"]
+    assert list(news.df.columns) == ["title", "url", "summary", "guid", "symbols"]
+
+
+@respx.mock
+@pytest.mark.anyio
+async def test_news_multi_get():
+    route = respx.get(News.base_uri())
+    route.side_effect = lambda request: httpx.Response(
+        200, text=TSLA_RSS if request.url.params["s"] == "TSLA" else AAPL_RSS
+    )
+    news = await NewsMulti.get(["tsla", "aapl"])
+    assert route.call_count == 2
+    assert len(news) == 3
+    assert news[1].symbols == ["TSLA", "AAPL"]
+
+
+@pytest.mark.parametrize("parser", ["feedparser", "stream"])
+def test_news_load_parsers(parser: str):
+    news = News.load(response=TSLA_RSS, parser=parser)
+    assert [(p.guid, p.title, p.url, p.date) for p in news] == [
+        (p.guid, p.title, p.url, p.date) for p in News.load(response=TSLA_RSS)
+    ]
+
+
+def test_news_load_stream_without_date():
+    content = TSLA_RSS.replace("<pubDate>Tue, 15 Feb 2022 10:00:00 +0000</pubDate>", "")
+    news = News.load(response=content, parser="stream", validate=False)
+    assert [publication.guid for publication in news] == ["common-1"]
+
+
+@respx.mock
+@pytest.mark.anyio
+@pytest.mark.parametrize("parser", ["feedparser", "stream"])
+async def test_news_poller(parser: str):
+    responses = [
+        httpx.Response(200, text=TSLA_RSS, headers={"etag": '"v1"'}),
+        httpx.Response(304),
+        httpx.Response(200, text=_rss([("tsla-2", "New"), ("tsla-1", "Tesla news")])),
+    ]
+    route = respx.get(News.base_uri()).mock(side_effect=responses)
+    poller = NewsPoller(max_seen=2, parser=parser)
+
+    news = await poller.poll("tsla")
+    assert [publication.guid for publication in news] == ["tsla-1", "common-1"]
+
+    news = await poller.poll("TSLA")
+    assert len(news) == 0
+    assert route.calls[1].request.headers["if-none-match"] == '"v1"'
+
+    news = await poller.poll("TSLA")
+    assert [publication.guid for publication in news] == ["tsla-2"]
+    # "common-1" got evicted, "tsla-1" was seen again
+    assert list(poller._states["TSLA"].seen) == ["tsla-2", "tsla-1"]
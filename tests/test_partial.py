@@ -0,0 +1,107 @@
+import pickle
+import typing as tp
+from pathlib import Path
+
+import anyio
+import httpx
+import pytest
+import respx
+
+from pstock.asset import Asset, Assets
+from pstock.bar import Bars, BarsMulti
+from pstock.partial import errors_df
+from pstock.testing import ReplayTransport
+
+
+def _load_response(filename: str) -> httpx.Response:
+    with open(Path(__file__).parent / "data" / filename, "rb") as f:
+        return pickle.load(f)
+
+
+def _mock_charts(daily_chart: tp.Dict[str, tp.Any]) -> None:
+    async def _slow(request: httpx.Request) -> httpx.Response:
+        await anyio.sleep(1)
+        return httpx.Response(200, json=daily_chart)  # pragma: no cover
+
+    respx.get(Bars.base_uri("FAIL")).mock(
+        return_value=httpx.Response(404, json={"chart": {"error": "Not Found"}})
+    )
+    respx.get(Bars.base_uri("SLOW")).mock(side_effect=_slow)
+    respx.get(url__startswith="https://query2.finance.yahoo.com/").mock(
+        return_value=httpx.Response(200, json=daily_chart)
+    )
+
+
+@respx.mock
+@pytest.mark.anyio
+async def test_bars_multi_partial(daily_chart: tp.Dict[str, tp.Any]):
+    _mock_charts(daily_chart)
+    bars = await BarsMulti.get(
+        ["A", "FAIL", "SLOW", "B"], interval="1d", partial=True, timeout=0.1
+    )
+    assert list(bars) == ["A", "B"]
+    assert bars["A"].df.equals(Bars.load(response=daily_chart).df)
+    assert bars.errors["FAIL"].reason == "error"
+    assert isinstance(bars.errors["FAIL"].error, ValueError)
+    assert bars.errors["SLOW"].reason == "timeout"
+    assert 0.1 <= bars.errors["SLOW"].elapsed < 1
+
+    report = errors_df(bars.errors)
+    assert list(report.index) == ["FAIL", "SLOW"]
+    assert report.loc["FAIL", "error_type"] == "ValueError"
+    assert "Not Found" in report.loc["FAIL", "message"]
+
+
+@respx.mock
+@pytest.mark.anyio
+async def test_bars_multi_partial_deadline(daily_chart: tp.Dict[str, tp.Any]):
+    _mock_charts(daily_chart)
+    with anyio.fail_after(0.5):
+        bars = await BarsMulti.get(
+            ["A", "SLOW"], interval="1d", partial=True, deadline=0.1
+        )
+    assert list(bars) == ["A"]
+    assert bars.errors["SLOW"].reason == "deadline"
+    assert bars.errors["SLOW"].error is None
+
+    with pytest.raises(ValueError):
+        await BarsMulti.get(["A"], interval="1d", timeout=1)
+
+
+@pytest.mark.anyio
+async def test_bars_multi_partial_spark(daily_chart: tp.Dict[str, tp.Any]):
+    result = daily_chart["chart"]["result"][0]
+    spark = {
+        "spark": {
+            "result": [{"symbol": "TEST", "response": [result]}],
+            "error": None,
+        }
+    }
+    transport = ReplayTransport(spark=spark)
+    async with httpx.AsyncClient(transport=transport) as client:
+        bars = await BarsMulti.get(
+            ["TEST", "AAPL"], interval="1d", client=client, spark=True, partial=True
+        )
+    assert list(bars) == ["TEST"]
+    assert bars.errors["AAPL"].reason == "error"
+
+
+@respx.mock
+@pytest.mark.anyio
+async def test_assets_partial():
+    for uri, filename in [
+        (Asset.uri("TSLA"), "EQUITY-quote.obj"),
+        (Asset.financials_uri("TSLA"), "EQUITY-financials.obj"),
+    ]:
+        respx.get(uri).mock(
+            return_value=httpx.Response(200, content=_load_response(filename).content)
+        )
+    respx.get(url__startswith="https://finance.yahoo.com/quote/").mock(
+        return_value=httpx.Response(404)
+    )
+
+    for validate in (True, False):
+        assets = await Assets.get(["TSLA", "FAIL"], partial=True, validate=validate)
+        assert [asset.symbol for asset in assets] == ["TSLA"]
+        assert list(assets.errors) == ["FAIL"]
+        assert assets.errors["FAIL"].reason == "error"
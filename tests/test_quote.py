@@ -1,7 +1,20 @@
+import copy
+import pickle
+from pathlib import Path
+
 import httpx
 import pytest
 
-from pstock.quote import QuoteSummary
+from pstock.asset import Asset
+from pstock.earnings import Earnings
+from pstock.income_statement import IncomeStatements, QuarterlyIncomeStatements
+from pstock.quote import QuoteMemo, QuoteStore, QuoteSummary
+from pstock.trend import Trends
+
+
+def _load_response(filename: str) -> httpx.Response:
+    with open(Path(__file__).parent / "data" / filename, "rb") as f:
+        return pickle.load(f)
 
 
 @pytest.mark.parametrize(
@@ -36,3 +49,73 @@ def test_quote_summary_process_quote():
 
 def test_quote_summary_process_financials_quote():
     assert QuoteSummary.process_financials_quote({"some": "data"}) == {}
+
+
+def test_quote_summary_pages_parsed_once(monkeypatch):
+    quote_response = _load_response("EQUITY-quote.obj")
+    financials_response = _load_response("EQUITY-financials.obj")
+    parsed = []
+    parse_quote = QuoteSummary.parse_quote
+
+    def _parse_quote(response):
+        parsed.append(response)
+        return parse_quote(response)
+
+    monkeypatch.setattr(QuoteSummary, "parse_quote", staticmethod(_parse_quote))
+    asset = Asset.load(response=quote_response, financials_response=financials_response)
+    assert len(parsed) == 2
+    assert len(asset.income_statement) == 4
+    assert len(asset.quarterly_income_statement) == 4
+
+    store = QuoteStore.parse(financials_response=financials_response)
+    assert len(parsed) == 3
+    assert IncomeStatements.load(store=store) == asset.income_statement
+    assert (
+        QuarterlyIncomeStatements.load(store=store) == asset.quarterly_income_statement
+    )
+    assert len(parsed) == 3
+
+
+def test_quote_memo(monkeypatch):
+    quote_response = _load_response("EQUITY-quote.obj")
+    financials_response = _load_response("EQUITY-financials.obj")
+    memo = QuoteMemo(maxsize=16)
+    asset = Asset.load(
+        response=quote_response, financials_response=financials_response, memo=memo
+    )
+    # 2 pages and 4 component models
+    assert len(memo) == 6
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("Shouldn't be called")  # pragma: no cover
+
+    # unchanged pages are neither parsed nor validated again
+    monkeypatch.setattr(QuoteSummary, "parse_quote", staticmethod(_fail))
+    monkeypatch.setattr(Earnings, "process_quote", classmethod(_fail))
+    again = Asset.load(
+        response=quote_response, financials_response=financials_response, memo=memo
+    )
+    assert again == asset
+    monkeypatch.undo()
+
+    # a change of the asset only rebuilds it, not its components
+    store = QuoteStore.parse(response=quote_response, memo=memo)
+    quote = copy.deepcopy(store.quote)
+    quote["summaryProfile"]["sector"] = "Technology"
+    changed = QuoteStore(quote=quote, financials_quote=store.financials_quote)
+    monkeypatch.setattr(Earnings, "process_quote", classmethod(_fail))
+    monkeypatch.setattr(Trends, "process_quote", classmethod(_fail))
+    updated = Asset.load(store=changed, memo=memo)
+    assert updated.sector == "Technology"
+    assert updated.trends == asset.trends
+
+    # models built without validation aren't reused for validated loads
+    monkeypatch.undo()
+    trusted = Trends.load(store=store, memo=memo, validate=False)
+    assert Trends.load(store=store, memo=memo, validate=False) is trusted
+    assert Trends.load(store=store, memo=memo) is not trusted
+
+    # bounded
+    memo.maxsize = 2
+    memo.put("key", None)
+    assert len(memo) == 2
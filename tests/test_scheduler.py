@@ -0,0 +1,161 @@
+import typing as tp
+
+import anyio
+import httpx
+import pytest
+import respx
+
+from pstock.bar import Bars, BarsMulti
+from pstock.concurrency import AIMDController, use_controller
+from pstock.scheduler import RequestScheduler, priority, use_scheduler
+from pstock.testing import ReplayTransport
+from pstock.utils.utils import fetch
+
+
+async def _run(
+    scheduler: RequestScheduler,
+    order: tp.List[str],
+    name: str,
+    release: anyio.Event,
+) -> None:
+    async with scheduler.slot():
+        order.append(name)
+        await release.wait()
+
+
+@pytest.mark.anyio
+async def test_scheduler_priorities():
+    scheduler = RequestScheduler(max_in_flight=1, reserved=0)
+    order: tp.List[str] = []
+    releases: tp.List[anyio.Event] = []
+
+    async with anyio.create_task_group() as tg:
+        for name, level in [
+            ("first", "low"),
+            ("low", "low"),
+            ("normal", "normal"),
+            ("high", "high"),
+        ]:
+            with priority(level):
+                releases.append(anyio.Event())
+                tg.start_soon(_run, scheduler, order, name, releases[-1])
+            await anyio.sleep(0.01)
+        assert scheduler.in_flight == 1
+        assert scheduler.waiting() == 3
+        assert scheduler.waiting("high") == 1
+        for release in releases:
+            release.set()
+
+    assert order == ["first", "high", "normal", "low"]
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.anyio
+async def test_scheduler_fair_queuing():
+    scheduler = RequestScheduler(max_in_flight=1, reserved=0)
+    order: tp.List[str] = []
+    release = anyio.Event()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(_run, scheduler, order, "blocker", release)
+        await anyio.sleep(0.01)
+        # a large job queued before a small one, with the same priority
+        for flow, size in [("a", 4), ("b", 2)]:
+            with priority("low", flow=flow):
+                for _ in range(size):
+                    tg.start_soon(_run, scheduler, order, flow, release)
+        await anyio.sleep(0.01)
+        release.set()
+
+    assert order == ["blocker", "a", "b", "a", "b", "a", "a"]
+
+
+@pytest.mark.anyio
+async def test_scheduler_reserved():
+    scheduler = RequestScheduler(max_in_flight=2, reserved=1)
+    order: tp.List[str] = []
+    release = anyio.Event()
+
+    async with anyio.create_task_group() as tg:
+        with priority("low"):
+            tg.start_soon(_run, scheduler, order, "low", release)
+            tg.start_soon(_run, scheduler, order, "low", release)
+        await anyio.sleep(0.01)
+        with priority("high"):
+            tg.start_soon(_run, scheduler, order, "high", release)
+        await anyio.sleep(0.01)
+        # the second low request waits, the high one doesn't
+        assert order == ["low", "high"]
+        release.set()
+
+    assert order == ["low", "high", "low"]
+
+
+@pytest.mark.anyio
+async def test_scheduler_cancelled_waiter():
+    scheduler = RequestScheduler(max_in_flight=1, reserved=0)
+    release = anyio.Event()
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(_run, scheduler, [], "blocker", release)
+        await anyio.sleep(0.01)
+        with anyio.move_on_after(0.01):
+            async with scheduler.slot():
+                pass  # pragma: no cover
+        assert scheduler.waiting() == 0
+        release.set()
+    assert scheduler.in_flight == 0
+
+
+def test_scheduler_invalid():
+    with pytest.raises(ValueError):
+        RequestScheduler(max_in_flight=1, reserved=1)
+    with pytest.raises(ValueError):
+        with priority("urgent"):  # type: ignore
+            pass  # pragma: no cover
+
+
+@pytest.mark.anyio
+async def test_scheduler_fetch(daily_chart: tp.Dict[str, tp.Any]):
+    transport = ReplayTransport(chart=daily_chart, latency=0.01)
+    scheduler = RequestScheduler(max_in_flight=3, reserved=1)
+    latencies = []
+
+    async def _interactive(client: httpx.AsyncClient) -> None:
+        await anyio.sleep(0.02)
+        with priority("high"):
+            started_at = anyio.current_time()
+            await Bars.get("TSLA", interval="1d", client=client)
+            latencies.append(anyio.current_time() - started_at)
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        with use_scheduler(scheduler):
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(_interactive, client)
+                with priority("low"):
+                    bars = await BarsMulti.get(
+                        [f"S{idx}" for idx in range(30)], interval="1d", client=client
+                    )
+
+    assert len(bars) == 30
+    assert transport.stats.max_in_flight == 3
+    # the interactive request didn't wait for the 30 bulk ones
+    assert latencies[0] < 0.1
+
+
+@respx.mock
+@pytest.mark.anyio
+async def test_scheduler_wait_is_not_latency():
+    async def _respond(request: httpx.Request) -> httpx.Response:
+        await anyio.sleep(0.02)
+        return httpx.Response(200)
+
+    respx.get("https://example.com/").mock(side_effect=_respond)
+    controller = AIMDController(initial=8)
+    # the requests queue in the scheduler, not at the host
+    with use_scheduler(RequestScheduler(max_in_flight=1, reserved=0)):
+        with use_controller(controller):
+            async with httpx.AsyncClient() as client:
+                async with anyio.create_task_group() as tg:
+                    for _ in range(8):
+                        tg.start_soon(fetch, client, "https://example.com/")
+    assert controller.limit("example.com") >= 8
@@ -0,0 +1,95 @@
+import datetime
+import pickle
+import typing as tp
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pytest
+
+from pstock.asset import Asset, Assets
+from pstock.income_statement import IncomeStatements
+from pstock.screener import Screener
+
+
+def _load_response(filename: str) -> httpx.Response:
+    with open(Path(__file__).parent / "data" / filename, "rb") as f:
+        return pickle.load(f)
+
+
+def _extract(asset_type: str) -> tp.Dict[str, tp.Any]:
+    return Asset.extract(
+        response=_load_response(f"{asset_type}-quote.obj"),
+        financials_response=_load_response(f"{asset_type}-financials.obj"),
+    )
+
+
+@pytest.fixture(scope="module")
+def assets() -> Assets:
+    equity = _extract("EQUITY")
+    return Assets.parse_obj(
+        [{**equity, "symbol": "A"}, {**equity, "symbol": "B"}, _extract("ETF")]
+    )
+
+
+def test_revenue_cagr_uses_earliest_and_latest_dates():
+    statements = IncomeStatements.parse_obj(
+        [
+            dict(
+                date=datetime.date(2021, 1, 1),
+                ebit=0,
+                total_revenue=100,
+                gross_profit=0,
+            ),
+            dict(
+                date=datetime.date(2019, 1, 1),
+                ebit=0,
+                total_revenue=400,
+                gross_profit=0,
+            ),
+            dict(
+                date=datetime.date(2020, 1, 1), ebit=0, total_revenue=50, gross_profit=0
+            ),
+        ]
+    )
+    assert statements.revenue_compound_annual_growth_rate == pytest.approx(-0.5)
+    assert np.isnan(IncomeStatements.parse_obj([]).revenue_compound_annual_growth_rate)
+
+
+def test_asset_quarterly_income_statement(assets: Assets):
+    assert len(assets[0].quarterly_income_statement) == 4
+    assert assets.quarterly_income_statements_df.loc["A"].equals(
+        assets[0].quarterly_income_statement.df
+    )
+
+
+def test_screener_metrics(assets: Assets):
+    metrics = Screener(assets).metrics
+    assert list(metrics.index) == ["A", "B", assets[2].symbol]
+    income_statement = assets[0].income_statement
+    assert metrics.loc["A", "revenue_cagr"] == pytest.approx(
+        income_statement.revenue_compound_annual_growth_rate
+    )
+    latest = income_statement.df.iloc[-1]
+    assert metrics.loc["A", "gross_margin"] == pytest.approx(
+        latest["gross_profit"] / latest["total_revenue"]
+    )
+    quarterly = assets[0].quarterly_income_statement.df
+    assert metrics.loc["B", "quarterly_ttm_revenue"] == quarterly["total_revenue"].sum()
+    assert metrics.loc[assets[2].symbol].isna()["revenue_cagr"]
+
+
+def test_screener_filter(assets: Assets):
+    screener = Screener(assets)
+    assert list(screener.filter(revenue_cagr=(0.1, None)).index) == ["A", "B"]
+    assert screener.filter(revenue_cagr=(None, 0.1)).empty
+    assert list(screener.filter("symbol == 'B'", gross_margin=(0, 1)).index) == ["B"]
+
+
+@pytest.mark.parametrize("universe", [[_extract("ETF")], []])
+def test_screener_without_statements(universe: tp.List[tp.Dict[str, tp.Any]]):
+    screener = Screener(Assets.parse_obj(universe))
+    metrics = screener.metrics
+    assert len(metrics) == len(universe)
+    assert metrics[["quarterly_ttm_revenue", "revenue_cagr"]].isna().all().all()
+    assert screener.filter("ebit_margin > 0 and sector == 'Technology'").empty
@@ -0,0 +1,97 @@
+import mmap
+import pickle
+import typing as tp
+from pathlib import Path
+
+import httpx
+import pandas as pd
+import pytest
+
+from pstock import serialization
+from pstock.asset import Asset, Assets
+from pstock.bar import Bars, BarsMulti
+
+
+def _load_response(filename: str) -> httpx.Response:
+    with open(Path(__file__).parent / "data" / filename, "rb") as f:
+        return pickle.load(f)
+
+
+def test_bars_to_bytes(daily_chart: tp.Dict[str, tp.Any], tmp_path: Path):
+    bars = Bars.load(response=daily_chart, tz="exchange")
+    data = bars.to_bytes()
+    assert data[:4] == serialization.MAGIC
+    loaded = Bars.from_bytes(data)
+    assert loaded.df.equals(bars.df)
+    assert loaded.json() == bars.json()
+
+    # buffers are read in place from a memory-mapped file
+    path = tmp_path / "bars.bin"
+    path.write_bytes(data)
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        _, arrays = serialization.loads(m, "Bars")
+        assert not arrays["close"].flags.owndata
+        assert Bars.from_bytes(m).df.equals(bars.df)
+        del arrays
+
+    assert Bars.from_bytes(Bars.parse_obj([]).to_bytes()).df.empty
+
+
+@pytest.mark.parametrize("validate", [True, False])
+def test_bars_to_bytes_missing_prices(
+    daily_chart: tp.Dict[str, tp.Any], validate: bool
+):
+    # a bar without any price is kept in the bars, not in `.df`
+    result = daily_chart["chart"]["result"][0]
+    result["timestamp"].append(1641427200)
+    for values in [
+        *result["indicators"]["quote"][0].values(),
+        *result["indicators"]["adjclose"][0].values(),
+    ]:
+        values.append(None)
+    bars = Bars.load(response=daily_chart, validate=validate)
+    assert len(bars) == 3 and len(bars.df) == 2
+
+    loaded = Bars.from_bytes(bars.to_bytes())
+    assert len(loaded) == 3
+    pd.testing.assert_frame_equal(loaded._records_df(), bars._records_df())
+    pd.testing.assert_frame_equal(loaded.df, bars.df)
+
+
+def test_bars_multi_to_bytes(
+    daily_chart: tp.Dict[str, tp.Any], intraday_chart: tp.Dict[str, tp.Any]
+):
+    bars = BarsMulti.parse_obj(
+        {
+            "A": Bars.load(response=daily_chart),
+            "B": Bars.load(response=intraday_chart, tz="exchange"),
+            "C": Bars.parse_obj([]),
+        }
+    )
+    loaded = BarsMulti.from_bytes(bars.to_bytes())
+    assert list(loaded) == ["A", "B", "C"]
+    for symbol in bars:
+        assert loaded[symbol].df.equals(bars[symbol].df)
+
+
+def test_assets_to_bytes():
+    data = Asset.extract(
+        response=_load_response("EQUITY-quote.obj"),
+        financials_response=_load_response("EQUITY-financials.obj"),
+    )
+    assets = Assets.parse_obj([data, {**data, "symbol": "other"}])
+    loaded = Assets.from_bytes(assets.to_bytes())
+    assert loaded.json() == assets.json()
+    for name, table in assets.tables.items():
+        pd.testing.assert_frame_equal(loaded.tables[name], table)
+
+
+def test_from_bytes_errors(daily_chart: tp.Dict[str, tp.Any]):
+    data = Bars.load(response=daily_chart).to_bytes()
+    with pytest.raises(ValueError, match="Expected a BarsMulti binary"):
+        BarsMulti.from_bytes(data)
+    with pytest.raises(ValueError, match="bad magic number"):
+        Bars.from_bytes(b"NOPE" + data[4:])
+    newer = data[:4] + (serialization.VERSION + 1).to_bytes(2, "little") + data[6:]
+    with pytest.raises(ValueError, match="Unsupported pstock binary version"):
+        Bars.from_bytes(newer)
@@ -0,0 +1,78 @@
+import multiprocessing
+import pickle
+import typing as tp
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from pstock.asset import Asset, Assets
+from pstock.bar import Bars, BarsMulti
+from pstock.sharding import ShardedExecutor, split_symbols
+from pstock.testing import ReplayTransport
+
+
+def _load_response(filename: str) -> httpx.Response:
+    with open(Path(__file__).parent / "data" / filename, "rb") as f:
+        return pickle.load(f)
+
+
+def test_split_symbols():
+    assert split_symbols(["A", "B", "C", "D", "E"], 2) == [["A", "C", "E"], ["B", "D"]]
+    assert split_symbols(["A"], 4) == [["A"]]
+
+
+@respx.mock
+@pytest.mark.anyio
+async def test_sharded_executor_get_bars(daily_chart: tp.Dict[str, tp.Any]):
+    # forked workers inherit the mocked transport
+    respx.get(Bars.base_uri("FAIL")).mock(
+        return_value=httpx.Response(404, json={"chart": {"error": "Not Found"}})
+    )
+    respx.get(url__startswith="https://query2.finance.yahoo.com/").mock(
+        return_value=httpx.Response(200, json=daily_chart)
+    )
+    symbols = ["A", "B", "C"]
+    async with ShardedExecutor(
+        processes=2, mp_context=multiprocessing.get_context("fork")
+    ) as executor:
+        bars = await executor.get_bars(symbols, interval="1d", tz="exchange")
+        with pytest.raises(ValueError, match="Not Found"):
+            await executor.get_bars(["A", "FAIL"], interval="1d")
+
+    assert isinstance(bars, BarsMulti)
+    assert list(bars) == symbols
+    expected = Bars.load(response=daily_chart, tz="exchange").df
+    for symbol in symbols:
+        assert bars[symbol].df.equals(expected)
+    assert bars.df["B"].equals(expected)
+
+
+@pytest.mark.anyio
+async def test_sharded_executor_get_assets():
+    quote = _load_response("EQUITY-quote.obj")
+    financials = _load_response("EQUITY-financials.obj")
+    symbols = ["A", "B", "C"]
+    async with ShardedExecutor(
+        processes=2,
+        mp_context=multiprocessing.get_context("fork"),
+        transport=ReplayTransport(quote=quote, financials=financials, symbol="TSLA"),
+    ) as executor:
+        assets = await executor.get_assets(symbols)
+
+    assert isinstance(assets, Assets)
+    assert [asset.symbol for asset in assets] == symbols
+    expected = Asset.extract(response=quote, financials_response=financials)
+    assert assets[1].name == expected["name"]
+    assert assets.df.loc["C", "latest_price"] == expected["latest_price"]
+    assert len(assets.earnings_df.loc["B"]) == len(expected["earnings"]["__root__"])
+
+    # no quote pages: every symbol fails, the error is raised in the parent
+    async with ShardedExecutor(
+        processes=2,
+        mp_context=multiprocessing.get_context("fork"),
+        transport=ReplayTransport(financials=financials, symbol="TSLA"),
+    ) as executor:
+        with pytest.raises(Exception, match="validation error"):
+            await executor.get_assets(symbols)
@@ -0,0 +1,66 @@
+import typing as tp
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+import respx
+
+from pstock import sync
+from pstock.bar import Bars
+from pstock.testing import ReplayTransport
+
+
+def test_sync_client_concurrent_callers(daily_chart: tp.Dict[str, tp.Any]):
+    transport = ReplayTransport(chart=daily_chart, latency=0.2)
+    expected = Bars.load(response=daily_chart).df
+    with sync.Client(transport=transport) as client:
+        with ThreadPoolExecutor(8) as pool:
+            results = list(
+                pool.map(
+                    lambda symbol: client.call(Bars.get, symbol, interval="1d"),
+                    [f"S{idx}" for idx in range(8)],
+                )
+            )
+        # the same (persistent) client is reused between calls
+        http_client = client._client
+        client.call(Bars.get, "TSLA", interval="1d")
+        assert client._client is http_client
+    assert not client.running
+    assert all(bars.df.equals(expected) for bars in results)
+    # the callers ran concurrently on the background loop
+    assert transport.stats.max_in_flight == 8
+
+
+@respx.mock
+def test_sync_facade(daily_chart: tp.Dict[str, tp.Any]):
+    respx.get(Bars.base_uri("TSLA")).mock(
+        return_value=httpx.Response(200, json=daily_chart)
+    )
+    bars = sync.Bars.get("TSLA", interval="1d")
+    assert isinstance(bars, Bars)
+    assert sync.Bars.get("TSLA", interval="1d").df.equals(bars.df)
+    assert sync.default_client().running
+    sync.default_client().close()
+
+
+def test_sync_client_closed_during_call(
+    daily_chart: tp.Dict[str, tp.Any], monkeypatch: pytest.MonkeyPatch
+):
+    client = sync.Client(transport=ReplayTransport(chart=daily_chart))
+    start = client._start
+
+    def _start_then_close():
+        # `close` from another thread, right after the call got the client
+        started = start()
+        client.close()
+        return started
+
+    monkeypatch.setattr(client, "_start", _start_then_close)
+    with pytest.raises(RuntimeError, match="client is closed"):
+        client.call(Bars.get, "TSLA", interval="1d")
+    assert not client.running
+
+    # the next call restarts the loop
+    monkeypatch.undo()
+    assert len(client.call(Bars.get, "TSLA", interval="1d")) == 2
+    client.close()
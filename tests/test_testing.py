@@ -0,0 +1,91 @@
+import pickle
+import typing as tp
+from pathlib import Path
+
+import anyio
+import httpx
+import pytest
+
+from pstock.asset import Asset, Assets
+from pstock.bar import Bars, BarsMulti
+from pstock.concurrency import AIMDController
+from pstock.testing import ReplayTransport, uniform
+
+
+def _load_response(filename: str) -> httpx.Response:
+    with open(Path(__file__).parent / "data" / filename, "rb") as f:
+        return pickle.load(f)
+
+
+def test_replay_transport_route():
+    assert ReplayTransport.route(httpx.URL(Bars.uri("tsla", period="1d"))) == (
+        "chart",
+        "TSLA",
+    )
+    assert ReplayTransport.route(httpx.URL(Asset.uri("TSLA"))) == ("quote", "TSLA")
+    assert ReplayTransport.route(httpx.URL(Asset.financials_uri("TSLA"))) == (
+        "financials",
+        "TSLA",
+    )
+    assert ReplayTransport.route(
+        httpx.URL(BarsMulti.spark_uri(), params={"symbols": "TSLA,AAPL"})
+    ) == ("spark", "TSLA,AAPL")
+    assert ReplayTransport.route(httpx.URL("https://example.com")) == (None, None)
+
+
+@pytest.mark.anyio
+async def test_replay_transport_bars(daily_chart: tp.Dict[str, tp.Any]):
+    transport = ReplayTransport(
+        chart=daily_chart, latency=uniform(0, 0.01), errors={429: 0.3}, seed=1
+    )
+    symbols = [f"S{idx}" for idx in range(20)]
+    async with httpx.AsyncClient(transport=transport) as client:
+        bars = await BarsMulti.get(
+            symbols,
+            interval="1d",
+            client=client,
+            concurrency=AIMDController(backoff=0, max_retries=10),
+        )
+    assert list(bars) == symbols
+    assert transport.stats.status_codes[429] > 0
+    assert transport.stats.status_codes[200] == len(symbols)
+    assert transport.stats.requests == sum(transport.stats.status_codes.values())
+
+
+@pytest.mark.anyio
+async def test_replay_transport_max_in_flight(daily_chart: tp.Dict[str, tp.Any]):
+    transport = ReplayTransport(
+        chart=daily_chart, latency=0.01, max_in_flight=4, retry_after=1
+    )
+    responses = []
+
+    async def _get(symbol: str, client: httpx.AsyncClient) -> None:
+        responses.append(await client.get(Bars.base_uri(symbol)))
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        async with anyio.create_task_group() as tg:
+            for idx in range(10):
+                tg.start_soon(_get, f"S{idx}", client)
+
+    assert transport.stats.max_in_flight == 10
+    assert transport.stats.status_codes == {200: 4, 429: 6}
+    assert {
+        response.headers["retry-after"]
+        for response in responses
+        if response.status_code == 429
+    } == {"1"}
+
+
+@pytest.mark.anyio
+async def test_replay_transport_assets():
+    transport = ReplayTransport(
+        quote=_load_response("EQUITY-quote.obj"),
+        financials=_load_response("EQUITY-financials.obj"),
+        symbol="TSLA",
+        bandwidth=100_000_000,
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        assets = await Assets.get(["AAA", "BBB"], client=client, validate=False)
+        response = await client.get("https://finance.yahoo.com/unknown")
+    assert [asset.symbol for asset in assets] == ["AAA", "BBB"]
+    assert response.status_code == 404
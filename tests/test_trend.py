@@ -0,0 +1,64 @@
+import datetime
+
+import numpy as np
+
+from pstock.asset import Assets
+from pstock.trend import (
+    Trends,
+    _get_recomendation,
+    _get_score,
+    get_recomendations,
+    get_scores,
+)
+
+COUNTS = [[0, 0, 0, 0, 0], [3, 1, 0, 0, 0], [0, 1, 5, 2, 1], [0, 0, 0, 1, 9]]
+FIELDS = ("strong_buy", "buy", "hold", "sell", "strong_sell")
+
+
+def test_vectorized_scores_match_scalar():
+    scores = get_scores(np.array(COUNTS))
+    expected = [_get_score(dict(zip(FIELDS, counts))) for counts in COUNTS]
+    np.testing.assert_array_equal(scores, expected)
+    assert list(get_recomendations(scores)) == [
+        _get_recomendation(score) for score in expected
+    ]
+
+
+def test_trends_scored_and_sorted():
+    today = datetime.date.today()
+    raw = [
+        {"date": today + datetime.timedelta(days=30 * idx), **dict(zip(FIELDS, counts))}
+        for idx, counts in reversed(list(enumerate(COUNTS[1:])))
+    ]
+    trends = Trends.parse_obj(raw)
+    assert "score" not in raw[0]
+    assert [trend.date for trend in trends] == sorted(trend["date"] for trend in raw)
+    assert [trend.recomendation for trend in trends] == [
+        "STRONG_BUY",
+        "HOLD",
+        "STRONG_SELL",
+    ]
+    assert Trends.trusted(__root__=raw).dict() == trends.dict()
+    # the raw dicts are not modified
+    assert all("score" not in trend for trend in raw)
+
+
+def test_assets_trends_scored_in_one_pass():
+    today = datetime.date.today()
+    assets = [
+        {
+            "symbol": symbol,
+            "name": symbol,
+            "asset_type": "EQUITY",
+            "currency": "USD",
+            "earnings": {"__root__": []},
+            "trends": {"__root__": [{"date": today, **dict(zip(FIELDS, counts))}]},
+        }
+        for symbol, counts in zip(["a", "b"], COUNTS[1:])
+    ]
+    validated = Assets.parse_obj(assets)
+    trusted = Assets.trusted(__root__=assets)
+    assert "score" not in assets[0]["trends"]["__root__"][0]
+    for asset in (validated, trusted):
+        assert [a.trends[0].recomendation for a in asset] == ["STRONG_BUY", "HOLD"]
+        assert [a.symbol for a in asset] == ["A", "B"]
@@ -0,0 +1,93 @@
+import json
+import pickle
+import typing as tp
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pytest
+
+from pstock.testing import ReplayTransport
+from pstock.watchlist import COLUMNS, Watchlist, WatchlistEvent
+
+
+def _load_response(filename: str) -> httpx.Response:
+    with open(Path(__file__).parent / "data" / filename, "rb") as f:
+        return pickle.load(f)
+
+
+def _set_price(transport: ReplayTransport, chart: tp.Dict[str, tp.Any], price: float):
+    chart["chart"]["result"][0]["meta"]["regularMarketPrice"] = price
+    transport.recordings["chart"] = json.dumps(chart).encode()
+
+
+@pytest.mark.anyio
+async def test_watchlist(daily_chart: tp.Dict[str, tp.Any]):
+    transport = ReplayTransport(
+        chart=daily_chart,
+        quote=_load_response("EQUITY-quote.obj"),
+        financials=_load_response("EQUITY-financials.obj"),
+        symbol="TSLA",
+    )
+    watchlist = Watchlist(
+        ["aaa", "bbb", "AAA"], price_interval=10, fundamentals_interval=100
+    )
+    received: tp.List[WatchlistEvent] = []
+    watchlist.subscribe(received.append)
+    df = watchlist.df
+    assert list(df.index) == ["AAA", "BBB"]
+    assert list(df.columns) == list(COLUMNS)
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        # first refresh: quote pages of all the symbols
+        events = await watchlist.refresh(client=client, now=0)
+        assert transport.stats.requests == 4
+        assert [event.symbol for event in events] == ["AAA", "BBB"]
+        assert received == events
+        assert watchlist.df is df
+        assert df.loc["AAA", "sector"] == "Consumer Cyclical"
+        assert not np.isnan(df.loc["BBB", "latest_price"])
+        assert not np.isnan(df.loc["BBB", "score"])
+        assert set(watchlist.assets) == {"AAA", "BBB"}
+
+        # nothing is due
+        assert await watchlist.refresh(client=client, now=1) == []
+        assert transport.stats.requests == 4
+
+        # prices are staggered: AAA is due before BBB
+        _set_price(transport, daily_chart, 1.0)
+        events = await watchlist.refresh(client=client, now=5)
+        assert transport.stats.requests == 5
+        assert [event.symbol for event in events] == ["AAA"]
+        assert set(events[0].changes) == {"latest_price"}
+        assert events[0].changes["latest_price"][1] == 1.0
+        assert df.loc["AAA", "latest_price"] == 1.0
+
+        # unchanged price: no event
+        _set_price(transport, daily_chart, float(df.loc["BBB", "latest_price"]))
+        assert await watchlist.refresh(client=client, now=10) == []
+        assert transport.stats.requests == 6
+
+        # fundamentals are refreshed (with the price) once their interval passed
+        events = await watchlist.refresh(client=client, now=100)
+        assert transport.stats.requests == 10
+        assert [event.symbol for event in events] == ["AAA"]
+        assert set(events[0].changes) == {"latest_price"}
+    assert len(received) == 4
+
+
+@pytest.mark.anyio
+async def test_watchlist_errors(daily_chart: tp.Dict[str, tp.Any]):
+    transport = ReplayTransport(chart=daily_chart)
+    watchlist = Watchlist(["AAA"], price_interval=10, fundamentals_interval=100)
+    async with httpx.AsyncClient(transport=transport) as client:
+        # quote pages are missing
+        assert await watchlist.refresh(client=client, now=0) == []
+        assert watchlist.assets == {}
+        assert watchlist.next_due() == 10
+
+        _set_price(transport, daily_chart, 2.0)
+        events = await watchlist.refresh(client=client, now=10)
+    assert [event.symbol for event in events] == ["AAA"]
+    old, new = events[0].changes["latest_price"]
+    assert np.isnan(old) and new == 2.0